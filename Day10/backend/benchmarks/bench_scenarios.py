@@ -0,0 +1,74 @@
+"""
+Day 10 – Scenario sampling benchmark
+
+Draws scenarios without repeats from a large synthetic bank for:
+    - legacy: rebuild [i for i in range(n) if i not in used] on every pick (used is a list)
+    - sampler: ScenarioSampler (lazy Fisher-Yates cursor)
+
+Usage:
+    uv run benchmarks/bench_scenarios.py --scenarios 50000 --draws 300
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from scenarios import Scenario, ScenarioBank
+
+TAGS = ["workplace", "sci-fi", "history", "supernatural", "mystery", "food", "romance", "shopping"]
+
+
+def make_bank(n: int) -> ScenarioBank:
+    rng = random.Random(5)
+    return ScenarioBank(
+        Scenario(f"s{i}", f"Scenario {i}", frozenset(rng.sample(TAGS, 2)), rng.randint(1, 3))
+        for i in range(n)
+    )
+
+
+def legacy_draws(n: int, draws: int):
+    used = []
+    for _ in range(draws):
+        candidates = [i for i in range(n) if i not in used]
+        if not candidates:
+            used = []
+            candidates = list(range(n))
+        used.append(random.choice(candidates))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", type=int, default=50_000)
+    parser.add_argument("--draws", type=int, default=300)
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    bank = make_bank(args.scenarios)
+    print(f"{args.scenarios} scenarios, bank built in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    t0 = time.perf_counter()
+    legacy_draws(args.scenarios, args.draws)
+    legacy_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    sampler = bank.sampler()
+    for _ in range(args.draws):
+        sampler.draw()
+    sampler_ms = (time.perf_counter() - t0) * 1000
+
+    t0 = time.perf_counter()
+    tagged = bank.sampler(tags=["sci-fi"], max_difficulty=2)
+    for _ in range(args.draws):
+        tagged.draw()
+    tagged_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"{args.draws} draws: legacy {legacy_ms:9.1f} ms  sampler {sampler_ms:6.2f} ms  "
+          f"tag-filtered sampler {tagged_ms:6.2f} ms ({len(tagged)} in pool)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Day 10 – Function tool benchmarks
+
+Times the show tools against a synthetic scenario bank of N scenarios (from
+bench_scenarios.make_bank) and a temporary seen-scenario store in which the
+player has already performed half of them:
+    - start_show: loads the player's seen set, builds a sampler, draws round 1
+    - next_scenario: one no-repeat draw, marked as seen for the player
+    - record_performance: closes a round and writes the host reaction (size 1)
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 1000000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import os
+import sqlite3
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, HERE)
+
+import agent  # noqa: E402
+from agent_runtime.toolbench import BenchCase, ToolContext, call_once, main, parametrize, run_benchmark  # noqa: E402
+from bench_scenarios import make_bank  # noqa: E402
+from scenarios import SeenStore, player_key  # noqa: E402
+
+PLAYER = "Ada"
+ROUNDS = 8
+
+
+def use_bank(size: int, tmp: str):
+    agent.SCENARIO_BANK = make_bank(size)
+    path = os.path.join(tmp, "improv_seen.sqlite")
+    agent.SEEN_SCENARIOS.close()
+    agent.SEEN_SCENARIOS = SeenStore(path)
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.executemany(
+            "INSERT INTO seen (player_key, scenario_id, seen_ms) VALUES (?,?,?)",
+            ((player_key(PLAYER), f"s{i}", 0) for i in range(0, size, 2)),
+        )
+    conn.close()
+    return ToolContext(agent.Userdata())
+
+
+def start_show(size: int, tmp: str):
+    ctx = use_bank(size, tmp)
+
+    async def op():
+        await agent.start_show(ctx, name=PLAYER, max_rounds=ROUNDS)
+
+    return op
+
+
+def next_scenario(size: int, tmp: str):
+    ctx = use_bank(size, tmp)
+
+    async def start():
+        await agent.start_show(ctx, name=PLAYER, max_rounds=ROUNDS)
+
+    call_once(start)
+    show = ctx.userdata.show
+
+    async def op():
+        if show.is_last_round:
+            show.reset(ROUNDS)
+        await agent.next_scenario(ctx)
+
+    return op
+
+
+def record_performance(size: int, tmp: str):
+    ctx = use_bank(100, tmp)
+    show = ctx.userdata.show
+    show.reset(ROUNDS)
+
+    async def op():
+        show.present(1, "s1", "Scenario 1")
+        await agent.record_performance(ctx, "I am the ship's cat and I demand to see the captain, right now.")
+
+    return op
+
+
+CASES = [
+    BenchCase("start_show", start_show),
+    BenchCase("next_scenario", next_scenario),
+    BenchCase("record_performance", record_performance, sizes=(1,)),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day10", CASES)
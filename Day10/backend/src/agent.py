@@ -1,29 +1,38 @@
 import json
 import logging
 import os
+import sys
 import asyncio
 import uuid
 import random
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional, Annotated
+from typing import List, Optional, Annotated
 
 from dotenv import load_dotenv
 from pydantic import Field
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
-    JobProcess,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
     RunContext,
+    UserInputTranscribedEvent,
+    UserStateChangedEvent,
 )
 
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import VoiceConfig, attach_metrics, build_session, prewarm, start_session  # noqa: E402
+
+from analyzer import FAST_WPM, RoundFeatures, ShowAnalyzer
+from scenarios import Scenario, ScenarioSampler, SeenStore, load_bank
+from show_state import EventLog, ShowState
 
 # -------------------------
 # Logging
@@ -34,24 +43,22 @@ handler = logging.StreamHandler()
 handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
 logger.addHandler(handler)
 
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 # -------------------------
-# Improv Scenarios (seeded)
+# Improv Scenarios (scenario bank)
 # -------------------------
-# Each scenario is a short prompt: role, situation, tension/hook
-SCENARIOS = [
-    "You are a barista who must tell a customer that their latte is actually a portal to another dimension.",
-    "You are a time-traveling tour guide explaining modern smartphones to someone from the 1800s.",
-    "You are a restaurant waiter who must calmly tell a customer that their order has escaped the kitchen.",
-    "You are a customer trying to return an obviously cursed object to a very skeptical shop owner.",
-    "You are an overenthusiastic infomercial host selling a product that clearly does not work as advertised.",
-    "You are an astronaut who discovers the ship's coffee machine has developed a personality.",
-    "You are a nervous wedding officiant who keeps getting the couple's names mixed up in funny ways.",
-    "You are a ghost trying to give a performance review to a living employee.",
-    "You are a medieval king reacting to a modern delivery service arriving at court.",
-    "You are a detective interrogating a suspect who only answers in awkward metaphors."
-]
+# Each scenario is a short prompt: role, situation, tension/hook; tagged by theme and difficulty
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+SCENARIOS_FILE = os.path.join(SRC_DIR, "scenarios.json")
+SCENARIO_BANK = load_bank(SCENARIOS_FILE)
+
+# Which scenarios each named player has already performed, across sessions
+SEEN_FILE = "improv_seen.sqlite"
+SEEN_SCENARIOS = SeenStore(os.path.join(SRC_DIR, SEEN_FILE))
+DEFAULT_PLAYER = "Contestant"
 
 # -------------------------
 # Per-session Improv State
@@ -61,50 +68,58 @@ class Userdata:
     player_name: Optional[str] = None
     session_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
-    improv_state: Dict = field(default_factory=lambda: {
-        "current_round": 0,
-        "max_rounds": 3,
-        "rounds": [],  # each: {"scenario": str, "performance": str, "reaction": str}
-        "phase": "idle",  # "intro" | "awaiting_improv" | "reacting" | "done" | "idle"
-        "used_indices": []
-    })
-    history: List[Dict] = field(default_factory=list)
+    show: ShowState = field(default_factory=ShowState)  # phase + rounds indexed by round number
+    analysis: ShowAnalyzer = field(default_factory=ShowAnalyzer)  # per-round features, fed live by STT/VAD
+    sampler: Optional[ScenarioSampler] = None  # no-repeat draws for this show
+    history: EventLog = field(default_factory=EventLog)  # bounded, monotonic timestamps
 
 # -------------------------
 # Helpers
 # -------------------------
 
 
-def _pick_scenario(userdata: Userdata) -> str:
-    """
-    Pick a scenario not used in this session yet. If all have been used, reset the set.
-    """
-    used = userdata.improv_state.get("used_indices", [])
-    candidates = [i for i in range(len(SCENARIOS)) if i not in used]
-    if not candidates:
-        userdata.improv_state["used_indices"] = []
-        candidates = list(range(len(SCENARIOS)))
-    idx = random.choice(candidates)
-    userdata.improv_state["used_indices"].append(idx)
-    return SCENARIOS[idx]
+def _seen_key(userdata: Userdata) -> Optional[str]:
+    # Only named players get seen-scenario history
+    name = userdata.player_name
+    return name if name and name != DEFAULT_PLAYER else None
+
 
+async def _new_sampler(userdata: Userdata, tags: Optional[List[str]] = None,
+                       max_difficulty: Optional[int] = None) -> ScenarioSampler:
+    seen = await asyncio.to_thread(SEEN_SCENARIOS.load, _seen_key(userdata))
+    return SCENARIO_BANK.sampler(tags=tags, max_difficulty=max_difficulty, seen=seen)
 
-def _host_reaction_text(performance: str) -> str:
+
+async def _pick_scenario(userdata: Userdata) -> Scenario:
+    """
+    Draw a scenario this player has not seen yet. Once the whole pool has been seen, it starts over,
+    skipping the scenarios already played in this show.
     """
-    Produce a short host reaction string using lightweight heuristics to vary tone.
+    if userdata.sampler is None:
+        userdata.sampler = await _new_sampler(userdata)
+    resets = userdata.sampler.resets
+    scenario = userdata.sampler.draw()
+    player = _seen_key(userdata)
+    if player:
+        if userdata.sampler.resets != resets:
+            # keep the rest of the player's history, and this show's scenarios of this pool
+            stale = [sid for sid in userdata.sampler.ids if sid not in userdata.sampler.seen]
+            await asyncio.to_thread(SEEN_SCENARIOS.forget, player, stale)
+        await asyncio.to_thread(SEEN_SCENARIOS.mark, player, scenario.id)
+    return scenario
+
+
+def _host_reaction_text(features: RoundFeatures) -> str:
+    """
+    Produce a short host reaction string from the round's streamed features.
     Returns constructive feedback in one of three tones.
     """
     tones = ["supportive", "neutral", "mildly_critical"]
-    tone = random.choice(tones)
+    rate = features.speaking_rate
+    # A genuinely rushed delivery gets the "rushed" note rather than a random tone
+    tone = "mildly_critical" if rate and rate > FAST_WPM else random.choice(tones)
 
-    highlights = []
-    perf_lower = (performance or "").lower()
-    if any(w in perf_lower for w in ("funny", "lol", "hahaha", "haha")):
-        highlights.append("good comedic timing")
-    if any(w in perf_lower for w in ("sad", "cry", "tears")):
-        highlights.append("good emotional depth")
-    if any(w in perf_lower for w in ("pause", "...")):
-        highlights.append("interesting use of silence")
+    highlights = features.highlights()
 
     if not highlights:
         highlights.append(random.choice(["clear character choices", "strong commitment", "an unexpected twist"]))
@@ -127,12 +142,14 @@ async def start_show(
     ctx: RunContext[Userdata],
     name: Annotated[Optional[str], Field(description="Player/contestant name (optional)", default=None)] = None,
     max_rounds: Annotated[int, Field(description="Number of rounds (3-5 recommended)", default=3)] = 3,
+    themes: Annotated[Optional[str], Field(description="Comma-separated scene themes, e.g. 'workplace, sci-fi' (optional)", default=None)] = None,
+    max_difficulty: Annotated[Optional[int], Field(description="Hardest scene difficulty, 1-3 (optional)", default=None)] = None,
 ) -> str:
     userdata = ctx.userdata
     if name:
         userdata.player_name = name.strip()
     else:
-        userdata.player_name = userdata.player_name or "Contestant"
+        userdata.player_name = userdata.player_name or DEFAULT_PLAYER
 
     # clamp rounds
     if max_rounds < 1:
@@ -140,46 +157,43 @@ async def start_show(
     if max_rounds > 8:
         max_rounds = 8
 
-    userdata.improv_state["max_rounds"] = int(max_rounds)
-    userdata.improv_state["current_round"] = 0
-    userdata.improv_state["rounds"] = []
-    userdata.improv_state["phase"] = "intro"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "start_show", "name": userdata.player_name})
+    userdata.show.reset(int(max_rounds))
+    userdata.analysis.reset()
+    tags = [t for t in (themes or "").split(",") if t.strip()]
+    userdata.sampler = await _new_sampler(userdata, tags=tags, max_difficulty=max_difficulty)
+    userdata.history.append("start_show", name=userdata.player_name)
 
     intro = (
         f"Welcome to Improv Battle. I'm your host. "
-        f"{userdata.player_name or 'Contestant'}, we will run {userdata.improv_state['max_rounds']} rounds. "
+        f"{userdata.player_name or 'Contestant'}, we will run {userdata.show.max_rounds} rounds. "
         "Rules: I will give you a short scene, you will improvise in character. When you are done say 'End scene' or pause; I will react and then move on."
     )
 
     # After intro, immediately provide first scenario for flow convenience
-    scenario = _pick_scenario(userdata)
-    userdata.improv_state["current_round"] = 1
-    userdata.improv_state["phase"] = "awaiting_improv"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "present_scenario", "round": 1, "scenario": scenario})
+    scenario = await _pick_scenario(userdata)
+    userdata.show.present(1, scenario.id, scenario.text)
+    userdata.history.append("present_scenario", round=1, scenario_id=scenario.id)
 
-    return intro + "\nRound 1: " + scenario + "\nStart improvising now."
+    return intro + "\nRound 1: " + scenario.text + "\nStart improvising now."
 
 
 @function_tool
 async def next_scenario(ctx: RunContext[Userdata]) -> str:
     userdata = ctx.userdata
-    if userdata.improv_state.get("phase") == "done":
+    show = userdata.show
+    if show.phase == "done":
         return "The session is over. Say 'start show' to play again."
 
-    cur = userdata.improv_state.get("current_round", 0)
-    maxr = userdata.improv_state.get("max_rounds", 3)
-    if cur >= maxr:
-        userdata.improv_state["phase"] = "done"
+    if show.is_last_round:
+        show.phase = "done"
         return await summarize_show(ctx)
 
     # advance
-    next_round = cur + 1
-    scenario = _pick_scenario(userdata)
-    userdata.improv_state["current_round"] = next_round
-    userdata.improv_state["phase"] = "awaiting_improv"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "present_scenario", "round": next_round, "scenario": scenario})
-    return f"Round {next_round}: {scenario}\nBegin."
+    next_round = show.current_round + 1
+    scenario = await _pick_scenario(userdata)
+    show.present(next_round, scenario.id, scenario.text)
+    userdata.history.append("present_scenario", round=next_round, scenario_id=scenario.id)
+    return f"Round {next_round}: {scenario.text}\nBegin."
 
 
 @function_tool
@@ -188,31 +202,20 @@ async def record_performance(
     performance: Annotated[str, Field(description="Player's improv performance (transcribed text)")],
 ) -> str:
     userdata = ctx.userdata
-    if userdata.improv_state.get("phase") != "awaiting_improv":
-        userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "record_performance_out_of_phase"})
-
-    round_no = userdata.improv_state.get("current_round", 0)
-    # retrieve the last presented scenario if available
-    scenario = "(unknown)"
-    for h in reversed(userdata.history):
-        if h.get("action") == "present_scenario" and h.get("round") == round_no:
-            scenario = h.get("scenario")
-            break
-
-    reaction = _host_reaction_text(performance)
-
-    userdata.improv_state["rounds"].append({
-        "round": round_no,
-        "scenario": scenario,
-        "performance": performance,
-        "reaction": reaction,
-    })
-    userdata.improv_state["phase"] = "reacting"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "record_performance", "round": round_no})
+    show = userdata.show
+    if show.phase != "awaiting_improv":
+        userdata.history.append("record_performance_out_of_phase")
+
+    round_no = show.current_round
+    # Features were accumulated while the player spoke; this only closes the round
+    features = userdata.analysis.finish_round(round_no, performance, time.time())
+    reaction = _host_reaction_text(features)
+    show.record(round_no, performance, reaction)
+    userdata.history.append("record_performance", round=round_no)
 
     # If we've reached max rounds, change to done after reaction
-    if round_no >= userdata.improv_state.get("max_rounds", 3):
-        userdata.improv_state["phase"] = "done"
+    if show.is_last_round:
+        show.phase = "done"
         closing = "\n" + reaction + "\nThis was the final round. "
         closing += (await summarize_show(ctx))
         return closing
@@ -225,19 +228,20 @@ async def record_performance(
 @function_tool
 async def summarize_show(ctx: RunContext[Userdata]) -> str:
     userdata = ctx.userdata
-    rounds = userdata.improv_state.get("rounds", [])
+    rounds = userdata.show.performed_rounds()
     if not rounds:
         return "No rounds were played. Thank you for participating."
 
     summary_lines = [f"Thanks for playing, {userdata.player_name or 'Contestant'}. Here is a short recap:"]
     for r in rounds:
-        perf_snip = (r.get("performance") or "").strip()
+        perf_snip = (r.performance or "").strip()
         if len(perf_snip) > 80:
             perf_snip = perf_snip[:77] + "..."
-        summary_lines.append(f"Round {r.get('round')}: {r.get('scenario')} — You: '{perf_snip}' | Host: {r.get('reaction')}")
+        summary_lines.append(f"Round {r.number}: {r.scenario} — You: '{perf_snip}' | Host: {r.reaction}")
 
-    mentions_character = sum(1 for r in rounds if any(w in (r.get('performance') or '').lower() for w in ('i am', "i'm", 'as a', 'character', 'role')))
-    mentions_emotion = sum(1 for r in rounds if any(w in (r.get('performance') or '').lower() for w in ('sad', 'angry', 'happy', 'love', 'cry', 'tears')))
+    features = [userdata.analysis.features(r.number) for r in rounds]
+    mentions_character = sum(1 for f in features if f.has("character"))
+    mentions_emotion = sum(1 for f in features if f.has("emotion"))
 
     profile = "You appear to be a player who "
     if mentions_character > len(rounds) / 2:
@@ -252,7 +256,7 @@ async def summarize_show(ctx: RunContext[Userdata]) -> str:
     summary_lines.append(profile)
     summary_lines.append("Thank you for performing on Improv Battle — hope to see you again.")
 
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "summarize_show"})
+    userdata.history.append("summarize_show")
     return "\n".join(summary_lines)
 
 
@@ -261,8 +265,8 @@ async def stop_show(ctx: RunContext[Userdata], confirm: Annotated[bool, Field(de
     userdata = ctx.userdata
     if not confirm:
         return "Do you want to stop the session? Say 'stop show yes' to confirm."
-    userdata.improv_state["phase"] = "done"
-    userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "stop_show"})
+    userdata.show.phase = "done"
+    userdata.history.append("stop_show")
     return "Session ended. Thank you for joining Improv Battle."
 
 # -------------------------
@@ -281,6 +285,7 @@ class GameMasterAgent(Agent):
             - After each scene, react in a varied, realistic way (supportive, neutral, mildly critical). Store the reaction.
             - Run the configured number of rounds, then summarize the player's style and end the session.
             - Keep turns short and TTS-friendly.
+            - If the player asks for particular kinds of scenes, pass them to start_show as themes (e.g. workplace, sci-fi, history, supernatural, mystery, food, romance, shopping).
         Use the provided tools: start_show, next_scenario, record_performance, summarize_show, stop_show.
         """
         super().__init__(
@@ -291,11 +296,7 @@ class GameMasterAgent(Agent):
 # -------------------------
 # Entrypoint & Prewarm
 # -------------------------
-def prewarm(proc: JobProcess):
-    try:
-        proc.userdata["vad"] = silero.VAD.load()
-    except Exception:
-        logger.warning("VAD prewarm failed; continuing without preloaded VAD.")
+VOICE = VoiceConfig()
 
 
 async def entrypoint(ctx: JobContext):
@@ -304,27 +305,24 @@ async def entrypoint(ctx: JobContext):
 
     userdata = Userdata()
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-marcus",
-            style="Conversational",
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata.get("vad"),
-        userdata=userdata,
-    )
+    session = build_session(ctx, VOICE, userdata=userdata)
+    attach_metrics(ctx, session, agent="day10")
 
-    # Start with the Improv Host agent
-    await session.start(
-        agent=GameMasterAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(noise_cancellation=noise_cancellation.BVC()),
-    )
+    # Feed the analyzer while the player performs, so reactions don't wait on a transcript scan
+    @session.on("user_input_transcribed")
+    def _on_user_input_transcribed(ev: UserInputTranscribedEvent):
+        show = userdata.show
+        if show.phase == "awaiting_improv":
+            userdata.analysis.on_transcript(show.current_round, ev.transcript, ev.is_final)
+
+    @session.on("user_state_changed")
+    def _on_user_state_changed(ev: UserStateChangedEvent):
+        show = userdata.show
+        if show.phase == "awaiting_improv":
+            userdata.analysis.on_user_state(show.current_round, ev.new_state, ev.created_at)
 
-    await ctx.connect()
+    # Start with the Improv Host agent
+    await start_session(ctx, session, GameMasterAgent())
 
 
 if __name__ == "__main__":
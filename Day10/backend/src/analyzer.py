@@ -0,0 +1,150 @@
+"""
+Day 10 – Streaming performance analysis for the improv host
+
+Features are updated while the player performs, not after the scene:
+- final STT transcript chunks are tokenized once and matched against keyword
+  groups (single words and two-word phrases, one set lookup per token)
+- VAD user-state changes (speaking / listening) give speaking time and the
+  pauses between speech segments
+- speaking rate = words / speaking time
+
+When the scene ends the round's features are already complete, so the host
+reaction is a lookup and the show summary is O(rounds).
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+_WORD_RE = re.compile(r"[a-z']+")
+
+KEYWORD_GROUPS: Dict[str, tuple] = {
+    "comedy": ("funny", "lol", "haha", "hahaha", "joke", "hilarious"),
+    "sadness": ("sad", "cry", "crying", "cried", "tears"),
+    "emotion": ("sad", "angry", "happy", "love", "cry", "crying", "tears", "scared", "furious"),
+    "character": ("i am", "i'm", "as a", "character", "role"),
+    "silence": ("pause", "silence"),
+}
+
+# A gap between speech segments at least this long counts as a deliberate pause.
+DRAMATIC_PAUSE_S = 1.5
+FAST_WPM = 180
+
+
+def _build_lookup(groups: Dict[str, tuple]):
+    words: Dict[str, List[str]] = {}
+    phrases: Dict[tuple, List[str]] = {}
+    for group, entries in groups.items():
+        for entry in entries:
+            parts = tuple(entry.split())
+            if len(parts) == 1:
+                words.setdefault(parts[0], []).append(group)
+            else:
+                phrases.setdefault(parts, []).append(group)
+    return words, phrases
+
+
+_WORDS, _PHRASES = _build_lookup(KEYWORD_GROUPS)
+
+
+@dataclass
+class RoundFeatures:
+    round: int
+    words: int = 0
+    keywords: Counter = field(default_factory=Counter)
+    ellipses: int = 0
+    speaking_s: float = 0.0
+    pauses: int = 0
+    pause_s: float = 0.0
+    longest_pause_s: float = 0.0
+    _speech_start: Optional[float] = None
+    _speech_end: Optional[float] = None
+    _last_token: Optional[str] = None
+
+    @property
+    def speaking_rate(self) -> Optional[float]:
+        """Words per minute of detected speech, or None without VAD timings."""
+        if self.speaking_s <= 0 or not self.words:
+            return None
+        return self.words / self.speaking_s * 60
+
+    def has(self, group: str) -> bool:
+        return self.keywords[group] > 0
+
+    def highlights(self) -> List[str]:
+        found = []
+        if self.has("comedy"):
+            found.append("good comedic timing")
+        if self.has("sadness"):
+            found.append("good emotional depth")
+        if self.has("silence") or self.ellipses or self.longest_pause_s >= DRAMATIC_PAUSE_S:
+            found.append("interesting use of silence")
+        return found
+
+    # ---- streaming updates ----
+    def add_text(self, text: str):
+        self.ellipses += text.count("...")
+        prev = self._last_token
+        for tok in _WORD_RE.findall(text.lower()):
+            self.words += 1
+            for group in _WORDS.get(tok, ()):
+                self.keywords[group] += 1
+            if prev is not None:
+                for group in _PHRASES.get((prev, tok), ()):
+                    self.keywords[group] += 1
+            prev = tok
+        self._last_token = prev
+
+    def speech_started(self, at: float):
+        if self._speech_start is not None:
+            return
+        if self._speech_end is not None:
+            gap = max(0.0, at - self._speech_end)
+            self.pauses += 1
+            self.pause_s += gap
+            self.longest_pause_s = max(self.longest_pause_s, gap)
+        self._speech_start = at
+
+    def speech_ended(self, at: float):
+        if self._speech_start is None:
+            return
+        self.speaking_s += max(0.0, at - self._speech_start)
+        self._speech_start = None
+        self._speech_end = at
+
+
+class ShowAnalyzer:
+    """Per-round features for one show, fed by STT and VAD events."""
+
+    def __init__(self):
+        self.rounds: Dict[int, RoundFeatures] = {}
+
+    def reset(self):
+        self.rounds = {}
+
+    def features(self, round_no: int) -> RoundFeatures:
+        feats = self.rounds.get(round_no)
+        if feats is None:
+            feats = self.rounds[round_no] = RoundFeatures(round_no)
+        return feats
+
+    def on_transcript(self, round_no: int, text: str, is_final: bool):
+        # Interim hypotheses are revised by later chunks; only final text is counted.
+        if is_final and text:
+            self.features(round_no).add_text(text)
+
+    def on_user_state(self, round_no: int, new_state: str, at: float):
+        feats = self.features(round_no)
+        if new_state == "speaking":
+            feats.speech_started(at)
+        else:
+            feats.speech_ended(at)
+
+    def finish_round(self, round_no: int, performance: Optional[str], at: float) -> RoundFeatures:
+        """Close the round; if nothing was streamed (e.g. typed input), analyze the given text once."""
+        feats = self.features(round_no)
+        feats.speech_ended(at)
+        if not feats.words and performance:
+            feats.add_text(performance)
+        return feats
@@ -0,0 +1,233 @@
+"""
+Day 10 – Scenario bank for the improv host
+
+- Scenarios live in scenarios.json: {"scenarios": [{"id", "text", "tags", "difficulty"}]}
+- The bank is loaded and validated once: ids must be unique, text non-empty
+- Tag postings (tag -> positions) let a show be limited to themes; a filtered
+  pool is computed once per (tags, max difficulty) and cached
+- ScenarioSampler draws without repeats in O(1) per draw: a lazy Fisher-Yates
+  shuffle (a cursor plus a sparse swap map), so even a pool of tens of thousands
+  of prompts is never copied or shuffled up front
+- SeenStore remembers which scenarios each player has already performed
+  (SQLite), so returning players get fresh prompts until they have seen them all.
+  Then only earlier shows' scenarios come round again, never one already drawn
+  in the current show (unless the show has used up the whole pool)
+"""
+
+import json
+import random
+import sqlite3
+import threading
+import time
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+SEEN_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS seen (
+        player_key TEXT NOT NULL,
+        scenario_id TEXT NOT NULL,
+        seen_ms INTEGER NOT NULL,
+        PRIMARY KEY (player_key, scenario_id)
+    ) WITHOUT ROWID;
+"""
+
+
+class ScenarioError(ValueError):
+    """Raised when the scenario file is malformed."""
+
+
+class Scenario(NamedTuple):
+    id: str
+    text: str
+    tags: FrozenSet[str]
+    difficulty: int
+
+
+def player_key(name: Optional[str]) -> Optional[str]:
+    return " ".join(name.split()).lower() if name and name.strip() else None
+
+
+def _normalize_tags(tags: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    return tuple(sorted({t.strip().lower() for t in tags or () if t and t.strip()}))
+
+
+class ScenarioBank:
+    """Immutable set of scenarios with id and tag lookups."""
+
+    def __init__(self, scenarios: Iterable[Scenario]):
+        self.scenarios: Tuple[Scenario, ...] = tuple(scenarios)
+        self.by_id: Dict[str, Scenario] = {}
+        self._by_tag: Dict[str, List[int]] = {}
+        self._pools: Dict[Tuple[Tuple[str, ...], Optional[int]], Tuple[int, ...]] = {}
+        for pos, s in enumerate(self.scenarios):
+            if s.id in self.by_id:
+                raise ScenarioError(f"duplicate scenario id {s.id!r}")
+            self.by_id[s.id] = s
+            for tag in s.tags:
+                self._by_tag.setdefault(tag, []).append(pos)
+
+    def __len__(self) -> int:
+        return len(self.scenarios)
+
+    @property
+    def tags(self) -> List[str]:
+        return sorted(self._by_tag)
+
+    def pool(self, tags: Optional[Iterable[str]] = None, max_difficulty: Optional[int] = None) -> Tuple[int, ...]:
+        """Positions of scenarios carrying every tag in `tags` and at most `max_difficulty`."""
+        key = (_normalize_tags(tags), max_difficulty)
+        cached = self._pools.get(key)
+        if cached is not None:
+            return cached
+        wanted, _ = key
+        if wanted:
+            postings = sorted((self._by_tag.get(t, []) for t in wanted), key=len)
+            positions: Iterable[int] = set(postings[0]).intersection(*postings[1:])
+        else:
+            positions = range(len(self.scenarios))
+        if max_difficulty is not None:
+            positions = [p for p in positions if self.scenarios[p].difficulty <= max_difficulty]
+        cached = self._pools[key] = tuple(sorted(positions))
+        return cached
+
+    def sampler(self, tags: Optional[Iterable[str]] = None, max_difficulty: Optional[int] = None,
+                seen: Optional[Set[str]] = None, rng: Optional[random.Random] = None) -> "ScenarioSampler":
+        """A sampler over the filtered pool; falls back to the whole bank if the filter matches nothing."""
+        pool = self.pool(tags, max_difficulty) or self.pool()
+        return ScenarioSampler(self, pool, seen=seen, rng=rng)
+
+
+class ScenarioSampler:
+    """No-repeat random draws from a pool of bank positions."""
+
+    def __init__(self, bank: ScenarioBank, pool: Tuple[int, ...],
+                 seen: Optional[Set[str]] = None, rng: Optional[random.Random] = None):
+        if not pool:
+            raise ScenarioError("cannot sample from an empty scenario pool")
+        self.bank = bank
+        self._pool = pool
+        self._rng = rng or random.Random()
+        self._swaps: Dict[int, int] = {}
+        self._cursor = 0
+        self.seen: Set[str] = set(seen or ())  # skipped while unseen ones remain
+        self.drawn: Set[str] = set()  # drawn by this sampler, i.e. in this show
+        self.resets = 0  # times the whole pool had been seen and `seen` was cut back to `drawn`
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    @property
+    def ids(self) -> List[str]:
+        return [self.bank.scenarios[p].id for p in self._pool]
+
+    @property
+    def remaining(self) -> int:
+        """Draws left in the current pass before scenarios start repeating."""
+        return len(self._pool) - self._cursor
+
+    def _next_position(self) -> int:
+        n = len(self._pool)
+        if self._cursor >= n:
+            self._cursor = 0
+            self._swaps.clear()
+        i = self._cursor
+        j = self._rng.randrange(i, n)
+        picked = self._swaps.get(j, j)
+        self._swaps[j] = self._swaps.pop(i, i)
+        self._cursor += 1
+        return self._pool[picked]
+
+    def _draw_unseen(self, tries: int) -> Optional[Scenario]:
+        for _ in range(tries):
+            scenario = self.bank.scenarios[self._next_position()]
+            if scenario.id not in self.seen:
+                return scenario
+        return None
+
+    def draw(self) -> Scenario:
+        """Next scenario, skipping ones in `seen` until the pool has nothing else to offer.
+
+        Once everything in the pool has been seen, `seen` is cut back to this
+        show's draws and a new pass starts; only when the show itself has drawn
+        the whole pool does everything become available again.
+        """
+        scenario = self._draw_unseen(self.remaining)
+        if scenario is None:
+            self.resets += 1
+            self.seen = set(self.drawn)
+            if len(self.drawn) < len(self._pool):
+                scenario = self._draw_unseen(len(self._pool))
+            if scenario is None:
+                self.seen.clear()
+                self.drawn.clear()
+                scenario = self.bank.scenarios[self._next_position()]
+        self.seen.add(scenario.id)
+        self.drawn.add(scenario.id)
+        return scenario
+
+
+def compile_bank(data: Dict) -> ScenarioBank:
+    entries = data.get("scenarios")
+    if not isinstance(entries, list) or not entries:
+        raise ScenarioError("scenario file needs a non-empty 'scenarios' list")
+    scenarios = []
+    for n, entry in enumerate(entries):
+        text = (entry.get("text") or "").strip()
+        if not text:
+            raise ScenarioError(f"scenario #{n} has no text")
+        scenarios.append(Scenario(
+            id=str(entry.get("id") or n),
+            text=text,
+            tags=frozenset(_normalize_tags(entry.get("tags"))),
+            difficulty=int(entry.get("difficulty", 1)),
+        ))
+    return ScenarioBank(scenarios)
+
+
+def load_bank(path: str) -> ScenarioBank:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_bank(json.load(f))
+
+
+class SeenStore:
+    """Per-player seen-scenario ids (SQLite); calls are short and meant to run via asyncio.to_thread."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(SEEN_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def load(self, player_name: Optional[str]) -> Set[str]:
+        key = player_key(player_name)
+        if not key:
+            return set()
+        with self._lock:
+            return {row[0] for row in self._conn.execute(
+                "SELECT scenario_id FROM seen WHERE player_key = ?", (key,))}
+
+    def mark(self, player_name: Optional[str], scenario_id: str):
+        key = player_key(player_name)
+        if not key:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO seen (player_key, scenario_id, seen_ms) VALUES (?,?,?)",
+                (key, scenario_id, int(time.time() * 1000)),
+            )
+
+    def forget(self, player_name: Optional[str], scenario_ids: Optional[Iterable[str]] = None):
+        """Drop a player's history of `scenario_ids` (all of it when None), e.g. after they have cycled through a pool."""
+        key = player_key(player_name)
+        if not key:
+            return
+        with self._lock, self._conn:
+            if scenario_ids is None:
+                self._conn.execute("DELETE FROM seen WHERE player_key = ?", (key,))
+            else:
+                self._conn.executemany("DELETE FROM seen WHERE player_key = ? AND scenario_id = ?",
+                                       [(key, sid) for sid in scenario_ids])
@@ -0,0 +1,117 @@
+"""
+Day 10 – Typed show state for the improv host
+
+- ShowState holds the show settings, phase and one RoundState per round,
+  indexed by round number (O(1) lookup of the scene being performed)
+- EventLog is a bounded trace of host actions; entries carry monotonic
+  timestamps (immune to wall-clock jumps) and are converted to ISO time only
+  when exported
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, Iterator, List, NamedTuple, Optional
+
+EVENT_LOG_SIZE = 200
+
+
+@dataclass
+class RoundState:
+    number: int
+    scenario_id: str
+    scenario: str
+    presented_at: float  # time.monotonic()
+    performance: Optional[str] = None
+    reaction: Optional[str] = None
+    performed_at: Optional[float] = None
+
+    @property
+    def performed(self) -> bool:
+        return self.performance is not None
+
+
+@dataclass
+class ShowState:
+    max_rounds: int = 3
+    current_round: int = 0
+    phase: str = "idle"  # "intro" | "awaiting_improv" | "reacting" | "done" | "idle"
+    rounds: Dict[int, RoundState] = field(default_factory=dict)
+
+    def reset(self, max_rounds: int):
+        self.max_rounds = max_rounds
+        self.current_round = 0
+        self.phase = "intro"
+        self.rounds = {}
+
+    def present(self, number: int, scenario_id: str, scenario: str) -> RoundState:
+        state = RoundState(number, scenario_id, scenario, presented_at=time.monotonic())
+        self.rounds[number] = state
+        self.current_round = number
+        self.phase = "awaiting_improv"
+        return state
+
+    def record(self, number: int, performance: str, reaction: str) -> RoundState:
+        """Store the performance for a round (re-recording replaces it)."""
+        state = self.rounds.get(number)
+        if state is None:  # performance before any scenario was presented
+            state = self.rounds[number] = RoundState(number, "", "(unknown)", presented_at=time.monotonic())
+        state.performance = performance
+        state.reaction = reaction
+        state.performed_at = time.monotonic()
+        self.phase = "reacting"
+        return state
+
+    def round(self, number: int) -> Optional[RoundState]:
+        return self.rounds.get(number)
+
+    def current(self) -> Optional[RoundState]:
+        return self.rounds.get(self.current_round)
+
+    def performed_rounds(self) -> List[RoundState]:
+        return [r for _, r in sorted(self.rounds.items()) if r.performed]
+
+    @property
+    def is_last_round(self) -> bool:
+        return self.current_round >= self.max_rounds
+
+
+class Event(NamedTuple):
+    at: float  # time.monotonic()
+    action: str
+    data: Dict[str, Any]
+
+
+class EventLog:
+    """Fixed-size log of the most recent events; older ones are counted, not kept."""
+
+    def __init__(self, maxlen: int = EVENT_LOG_SIZE):
+        self._events: Deque[Event] = deque(maxlen=maxlen)
+        self._wall0 = datetime.now(timezone.utc)
+        self._mono0 = time.monotonic()
+        self.total = 0
+
+    def append(self, action: str, **data) -> Event:
+        event = Event(time.monotonic(), action, data)
+        self._events.append(event)
+        self.total += 1
+        return event
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __iter__(self) -> Iterator[Event]:
+        return iter(self._events)
+
+    @property
+    def dropped(self) -> int:
+        return self.total - len(self._events)
+
+    def iso_time(self, at: float) -> str:
+        wall = self._wall0 + timedelta(seconds=at - self._mono0)
+        return wall.replace(tzinfo=None).isoformat() + "Z"
+
+    def to_dicts(self) -> List[Dict]:
+        """Events as {"time", "action", ...} dicts, the shape the old history list used."""
+        return [{"time": self.iso_time(e.at), "action": e.action, **e.data} for e in self._events]
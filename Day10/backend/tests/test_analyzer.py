@@ -0,0 +1,42 @@
+from analyzer import ShowAnalyzer
+
+
+def test_keywords_stream_across_chunks() -> None:
+    analysis = ShowAnalyzer()
+    analysis.on_transcript(1, "Well I", True)
+    analysis.on_transcript(1, "am sad, ha", False)  # interim: ignored
+    analysis.on_transcript(1, "am so sad... haha", True)
+
+    feats = analysis.finish_round(1, "ignored because text was streamed", at=0.0)
+
+    assert feats.words == 6
+    assert feats.has("character")  # "I" + "am" arrived in different chunks
+    assert feats.has("sadness") and feats.has("emotion") and feats.has("comedy")
+    assert feats.highlights() == ["good comedic timing", "good emotional depth", "interesting use of silence"]
+
+
+def test_pauses_and_speaking_rate_from_vad() -> None:
+    analysis = ShowAnalyzer()
+    analysis.on_user_state(2, "speaking", 10.0)
+    analysis.on_transcript(2, " ".join(["word"] * 30), True)
+    analysis.on_user_state(2, "listening", 16.0)
+    analysis.on_user_state(2, "speaking", 18.5)
+    analysis.on_user_state(2, "speaking", 19.0)  # repeated state: no new segment
+
+    feats = analysis.finish_round(2, None, at=22.5)
+
+    assert feats.speaking_s == 10.0
+    assert feats.pauses == 1 and feats.longest_pause_s == 2.5
+    assert feats.speaking_rate == 180.0
+    assert feats.highlights() == ["interesting use of silence"]
+
+
+def test_text_only_round_is_analyzed_once() -> None:
+    analysis = ShowAnalyzer()
+
+    feats = analysis.finish_round(3, "As a ghost I find this funny", at=0.0)
+
+    assert feats.has("character") and feats.has("comedy")
+    assert feats.speaking_rate is None
+    analysis.reset()
+    assert analysis.features(3).words == 0
@@ -0,0 +1,87 @@
+import os
+import random
+
+import pytest
+
+from scenarios import ScenarioBank, ScenarioError, Scenario, SeenStore, compile_bank, load_bank
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+
+
+def _bank(n, tags=("a", "b", "c")):
+    return ScenarioBank(
+        Scenario(f"s{i}", f"scene {i}", frozenset(t for k, t in enumerate(tags) if i % (k + 2) == 0), 1 + i % 3)
+        for i in range(n)
+    )
+
+
+def test_shipped_bank_loads() -> None:
+    bank = load_bank(os.path.join(SRC, "scenarios.json"))
+
+    assert len(bank) == 10
+    assert "workplace" in bank.tags
+    assert all(bank.scenarios[p].difficulty <= 1 for p in bank.pool(max_difficulty=1))
+
+
+def test_sampler_is_a_permutation_per_pass() -> None:
+    bank = _bank(1000)
+    sampler = bank.sampler(rng=random.Random(1))
+
+    first_pass = [sampler.draw().id for _ in range(1000)]
+
+    assert sorted(first_pass) == sorted(s.id for s in bank.scenarios)
+    assert sampler.remaining == 0
+    next_pass = [sampler.draw().id for _ in range(1000)]
+    assert sorted(next_pass) == sorted(first_pass) and next_pass != first_pass
+    assert sampler.resets == 1
+
+
+def test_tag_filter_and_seen_skipping() -> None:
+    bank = _bank(60)
+    pool = bank.pool(tags=["A", "b"])
+    assert {bank.scenarios[p].id for p in pool} == {f"s{i}" for i in range(0, 60, 6)}
+
+    seen = {f"s{i}" for i in range(0, 60, 12)}
+    sampler = bank.sampler(tags=["a", "b"], seen=seen, rng=random.Random(4))
+    fresh = [sampler.draw().id for _ in range(5)]
+
+    assert set(fresh) == {f"s{i}" for i in range(6, 60, 12)}
+    assert sampler.draw().id in seen  # only seen ones left: starts over
+    assert sampler.resets == 1
+    # An unmatched filter falls back to the whole bank.
+    assert len(bank.sampler(tags=["nope"])) == 60
+
+
+def test_reset_never_repeats_this_show() -> None:
+    bank = _bank(10)
+    history = {f"s{i}" for i in range(8)}
+    sampler = bank.sampler(seen=history, rng=random.Random(7))
+
+    show = [sampler.draw().id for _ in range(10)]
+
+    assert sorted(show) == sorted(s.id for s in bank.scenarios)  # s8, s9, then the earlier shows' scenarios
+    assert set(show[:2]) == {"s8", "s9"}
+    assert sampler.resets == 1
+    assert sampler.draw().id in show and sampler.resets == 2  # the show itself used up the pool
+
+
+def test_bank_validation() -> None:
+    with pytest.raises(ScenarioError):
+        compile_bank({"scenarios": []})
+    with pytest.raises(ScenarioError):
+        compile_bank({"scenarios": [{"id": "x", "text": "a"}, {"id": "x", "text": "b"}]})
+
+
+def test_seen_store_per_player(tmp_path) -> None:
+    store = SeenStore(str(tmp_path / "seen.sqlite"))
+    store.mark("Asha", "s1")
+    store.mark(" asha ", "s2")
+    store.mark("Ravi", "s1")
+    store.mark(None, "s3")
+
+    assert store.load("ASHA") == {"s1", "s2"}
+    store.forget("asha", ["s2"])
+    assert store.load("asha") == {"s1"}
+    store.forget("asha")
+    assert store.load("asha") == set() and store.load("ravi") == {"s1"}
+    store.close()
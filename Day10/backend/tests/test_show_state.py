@@ -0,0 +1,38 @@
+from show_state import EventLog, ShowState
+
+
+def test_rounds_are_indexed_by_number() -> None:
+    show = ShowState()
+    show.reset(max_rounds=2)
+    show.present(1, "a", "Scene A")
+    show.record(1, "I am a barista", "Nice")
+    show.present(2, "b", "Scene B")
+
+    assert show.current().scenario == "Scene B" and show.phase == "awaiting_improv"
+    assert show.round(1).performance == "I am a barista"
+    assert show.is_last_round
+    show.record(2, "first take", "Hmm")
+    show.record(2, "second take", "Better")
+    assert [(r.number, r.performance) for r in show.performed_rounds()] == [(1, "I am a barista"), (2, "second take")]
+    assert show.phase == "reacting"
+
+
+def test_record_without_presented_scenario() -> None:
+    show = ShowState()
+
+    state = show.record(0, "hello", "ok")
+
+    assert state.scenario == "(unknown)" and show.performed_rounds() == [state]
+
+
+def test_event_log_is_bounded() -> None:
+    log = EventLog(maxlen=3)
+    for i in range(5):
+        log.append("present_scenario", round=i)
+
+    events = log.to_dicts()
+
+    assert len(log) == 3 and log.total == 5 and log.dropped == 2
+    assert [e["round"] for e in events] == [2, 3, 4]
+    assert events[0]["action"] == "present_scenario" and events[0]["time"].endswith("Z")
+    assert events[0]["time"] <= events[-1]["time"]
@@ -0,0 +1,55 @@
+"""
+Day 2 – Function tool benchmarks
+
+Times update_order_field called directly on the Assistant (no session). It
+does not depend on any dataset, so it has the single size 1.
+send_order_to_server is left out: it is one requests.post to the local order
+server and would only time the network.
+
+Usage:
+    uv run benchmarks/bench_tools.py --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import agent
+from agent_runtime.toolbench import BenchCase, ToolContext, main, parametrize, run_benchmark
+
+FIELDS = [("drinkType", "latte"), ("size", "large"), ("milk", "oat"), ("name", "Sam"), ("extras", "vanilla")]
+
+
+def update_order_field(size: int, tmp: str):
+    assistant = agent.Assistant()
+    ctx = ToolContext(None)
+    fields = itertools.cycle(FIELDS)
+
+    async def op():
+        field, value = next(fields)
+        if field == "extras" and len(agent.order_state["extras"]) > 10:
+            agent.order_state["extras"].clear()
+        await assistant.update_order_field(ctx, field, value)
+
+    return op
+
+
+CASES = [
+    BenchCase("update_order_field", update_order_field, sizes=(1,)),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day2", CASES)
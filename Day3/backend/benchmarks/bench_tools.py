@@ -0,0 +1,104 @@
+"""
+Day 3 – Function tool benchmarks
+
+Times the check-in tools against a wellness log that already holds N entries:
+    - finalize_checkin: appends one entry (append_json_record rewrites the
+      whole JSON array, so this grows with the log)
+    - load_previous_entries: what every new session reads at start
+    - get_previous_summary: reads the last entry from userdata
+    - set_mood / add_goal: in-memory updates (size 1)
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 100000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import agent
+from agent_runtime.toolbench import BenchCase, ToolContext, main, parametrize, run_benchmark
+
+MOODS = ["calm", "tired", "anxious", "upbeat", "focused"]
+
+
+def make_entries(n: int):
+    return [
+        {
+            "timestamp": f"2025-01-01T08:{i % 60:02d}:00",
+            "mood": MOODS[i % len(MOODS)],
+            "energy": "medium",
+            "goals": [f"goal {i}", "drink water"],
+            "summary": f"Check-in {i}.",
+        }
+        for i in range(n)
+    ]
+
+
+def use_log(size: int, tmp: str):
+    path = os.path.join(tmp, "wellness_log.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(make_entries(size), f, indent=2)
+    agent.WELLNESS_FILE = path
+    return path
+
+
+def finalize_checkin(size: int, tmp: str):
+    use_log(size, tmp)
+    ctx = ToolContext(agent.Userdata(
+        wellness=agent.WellnessState(mood="calm", energy="high", goals=["walk", "read"]), previous_entries=[],
+    ))
+
+    async def op():
+        await agent.finalize_checkin(ctx)
+
+    return op
+
+
+def load_previous_entries(size: int, tmp: str):
+    use_log(size, tmp)
+    return agent.load_previous_entries
+
+
+def get_previous_summary(size: int, tmp: str):
+    ctx = ToolContext(agent.Userdata(wellness=agent.WellnessState(), previous_entries=make_entries(size)))
+
+    async def op():
+        await agent.get_previous_summary(ctx)
+
+    return op
+
+
+def set_mood_and_goal(size: int, tmp: str):
+    ctx = ToolContext(agent.Userdata(wellness=agent.WellnessState(), previous_entries=[]))
+
+    async def op():
+        await agent.set_mood(ctx, "calm")
+        await agent.add_goal(ctx, "stretch")
+        ctx.userdata.wellness.goals.clear()
+
+    return op
+
+
+CASES = [
+    BenchCase("finalize_checkin", finalize_checkin),
+    BenchCase("load_previous_entries", load_previous_entries),
+    BenchCase("get_previous_summary", get_previous_summary),
+    BenchCase("set_mood+add_goal", set_mood_and_goal, sizes=(1,)),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day3", CASES)
@@ -1,6 +1,6 @@
 import logging
-import json
 import os
+import sys
 from datetime import datetime
 from dataclasses import dataclass, field
 from typing import List, Optional
@@ -8,47 +8,40 @@ from typing import List, Optional
 from dotenv import load_dotenv
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
-    JobProcess,
     RunContext,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
-    metrics,
-    MetricsCollectedEvent,
-    tokenize,
 )
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import (  # noqa: E402
+    VoiceConfig, append_json_record, attach_metrics, build_session, prewarm, read_json, start_session,
+)
 
 logger = logging.getLogger("agent")
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 
-WELLNESS_FILE = "wellness_log.json"
+WELLNESS_FILE = os.path.join(BACKEND_DIR, "wellness_log.json")
 
 
 def load_previous_entries():
     """Load JSON file if present"""
-    if not os.path.exists(WELLNESS_FILE):
-        return []
-
-    try:
-        with open(WELLNESS_FILE, "r") as f:
-            return json.load(f)
-    except Exception:
-        return []
+    entries = read_json(WELLNESS_FILE, default=[])
+    return entries if isinstance(entries, list) else []
 
 
 def save_entry(entry: dict):
     """Append new entry to the JSON log"""
-    entries = load_previous_entries()
-    entries.append(entry)
-
-    with open(WELLNESS_FILE, "w") as f:
-        json.dump(entries, f, indent=4)
+    append_json_record(WELLNESS_FILE, entry)
 
 @dataclass
 class WellnessState:
@@ -162,49 +155,18 @@ class WellnessAgent(Agent):
         )
 
 
-def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+VOICE = VoiceConfig(voice="en-US-matthew", style="Conversation", min_sentence_len=20)
 
 
 async def entrypoint(ctx: JobContext):
 
     userdata = Userdata(wellness=WellnessState())
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-matthew",
-            style="Conversation",
-            tokenizer=tokenize.basic.SentenceTokenizer(),
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        userdata=userdata,
-    )
-
-    usage_collector = metrics.UsageCollector()
+    session = build_session(ctx, VOICE, userdata=userdata)
+    attach_metrics(ctx, session, agent="day3")
 
-    @session.on("metrics_collected")
-    def collect(ev: MetricsCollectedEvent):
-        usage_collector.collect(ev.metrics)
-
-    await session.start(
-        agent=WellnessAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC()
-        ),
-    )
-
-    await ctx.connect()
+    await start_session(ctx, session, WellnessAgent())
 
 
 if __name__ == "__main__":
     cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
-
-
-
-
-
@@ -0,0 +1,76 @@
+"""
+Day 4 – Function tool benchmarks
+
+Times select_topic against a course of N synthetic topics:
+    - select_topic_hit: the requested topic is the last one (TutorState.set_topic
+      scans COURSE_CONTENT)
+    - select_topic_miss: an unknown topic, which also lists every topic id
+    - evaluate_teaching: builds the grading prompt (size 1)
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 100000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import agent
+from agent_runtime.toolbench import BenchCase, ToolContext, main, parametrize, run_benchmark
+
+
+def make_content(n: int):
+    return [
+        {
+            "id": f"topic_{i}",
+            "title": f"Topic {i}",
+            "summary": f"Summary of topic {i}.",
+            "sample_question": f"What is topic {i}?",
+        }
+        for i in range(n)
+    ]
+
+
+def _select(topic_id: str):
+    def setup(size: int, tmp: str):
+        agent.COURSE_CONTENT = make_content(size)
+        ctx = ToolContext(agent.Userdata(tutor_state=agent.TutorState()))
+        wanted = topic_id.format(last=size - 1)
+
+        async def op():
+            await agent.select_topic(ctx, wanted)
+
+        return op
+
+    return setup
+
+
+def evaluate_teaching(size: int, tmp: str):
+    ctx = ToolContext(agent.Userdata(tutor_state=agent.TutorState()))
+
+    async def op():
+        await agent.evaluate_teaching(ctx, "A variable is a named box that holds a value.")
+
+    return op
+
+
+CASES = [
+    BenchCase("select_topic_hit", _select("topic_{last}")),
+    BenchCase("select_topic_miss", _select("no_such_topic")),
+    BenchCase("evaluate_teaching", evaluate_teaching, sizes=(1,)),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day4", CASES)
@@ -1,6 +1,7 @@
 import logging
 import json
 import os
+import sys
 import asyncio
 from typing import Annotated, Literal, Optional
 from dataclasses import dataclass
@@ -17,19 +18,23 @@ from livekit.agents import (
     Agent,
     AgentSession,
     JobContext,
-    JobProcess,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
     RunContext,
 )
 
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import VoiceConfig, attach_metrics, build_session, prewarm, start_session  # noqa: E402
 
 logger = logging.getLogger("agent")
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 
 CONTENT_FILE = "cs_content.json"
@@ -241,8 +246,8 @@ class TutorAgent(Agent):
             tools=[select_topic, set_learning_mode, evaluate_teaching],
         )
 
-def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+VOICE = VoiceConfig(voice="en-US-matthew", style="Promo")
+
 
 async def entrypoint(ctx: JobContext):
     ctx.log_context_fields = {"room": ctx.room.name}
@@ -253,30 +258,12 @@ async def entrypoint(ctx: JobContext):
     
     userdata = Userdata(tutor_state=TutorState())
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-matthew", 
-            style="Promo",        
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        userdata=userdata,
-    )
+    session = build_session(ctx, VOICE, userdata=userdata)
+    attach_metrics(ctx, session, agent="day4")
     
     userdata.agent_session = session
     
-    await session.start(
-        agent=TutorAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC()
-        ),
-    )
-
-    await ctx.connect()
+    await start_session(ctx, session, TutorAgent())
 
 if __name__ == "__main__":
     cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
@@ -0,0 +1,82 @@
+"""
+Day 5 – Function tool benchmarks
+
+Times the lead tools:
+    - submit_lead_and_end: appends to a leads file that already holds N leads
+      (append_json_record rewrites the whole JSON array)
+    - update_lead_profile: in-memory update (size 1)
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 100000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import agent
+from agent_runtime.toolbench import BenchCase, ToolContext, main, parametrize, run_benchmark
+
+
+def make_leads(n: int):
+    return [
+        {
+            "name": f"Lead {i}",
+            "company": f"Company {i % 500}",
+            "email": f"lead{i}@example.com",
+            "role": "Store manager",
+            "use_case": "Bulk frames",
+            "team_size": "10-50",
+            "timeline": "Next quarter",
+            "timestamp": "2025-01-01T00:00:00Z",
+        }
+        for i in range(n)
+    ]
+
+
+def new_lead() -> "agent.Userdata":
+    return agent.Userdata(lead_profile=agent.LeadProfile(name="Priya", company="Acme", email="priya@acme.example"))
+
+
+def submit_lead_and_end(size: int, tmp: str):
+    path = os.path.join(tmp, "lenskart_leads.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(make_leads(size), f, indent=2)
+    agent.LEADS_FILE = path  # absolute, so the tool's join with the src dir keeps it
+    ctx = ToolContext(new_lead())
+
+    async def op():
+        await agent.submit_lead_and_end(ctx)
+
+    return op
+
+
+def update_lead_profile(size: int, tmp: str):
+    ctx = ToolContext(new_lead())
+
+    async def op():
+        await agent.update_lead_profile(ctx, role="Owner", team_size="5", timeline="This month")
+
+    return op
+
+
+CASES = [
+    BenchCase("submit_lead_and_end", submit_lead_and_end),
+    BenchCase("update_lead_profile", update_lead_profile, sizes=(1,)),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day5", CASES)
@@ -5,6 +5,7 @@
 import logging
 import json
 import os
+import sys
 from datetime import datetime
 from typing import Annotated, Optional
 from dataclasses import dataclass, asdict
@@ -13,10 +14,7 @@ from dotenv import load_dotenv
 from pydantic import Field
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
-    JobProcess,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
@@ -24,13 +22,22 @@ from livekit.agents import (
 )
 
 # Plugins
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import (  # noqa: E402
+    VoiceConfig, append_json_record, attach_metrics, build_session, prewarm, start_session,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("lenskart_sdr")
 
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 # ======================================================
 # FAQ
@@ -133,16 +140,7 @@ async def submit_lead_and_end(ctx: RunContext[Userdata]) -> str:
     entry = asdict(p)
     entry["timestamp"] = datetime.utcnow().isoformat() + "Z"
 
-    if os.path.exists(db_path):
-        with open(db_path, "r") as f:
-            db = json.load(f)
-    else:
-        db = []
-
-    db.append(entry)
-
-    with open(db_path, "w") as f:
-        json.dump(db, f, indent=4)
+    append_json_record(db_path, entry)
 
     logger.info("LEAD SAVED: %s", entry)
 
@@ -214,35 +212,16 @@ You are **Asha**, a warm and friendly SDR for Lenskart.
 # ENTRYPOINT
 # ======================================================
 
-def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+VOICE = VoiceConfig(voice="en-US-natalie", style="Friendly")
 
 
 async def entrypoint(ctx: JobContext):
     userdata = Userdata(lead_profile=LeadProfile())
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-natalie",
-            style="Friendly",
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        userdata=userdata,
-    )
-
-    await session.start(
-        agent=LenskartSDRAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(
-            noise_cancellation=noise_cancellation.BVC()
-        ),
-    )
+    session = build_session(ctx, VOICE, userdata=userdata)
+    attach_metrics(ctx, session, agent="day5")
 
-    await ctx.connect()
+    await start_session(ctx, session, LenskartSDRAgent())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,87 @@
+"""
+Day 6 – Function tool benchmarks
+
+Times the fraud tools against a temporary fraud_cases table with N synthetic
+cases besides the seeded ones:
+    - lookup_customer: LOWER(userName) = LOWER(?) cannot use an index, so each
+      lookup scans the table (a hit near the end, a miss, a seeded name)
+    - resolve_fraud_case: UPDATE ... WHERE userName = ? then re-read the row
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 1000000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import agent
+from agent_runtime.toolbench import BenchCase, ToolContext, call_once, main, parametrize, run_benchmark
+
+
+def use_db(size: int, tmp: str):
+    path = os.path.join(tmp, "fraud_db.sqlite")
+    agent.get_db_path = lambda: path
+    agent.seed_database()
+    conn = agent.get_conn()
+    conn.executemany(
+        """
+        INSERT INTO fraud_cases (
+            userName, securityIdentifier, cardEnding, transactionName,
+            transactionAmount, transactionTime, transactionSource, case_status, notes
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        ((f"Customer{i}", f"{i:05d}", f"{i % 10000:04d}", "Online Store", "$10.00", "9:00 AM EST",
+          "website_checkout", "pending_review", "") for i in range(size)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def lookup_customer(size: int, tmp: str):
+    use_db(size, tmp)
+    ctx = ToolContext(agent.Userdata())
+    names = itertools.cycle([f"customer{size - 1}", "nobody", "jessica"])
+
+    async def op():
+        await agent.lookup_customer(ctx, next(names))
+
+    return op
+
+
+def resolve_fraud_case(size: int, tmp: str):
+    use_db(size, tmp)
+    ctx = ToolContext(agent.Userdata())
+
+    async def lookup():
+        await agent.lookup_customer(ctx, "Emily")
+
+    call_once(lookup)
+    statuses = itertools.cycle(["confirmed_safe", "confirmed_fraud"])
+
+    async def op():
+        await agent.resolve_fraud_case(ctx, next(statuses), "confirmed by phone")
+
+    return op
+
+
+CASES = [
+    BenchCase("lookup_customer", lookup_customer),
+    BenchCase("resolve_fraud_case", resolve_fraud_case),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day6", CASES)
@@ -5,7 +5,7 @@
 
 import logging
 import os
-import sqlite3
+import sys
 from datetime import datetime
 from typing import Annotated, Optional
 from dataclasses import dataclass
@@ -19,21 +19,24 @@ from dotenv import load_dotenv
 from pydantic import Field
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
-    JobProcess,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
     RunContext,
 )
 
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import VoiceConfig, attach_metrics, build_session, connect, prewarm, start_session  # noqa: E402
 
 logger = logging.getLogger("agent")
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 # ======================================================
 # 💾 1. DATABASE SETUP (SQLite)
@@ -59,10 +62,7 @@ def get_db_path():
 
 
 def get_conn():
-    path = get_db_path()
-    conn = sqlite3.connect(path, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return connect(get_db_path())
 
 
 def seed_database():
@@ -281,8 +281,7 @@ class FraudAgent(Agent):
 # 🎬 ENTRYPOINT
 # ======================================================
 
-def prewarm(proc: JobProcess):
-    proc.userdata["vad"] = silero.VAD.load()
+VOICE = VoiceConfig()
 
 
 async def entrypoint(ctx: JobContext):
@@ -293,26 +292,10 @@ async def entrypoint(ctx: JobContext):
 
     userdata = Userdata()
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-marcus",
-            style="Conversational",
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata["vad"],
-        userdata=userdata,
-    )
-
-    await session.start(
-        agent=FraudAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(noise_cancellation=noise_cancellation.BVC()),
-    )
+    session = build_session(ctx, VOICE, userdata=userdata)
+    attach_metrics(ctx, session, agent="day6")
 
-    await ctx.connect()
+    await start_session(ctx, session, FraudAgent())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,51 @@
+"""Fraud flow with scripted (offline) plugins: the real tools against a temporary database."""
+
+import pytest
+from livekit.agents import AgentSession
+
+import agent
+from agent import FraudAgent, Userdata
+from agent_runtime.fakes import FakeLLM, FakeResponse, FakeToolCall
+
+
+@pytest.fixture(autouse=True)
+def temp_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(agent, "get_db_path", lambda: str(tmp_path / "fraud.sqlite"))
+    agent.seed_database()
+
+
+async def test_lookup_then_resolve_fraud() -> None:
+    llm = FakeLLM([
+        FakeResponse(tool_calls=[FakeToolCall("lookup_customer", {"name": "john"})],
+                     then="I found your account. What is your security identifier?"),
+        FakeResponse(tool_calls=[FakeToolCall("resolve_fraud_case", {"status": "confirmed_fraud", "notes": "not me"})],
+                     then="Your card has been blocked."),
+    ])
+    userdata = Userdata()
+    async with llm, AgentSession(llm=llm, userdata=userdata) as session:
+        await session.start(FraudAgent())
+
+        result = await session.run(user_input="Hi, this is John")
+        result.expect.next_event().is_function_call(name="lookup_customer")
+        output = result.expect.next_event().is_function_call_output().event().item.output
+        assert "Record Found" in output and "ABC Industry" in output
+        result.expect.next_event().is_message(role="assistant")
+        assert userdata.active_case.userName == "John"
+
+        result = await session.run(user_input="No, I did not make that purchase")
+        result.expect.next_event().is_function_call(name="resolve_fraud_case")
+        output = result.expect.next_event().is_function_call_output().event().item.output
+        assert "card ending 4242 has been blocked" in output
+
+    row = agent.get_conn().execute("SELECT case_status, notes FROM fraud_cases WHERE userName = 'John'").fetchone()
+    assert tuple(row) == ("confirmed_fraud", "not me")
+
+
+async def test_unknown_customer() -> None:
+    llm = FakeLLM([FakeResponse(tool_calls=[FakeToolCall("lookup_customer", {"name": "zed"})], then="Please repeat your name.")])
+    async with llm, AgentSession(llm=llm, userdata=Userdata()) as session:
+        await session.start(FraudAgent())
+        result = await session.run(user_input="Zed")
+        result.expect.next_event().is_function_call(name="lookup_customer")
+        output = result.expect.next_event().is_function_call_output().event().item.output
+        assert "could not be located" in output
@@ -0,0 +1,79 @@
+"""
+Day 7 – Order history query benchmark
+
+Seeds a database with many orders across many customers and times one
+history page for:
+    - legacy: LOWER(customer_name)=LOWER(?) ORDER BY created_at DESC (full scan + sort)
+    - indexed: customer_key + (created_at, order_id) keyset page
+
+Usage:
+    uv run benchmarks/bench_order_history.py --orders 1000000 --customers 20000
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from order_store import configure_connection, create_schema, customer_key, fetch_order_page
+
+
+def seed(conn, orders: int, customers: int):
+    def rows():
+        for i in range(orders):
+            name = f"Customer {i % customers}"
+            created = f"2025-01-01 00:{(i // 60) % 60:02d}:{i % 60:02d}.{i:07d}"
+            yield (f"o{i}", created, 9.99, name, customer_key(name), "1 Main St", "delivered", created, created)
+
+    conn.executemany("""
+        INSERT INTO orders (order_id, timestamp, total, customer_name, customer_key, address, status, created_at, updated_at)
+        VALUES (?,?,?,?,?,?,?,?,?)
+    """, rows())
+    conn.commit()
+
+
+def legacy_page(conn, customer_name: str, limit: int):
+    return conn.execute("""
+        SELECT * FROM orders WHERE LOWER(customer_name)=LOWER(?)
+        ORDER BY created_at DESC LIMIT ?
+    """, (customer_name, limit)).fetchall()
+
+
+def timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--customers", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = configure_connection(sqlite3.connect(os.path.join(tmp, "history.sqlite")))
+        create_schema(conn)
+        t0 = time.perf_counter()
+        seed(conn, args.orders, args.customers)
+        print(f"seeded {args.orders} orders in {time.perf_counter() - t0:.1f}s")
+
+        name = "CUSTOMER 42"
+        legacy_ms = timed(lambda: legacy_page(conn, name, 5), max(1, args.repeat // 10))
+        first_ms = timed(lambda: fetch_order_page(conn, limit=5, customer_name=name), args.repeat)
+        _, cursor = fetch_order_page(conn, limit=5, customer_name=name)
+        next_ms = timed(lambda: fetch_order_page(conn, limit=5, customer_name=name, cursor=cursor), args.repeat)
+        conn.close()
+
+    print(f"legacy  page: {legacy_ms:9.3f} ms")
+    print(f"indexed page: {first_ms:9.3f} ms  (first)  {next_ms:9.3f} ms  (keyset next)")
+
+
+if __name__ == "__main__":
+    main()
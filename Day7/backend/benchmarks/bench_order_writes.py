@@ -0,0 +1,120 @@
+"""
+Day 7 – Concurrent order placement benchmark
+
+Places thousands of orders from parallel simulated sessions and reports
+commit latency (p50 / p99) and throughput for:
+    - legacy: one connection per order, rollback journal, one INSERT per cart line
+    - writer: OrderWriter (WAL + synchronous=NORMAL, group commit, executemany)
+
+Usage:
+    uv run benchmarks/bench_order_writes.py --sessions 50 --orders 40 --lines 5
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from order_store import OrderWriter, configure_connection, create_schema, order_rows
+
+
+@dataclass
+class BenchItem:
+    item_id: str
+    name: str
+    unit_price: float
+    quantity: int = 1
+    notes: str = ""
+
+
+def make_cart(lines: int):
+    return [BenchItem(f"item-{i}", f"Item {i}", 1.0 + i, quantity=1 + i % 3) for i in range(lines)]
+
+
+def legacy_insert(db_path, order_id, timestamp, total, customer_name, address, status, items):
+    """The pre-writer insert path: fresh connection, default journal, per-line INSERT."""
+    conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA foreign_keys = ON;")
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO orders (order_id, timestamp, total, customer_name, address, status, created_at, updated_at)
+        VALUES (?,?,?,?,?,?,datetime('now'),datetime('now'))
+    """, (order_id, timestamp, total, customer_name, address, status))
+    for ci in items:
+        cur.execute("""
+            INSERT INTO order_items (order_id,item_id,name,unit_price,quantity,notes)
+            VALUES (?,?,?,?,?,?)
+        """, (order_id, ci.item_id, ci.name, ci.unit_price, ci.quantity, ci.notes))
+    conn.commit()
+    conn.close()
+
+
+def fresh_db(path, wal: bool):
+    conn = sqlite3.connect(path)
+    if wal:
+        configure_connection(conn)
+    create_schema(conn)
+    conn.close()
+
+
+async def run_sessions(place, sessions: int, orders: int, lines: int):
+    cart = make_cart(lines)
+    total = round(sum(ci.unit_price * ci.quantity for ci in cart), 2)
+    latencies = []
+
+    async def session(sid: int):
+        for n in range(orders):
+            order_id = f"s{sid}-o{n}"
+            t0 = time.perf_counter()
+            await place(order_id, "2025-01-01T00:00:00Z", total, f"Customer {sid}", "1 Main St", "received", cart)
+            latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(session(s) for s in range(sessions)))
+    return latencies, time.perf_counter() - t0
+
+
+def report(label: str, latencies, elapsed: float):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"{label:<8} orders={len(latencies):<6} p50={p50:8.2f} ms  p99={p99:8.2f} ms  "
+          f"throughput={len(latencies) / elapsed:9.1f} orders/s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--orders", type=int, default=40, help="orders per session")
+    parser.add_argument("--lines", type=int, default=5, help="cart lines per order")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_db = os.path.join(tmp, "legacy.sqlite")
+        fresh_db(legacy_db, wal=False)
+
+        async def place_legacy(*order):
+            await asyncio.to_thread(legacy_insert, legacy_db, *order)
+
+        report("legacy", *await run_sessions(place_legacy, args.sessions, args.orders, args.lines))
+
+        writer_db = os.path.join(tmp, "writer.sqlite")
+        fresh_db(writer_db, wal=True)
+        writer = OrderWriter(writer_db).start()
+
+        async def place_writer(*order):
+            await writer.place(*order_rows(*order))
+
+        report("writer", *await run_sessions(place_writer, args.sessions, args.orders, args.lines))
+        writer.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Day 7 – Function tool benchmarks
+
+Times the grocery tools against a temporary order_db.sqlite holding N synthetic
+catalog items (catalog cases) or N past orders (order cases):
+    - find_item: LIKE '%query%' over name and tags (a seeded item, a synthetic
+      one, a miss that scans everything)
+    - add_to_cart: find_catalog_item_by_id_db matches LOWER(id), so the
+      primary key index is not used
+    - place_order: one order through ORDER_WRITER (delivery tracking disabled)
+    - order_history: first page of one customer's orders
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 1000000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import itertools
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import agent
+from agent_runtime.toolbench import BenchCase, ToolContext, main, parametrize, run_benchmark
+from order_store import OrderWriter, order_rows
+
+CATEGORIES = ["Dairy", "Bakery", "Pantry", "Snacks", "Beverages", "Fruits", "Vegetables"]
+CUSTOMERS = 100
+
+
+async def _no_tracking(order_id: str):
+    pass
+
+
+def use_db(tmp: str, items: int = 0, orders: int = 0):
+    path = os.path.join(tmp, "order_db.sqlite")
+    agent.get_db_path = lambda: path
+    agent.seed_database()
+    agent.ORDER_WRITER.close()
+    agent.ORDER_WRITER = OrderWriter(path).start()
+    agent.simulate_delivery_flow = _no_tracking
+
+    conn = agent.get_conn()
+    conn.executemany(
+        "INSERT INTO catalog (id,name,category,price,brand,size,units,tags) VALUES (?,?,?,?,?,?,?,?)",
+        ((f"sku-{i}", f"Item {i}", CATEGORIES[i % len(CATEGORIES)], 1.0 + i % 50, "Generic", "1 pc", "pc",
+          json.dumps([CATEGORIES[i % len(CATEGORIES)].lower()])) for i in range(items)),
+    )
+    conn.commit()
+    conn.close()
+
+    cart = [agent.CartItem("milk-1l", "Fresh Milk", 2.5, 2), agent.CartItem("bread-loaf", "White Bread Loaf", 1.8)]
+    last = None
+    for i in range(orders):
+        last = agent.ORDER_WRITER.submit(*order_rows(
+            f"o{i:08d}", "2025-01-01T00:00:00Z", 6.8, f"Customer {i % CUSTOMERS}", "1 Main St", "delivered", cart,
+        ))
+    if last is not None:
+        last.result()
+
+
+def find_item(size: int, tmp: str):
+    use_db(tmp, items=size)
+    ctx = ToolContext(agent.Userdata())
+    queries = itertools.cycle(["cheese", f"item {size - 1}", "saffron"])
+
+    async def op():
+        await agent.find_item(ctx, next(queries))
+
+    return op
+
+
+def add_to_cart(size: int, tmp: str):
+    use_db(tmp, items=size)
+    ctx = ToolContext(agent.Userdata())
+    ids = itertools.cycle([f"sku-{size - 1}", "eggs-12", f"sku-{size // 2}"])
+
+    async def op():
+        await agent.add_to_cart(ctx, next(ids), 1)
+
+    return op
+
+
+def place_order(size: int, tmp: str):
+    use_db(tmp, orders=size)
+    ctx = ToolContext(agent.Userdata())
+
+    async def op():
+        ctx.userdata.cart = [agent.CartItem("milk-1l", "Fresh Milk", 2.5, 2), agent.CartItem("eggs-12", "Eggs Pack", 3.0)]
+        await agent.place_order(ctx, "Customer 7", "1 Main St")
+
+    return op
+
+
+def order_history(size: int, tmp: str):
+    use_db(tmp, orders=size)
+    ctx = ToolContext(agent.Userdata())
+
+    async def op():
+        await agent.order_history(ctx, "Customer 7")
+
+    return op
+
+
+CASES = [
+    BenchCase("find_item", find_item),
+    BenchCase("add_to_cart", add_to_cart),
+    BenchCase("place_order", place_order),
+    BenchCase("order_history", order_history),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day7", CASES)
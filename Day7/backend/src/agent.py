@@ -15,6 +15,7 @@ Day 7 – Food & Grocery Ordering Voice Agent (SQLite)
 import json
 import logging
 import os
+import sys
 import sqlite3
 import uuid
 import asyncio
@@ -26,18 +27,27 @@ from dotenv import load_dotenv
 from pydantic import Field
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
-    JobProcess,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
     RunContext,
 )
 
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import VoiceConfig, attach_metrics, build_session, connect, prewarm, start_session  # noqa: E402
+
+from order_store import (
+    OrderWriter,
+    create_schema,
+    fetch_order,
+    fetch_order_page,
+    order_rows,
+)
 
 # -------------------------
 # Logging
@@ -48,7 +58,9 @@ handler = logging.StreamHandler()
 handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
 logger.addHandler(handler)
 
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 # -------------------------
 # DB CONFIG
@@ -68,10 +80,7 @@ def get_db_path() -> str:
 
 def get_conn():
     path = get_db_path()
-    conn = sqlite3.connect(path, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON;")
-    return conn
+    return connect(path, foreign_keys=True)
 
 
 def seed_database():
@@ -94,33 +103,8 @@ def seed_database():
             )
         """)
 
-        # Orders
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS orders (
-                order_id TEXT PRIMARY KEY,
-                timestamp TEXT,
-                total REAL,
-                customer_name TEXT,
-                address TEXT,
-                status TEXT DEFAULT 'received',
-                created_at TEXT DEFAULT (datetime('now')),
-                updated_at TEXT DEFAULT (datetime('now'))
-            )
-        """)
-
-        # Order items
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS order_items (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                order_id TEXT,
-                item_id TEXT,
-                name TEXT,
-                unit_price REAL,
-                quantity INTEGER,
-                notes TEXT,
-                FOREIGN KEY(order_id) REFERENCES orders(order_id) ON DELETE CASCADE
-            )
-        """)
+        # Orders + order items
+        create_schema(conn)
 
         # Seed general items
         cur.execute("SELECT COUNT(1) FROM catalog")
@@ -168,6 +152,9 @@ def seed_database():
 
 seed_database()
 
+# All order inserts go through this single writer thread.
+ORDER_WRITER = OrderWriter(get_db_path()).start()
+
 # -------------------------
 # CART + USER
 # -------------------------
@@ -226,49 +213,25 @@ def search_catalog_by_name_db(query: str) -> List[dict]:
 
 
 def insert_order_db(order_id, timestamp, total, customer_name, address, status, items):
-    conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("""
-        INSERT INTO orders (order_id, timestamp, total, customer_name, address, status, created_at, updated_at)
-        VALUES (?,?,?,?,?,?,datetime('now'),datetime('now'))
-    """, (order_id, timestamp, total, customer_name, address, status))
-    for ci in items:
-        cur.execute("""
-            INSERT INTO order_items (order_id,item_id,name,unit_price,quantity,notes)
-            VALUES (?,?,?,?,?,?)
-        """, (order_id, ci.item_id, ci.name, ci.unit_price, ci.quantity, ci.notes))
-    conn.commit()
-    conn.close()
+    """Blocking insert via the writer thread (for scripts; tools use ORDER_WRITER.place)."""
+    ORDER_WRITER.submit(*order_rows(order_id, timestamp, total, customer_name, address, status, items)).result()
 
 
 def get_order_db(order_id: str):
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM orders WHERE order_id=? LIMIT 1", (order_id,))
-    o = cur.fetchone()
-    if not o:
+    try:
+        return fetch_order(conn, order_id)
+    finally:
         conn.close()
-        return None
-    order = dict(o)
-    cur.execute("SELECT * FROM order_items WHERE order_id=?", (order_id,))
-    order["items"] = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return order
 
 
-def list_orders_db(limit=10, customer_name=None):
+def list_orders_db(limit=10, customer_name=None, cursor=None):
+    """Newest-first orders; returns (rows, next_cursor) for keyset pagination."""
     conn = get_conn()
-    cur = conn.cursor()
-    if customer_name:
-        cur.execute("""
-            SELECT * FROM orders WHERE LOWER(customer_name)=LOWER(?) 
-            ORDER BY created_at DESC LIMIT ?
-        """, (customer_name, limit))
-    else:
-        cur.execute("SELECT * FROM orders ORDER BY created_at DESC LIMIT ?", (limit,))
-    rows = [dict(r) for r in cur.fetchall()]
-    conn.close()
-    return rows
+    try:
+        return fetch_order_page(conn, limit=limit, customer_name=customer_name, cursor=cursor)
+    finally:
+        conn.close()
 
 
 def update_order_status_db(order_id, new_status):
@@ -468,7 +431,11 @@ async def place_order(ctx: RunContext[Userdata], customer_name: Annotated[str, F
     order_id = str(uuid.uuid4())[:8]
     now = datetime.utcnow().isoformat() + "Z"
     total = cart_total(ctx.userdata.cart)
-    insert_order_db(order_id, now, total, customer_name, address, "received", ctx.userdata.cart)
+    try:
+        await ORDER_WRITER.place(*order_rows(order_id, now, total, customer_name, address, "received", ctx.userdata.cart))
+    except sqlite3.Error as e:
+        logger.exception("ORDER INSERT FAILED: %s", e)
+        return "Sorry, I couldn't save your order. Please try again."
     ctx.userdata.cart = []
     ctx.userdata.customer_name = customer_name
     try:
@@ -500,13 +467,18 @@ async def get_order_status(ctx: RunContext[Userdata], order_id: Annotated[str, F
 
 
 @function_tool
-async def order_history(ctx: RunContext[Userdata], customer_name: Annotated[Optional[str], Field(description="Name", default=None)] = None):
-    rows = list_orders_db(limit=5, customer_name=customer_name)
+async def order_history(ctx: RunContext[Userdata], customer_name: Annotated[Optional[str], Field(description="Name", default=None)] = None, cursor: Annotated[Optional[str], Field(description="Cursor from a previous page, to fetch older orders", default=None)] = None):
+    try:
+        rows, next_cursor = list_orders_db(limit=5, customer_name=customer_name, cursor=cursor)
+    except ValueError:
+        return "That page cursor is not valid. Ask for order history again without a cursor."
     if not rows:
         return "No previous orders found."
     lines = []
     for o in rows:
         lines.append(f"- {o['order_id']} | ${o['total']:.2f} | {o['status']}")
+    if next_cursor:
+        lines.append(f"More orders available (cursor: {next_cursor})")
     return "\n".join(lines)
 
 # -------------------------
@@ -532,11 +504,7 @@ class FoodAgent(Agent):
 # -------------------------
 # ENTRYPOINT
 # -------------------------
-def prewarm(proc: JobProcess):
-    try:
-        proc.userdata["vad"] = silero.VAD.load()
-    except Exception:
-        pass
+VOICE = VoiceConfig()
 
 
 async def entrypoint(ctx: JobContext):
@@ -545,26 +513,10 @@ async def entrypoint(ctx: JobContext):
 
     userdata = Userdata()
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-marcus",
-            style="Conversational",
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata.get("vad"),
-        userdata=userdata,
-    )
-
-    await session.start(
-        agent=FoodAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(noise_cancellation=noise_cancellation.BVC()),
-    )
-
-    await ctx.connect()
+    session = build_session(ctx, VOICE, userdata=userdata)
+    attach_metrics(ctx, session, agent="day7")
+
+    await start_session(ctx, session, FoodAgent())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,316 @@
+"""
+Day 7 – Order write path
+- One dedicated writer thread owns the only write connection to 'order_db.sqlite'
+- Sessions hand orders to the writer through a queue and await the result
+- Orders waiting in the queue are committed together in one transaction (group commit)
+- Each order runs inside its own SAVEPOINT, so one bad order never rolls back the others
+- The database runs in WAL mode with synchronous=NORMAL, so readers never block the writer
+- Order reads: one JOIN per order fetch, keyset-paginated history on indexed customer keys
+"""
+
+import asyncio
+import logging
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+from typing import List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("food_agent_sqlite")
+
+# -------------------------
+# SCHEMA
+# -------------------------
+ORDERS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS orders (
+        order_id TEXT PRIMARY KEY,
+        timestamp TEXT,
+        total REAL,
+        customer_name TEXT,
+        customer_key TEXT,
+        address TEXT,
+        status TEXT DEFAULT 'received',
+        created_at TEXT DEFAULT (datetime('now')),
+        updated_at TEXT DEFAULT (datetime('now'))
+    );
+
+    CREATE TABLE IF NOT EXISTS order_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id TEXT,
+        item_id TEXT,
+        name TEXT,
+        unit_price REAL,
+        quantity INTEGER,
+        notes TEXT,
+        FOREIGN KEY(order_id) REFERENCES orders(order_id) ON DELETE CASCADE
+    );
+"""
+
+# Created after the customer_key migration so older databases get them too.
+ORDERS_INDEXES = """
+    CREATE INDEX IF NOT EXISTS idx_orders_customer_created
+        ON orders (customer_key, created_at DESC, order_id DESC);
+    CREATE INDEX IF NOT EXISTS idx_orders_created
+        ON orders (created_at DESC, order_id DESC);
+    CREATE INDEX IF NOT EXISTS idx_orders_status_created
+        ON orders (status, created_at);
+    CREATE INDEX IF NOT EXISTS idx_order_items_order
+        ON order_items (order_id);
+"""
+
+INSERT_ORDER_SQL = """
+    INSERT INTO orders (order_id, timestamp, total, customer_name, customer_key, address, status, created_at, updated_at)
+    VALUES (?,?,?,?,?,?,?,datetime('now'),datetime('now'))
+"""
+
+INSERT_ORDER_ITEM_SQL = """
+    INSERT INTO order_items (order_id,item_id,name,unit_price,quantity,notes)
+    VALUES (?,?,?,?,?,?)
+"""
+
+# How long a connection waits on a locked database before raising.
+BUSY_TIMEOUT_MS = 5000
+
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Apply the pragmas every Day 7 connection should run with."""
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+    return conn
+
+
+def customer_key(name: Optional[str]) -> Optional[str]:
+    """Normalized lookup key for a customer name ("  Jane  DOE " -> "jane doe")."""
+    if name is None:
+        return None
+    return " ".join(name.split()).lower()
+
+
+def create_schema(conn: sqlite3.Connection):
+    conn.executescript(ORDERS_SCHEMA)
+
+    # Databases created before customer_key existed: add and backfill it.
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(orders)")}
+    if "customer_key" not in columns:
+        conn.execute("ALTER TABLE orders ADD COLUMN customer_key TEXT")
+    conn.create_function("customer_key", 1, customer_key, deterministic=True)
+    conn.execute("""
+        UPDATE orders SET customer_key = customer_key(customer_name)
+        WHERE customer_key IS NULL AND customer_name IS NOT NULL
+    """)
+    conn.commit()
+
+    conn.executescript(ORDERS_INDEXES)
+
+
+def order_rows(order_id, timestamp, total, customer_name, address, status, items) -> Tuple[tuple, List[tuple]]:
+    """Turn an order and its cart lines into the row tuples the writer inserts."""
+    order_row = (order_id, timestamp, total, customer_name, customer_key(customer_name), address, status)
+    item_rows = [
+        (order_id, ci.item_id, ci.name, ci.unit_price, ci.quantity, ci.notes)
+        for ci in items
+    ]
+    return order_row, item_rows
+
+
+# -------------------------
+# READS
+# -------------------------
+_ORDER_COLUMNS = ("order_id", "timestamp", "total", "customer_name", "customer_key",
+                  "address", "status", "created_at", "updated_at")
+_ITEM_COLUMNS = ("id", "order_id", "item_id", "name", "unit_price", "quantity", "notes")
+
+
+def fetch_order(conn: sqlite3.Connection, order_id: str) -> Optional[dict]:
+    """Order header plus its items in a single JOIN query."""
+    rows = conn.execute("""
+        SELECT o.order_id, o.timestamp, o.total, o.customer_name, o.customer_key,
+               o.address, o.status, o.created_at, o.updated_at,
+               i.id, i.order_id, i.item_id, i.name, i.unit_price, i.quantity, i.notes
+        FROM orders o
+        LEFT JOIN order_items i ON i.order_id = o.order_id
+        WHERE o.order_id = ?
+        ORDER BY i.id
+    """, (order_id,)).fetchall()
+    if not rows:
+        return None
+    n = len(_ORDER_COLUMNS)
+    order = dict(zip(_ORDER_COLUMNS, tuple(rows[0])[:n]))
+    order["items"] = [
+        dict(zip(_ITEM_COLUMNS, tuple(r)[n:]))
+        for r in rows
+        if r[n] is not None
+    ]
+    return order
+
+
+def encode_cursor(row: dict) -> str:
+    return f"{row['created_at']}|{row['order_id']}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    created_at, sep, order_id = cursor.rpartition("|")
+    if not sep:
+        raise ValueError(f"Invalid order history cursor: {cursor!r}")
+    return created_at, order_id
+
+
+def fetch_order_page(conn: sqlite3.Connection, limit: int = 10, customer_name: Optional[str] = None,
+                     cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    """Newest-first page of orders using keyset pagination on (created_at, order_id).
+
+    Returns the rows and the cursor for the next (older) page, or None when
+    there are no more orders.
+    """
+    where, params = [], []
+    if customer_name:
+        where.append("customer_key = ?")
+        params.append(customer_key(customer_name))
+    if cursor:
+        where.append("(created_at, order_id) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+    sql = "SELECT " + ", ".join(_ORDER_COLUMNS) + " FROM orders"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY created_at DESC, order_id DESC LIMIT ?"
+    # Fetch one extra row to know whether another page exists.
+    params.append(limit + 1)
+
+    rows = [dict(zip(_ORDER_COLUMNS, tuple(r))) for r in conn.execute(sql, params)]
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+
+# -------------------------
+# WRITER THREAD
+# -------------------------
+_STOP = object()
+
+
+class OrderWriter:
+    """Serializes all order inserts onto one thread and one connection.
+
+    `submit()` is thread-safe and returns a concurrent Future; `place()` is the
+    awaitable wrapper used from the agent's event loop. If the writer cannot
+    open its connection, queued orders fail with that error and `submit()`
+    raises, as it does whenever the writer thread is not running.
+    """
+
+    def __init__(self, db_path: str, max_batch: int = 256):
+        self.db_path = db_path
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None  # why the writer thread could not start
+
+    # ---- lifecycle ----
+    def start(self) -> "OrderWriter":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._error = None
+                self._thread = threading.Thread(
+                    target=self._run, name="order-writer", daemon=True
+                )
+                self._thread.start()
+        return self
+
+    def close(self, timeout: Optional[float] = None):
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    # ---- producers ----
+    def submit(self, order_row: tuple, item_rows: Sequence[tuple]) -> Future:
+        fut: Future = Future()
+        with self._lock:
+            if self._error is not None or self._thread is None or not self._thread.is_alive():
+                raise RuntimeError("order writer is not running") from self._error
+            self._queue.put((order_row, list(item_rows), fut))
+        return fut
+
+    async def place(self, order_row: tuple, item_rows: Sequence[tuple]) -> None:
+        await asyncio.wrap_future(self.submit(order_row, item_rows))
+
+    # ---- consumer ----
+    def _run(self):
+        try:
+            conn = configure_connection(
+                sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+            )
+        except Exception as e:
+            logger.exception("ORDER WRITER FAILED TO START: %s", e)
+            self._fail_queued(e)
+            return
+        try:
+            while True:
+                job = self._queue.get()
+                if job is _STOP:
+                    return
+                batch = [job]
+                stop = False
+                while len(batch) < self.max_batch:
+                    try:
+                        job = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if job is _STOP:
+                        stop = True
+                        break
+                    batch.append(job)
+                self._commit_batch(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _fail_queued(self, error: BaseException):
+        with self._lock:
+            self._error = error  # submit() raises from now on, so nothing is queued after the drain
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not _STOP and job[2].set_running_or_notify_cancel():
+                job[2].set_exception(error)
+
+    def _commit_batch(self, conn: sqlite3.Connection, batch: list):
+        # Skip orders whose caller already gave up (cancelled futures).
+        batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for order_row, item_rows, fut in batch:
+                conn.execute("SAVEPOINT order_write")
+                try:
+                    conn.execute(INSERT_ORDER_SQL, order_row)
+                    if item_rows:
+                        conn.executemany(INSERT_ORDER_ITEM_SQL, item_rows)
+                    conn.execute("RELEASE order_write")
+                    results.append((fut, None))
+                except sqlite3.Error as e:
+                    conn.execute("ROLLBACK TO order_write")
+                    conn.execute("RELEASE order_write")
+                    results.append((fut, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            logger.exception("ORDER WRITE FAILED: %s", e)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            for _, _, fut in batch:
+                fut.set_exception(e)
+            return
+
+        for fut, err in results:
+            if err is None:
+                fut.set_result(None)
+            else:
+                fut.set_exception(err)
@@ -0,0 +1,154 @@
+import asyncio
+import sqlite3
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import pytest
+
+from order_store import (
+    ORDERS_SCHEMA,
+    OrderWriter,
+    configure_connection,
+    create_schema,
+    fetch_order,
+    fetch_order_page,
+    order_rows,
+)
+
+
+@dataclass
+class _Item:
+    item_id: str
+    name: str
+    unit_price: float
+    quantity: int = 1
+    notes: str = ""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "orders.sqlite")
+    conn = configure_connection(sqlite3.connect(path))
+    conn.executescript(ORDERS_SCHEMA)
+    conn.close()
+    return path
+
+
+def _count(db_path, table):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(f"SELECT COUNT(1) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_orders_are_all_committed(db_path) -> None:
+    writer = OrderWriter(db_path).start()
+    cart = [_Item("milk-1l", "Fresh Milk", 2.5, 2), _Item("eggs-12", "Eggs Pack", 3.0)]
+    try:
+        await asyncio.gather(*(
+            writer.place(*order_rows(f"o{i}", "ts", 8.0, "Ann", "addr", "received", cart))
+            for i in range(200)
+        ))
+    finally:
+        writer.close()
+
+    assert _count(db_path, "orders") == 200
+    assert _count(db_path, "order_items") == 400
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_failed_order_does_not_roll_back_its_batch(db_path) -> None:
+    writer = OrderWriter(db_path)
+    cart = [_Item("bread-loaf", "White Bread Loaf", 1.8)]
+    # Commit all three as one batch, as the writer thread would after draining its queue.
+    batch = [(*order_rows(oid, "ts", 1.8, "Ann", "addr", "received", cart), Future()) for oid in ("a", "dup", "dup")]
+    conn = configure_connection(sqlite3.connect(db_path, isolation_level=None))
+    try:
+        writer._commit_batch(conn, batch)
+    finally:
+        conn.close()
+    futures = [fut for _, _, fut in batch]
+    futures[0].result(timeout=5)
+    futures[1].result(timeout=5)
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[2].result(timeout=5)
+
+    assert _count(db_path, "orders") == 2
+    assert _count(db_path, "order_items") == 2
+
+
+
+def test_writer_that_cannot_connect_fails_orders(tmp_path) -> None:
+    writer = OrderWriter(str(tmp_path / "missing-dir" / "orders.sqlite")).start()
+    writer._thread.join(timeout=5)
+
+    with pytest.raises(RuntimeError) as raised:
+        writer.submit(*order_rows("x", "ts", 1.0, "Ann", "addr", "received", []))
+    assert isinstance(raised.value.__cause__, sqlite3.OperationalError)
+    with pytest.raises(RuntimeError):
+        OrderWriter(str(tmp_path / "never-started.sqlite")).submit(("row",), [])
+
+def test_history_pages_by_customer_key(db_path) -> None:
+    writer = OrderWriter(db_path).start()
+    cart = [_Item("tea-100g", "Black Tea", 2.0)]
+    try:
+        for i in range(7):
+            name = "  Jane  DOE " if i % 2 else "jane doe"
+            writer.submit(*order_rows(f"j{i}", "ts", 2.0, name, "addr", "received", cart)).result(timeout=5)
+        writer.submit(*order_rows("bob", "ts", 2.0, "Bob", "addr", "received", cart)).result(timeout=5)
+    finally:
+        writer.close()
+
+    conn = sqlite3.connect(db_path)
+    seen, cursor = [], None
+    while True:
+        rows, cursor = fetch_order_page(conn, limit=3, customer_name="JANE DOE", cursor=cursor)
+        seen.extend(r["order_id"] for r in rows)
+        if cursor is None:
+            break
+    conn.close()
+
+    assert sorted(seen) == [f"j{i}" for i in range(7)]
+    assert len(set(seen)) == 7
+
+
+def test_fetch_order_joins_items(db_path) -> None:
+    writer = OrderWriter(db_path).start()
+    cart = [_Item("pasta-500g", "Pasta", 1.5, 2), _Item("sauce-jar", "Tomato Pasta Sauce", 2.2)]
+    try:
+        writer.submit(*order_rows("p1", "ts", 5.2, "Ann", "addr", "received", cart)).result(timeout=5)
+    finally:
+        writer.close()
+
+    conn = sqlite3.connect(db_path)
+    order = fetch_order(conn, "p1")
+    assert fetch_order(conn, "missing") is None
+    conn.close()
+
+    assert order["status"] == "received"
+    assert [(i["item_id"], i["quantity"]) for i in order["items"]] == [("pasta-500g", 2), ("sauce-jar", 1)]
+
+
+def test_create_schema_backfills_customer_key(tmp_path) -> None:
+    conn = sqlite3.connect(str(tmp_path / "old.sqlite"))
+    conn.execute("""
+        CREATE TABLE orders (
+            order_id TEXT PRIMARY KEY, timestamp TEXT, total REAL, customer_name TEXT,
+            address TEXT, status TEXT DEFAULT 'received',
+            created_at TEXT DEFAULT (datetime('now')), updated_at TEXT DEFAULT (datetime('now'))
+        )
+    """)
+    conn.execute("INSERT INTO orders (order_id, customer_name) VALUES ('old', ' Mary  Ann ')")
+    conn.commit()
+
+    create_schema(conn)
+
+    assert conn.execute("SELECT customer_key FROM orders").fetchone()[0] == "mary ann"
+    rows, _ = fetch_order_page(conn, customer_name="mary ann")
+    assert [r["order_id"] for r in rows] == ["old"]
+    conn.close()
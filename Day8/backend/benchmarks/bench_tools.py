@@ -0,0 +1,117 @@
+"""
+Day 8 – Function tool benchmarks
+
+Times player_action (match the spoken action, apply effects, save the turn to
+a temporary SaveStore) for:
+    - player_action_world: a synthetic ring world of N scenes, each with
+      forward / back / search choices
+    - player_action_journal: the authored world with a journal and inventory
+      of N entries each (record_turn stores both as JSON on every turn)
+    - show_journal: reads the journal out (grows with N)
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 100000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import agent
+from agent_runtime.toolbench import BenchCase, ToolContext, main, parametrize, run_benchmark
+from savegame import SaveStore
+from world import compile_world, load_world
+
+AUTHORED_WORLD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src", agent.WORLD_FILE)
+
+
+def make_world(n: int):
+    scenes = {}
+    for i in range(n):
+        scenes[f"s{i}"] = {
+            "title": f"Corridor {i}",
+            "desc": f"A dim corridor, section {i}. Pipes hiss overhead.",
+            "choices": {
+                "go_forward": {"desc": "Walk further down the corridor.", "result_scene": f"s{(i + 1) % n}"},
+                "go_back": {"desc": "Retreat the way you came.", "result_scene": f"s{(i - 1) % n}"},
+                "search_room": {"desc": "Search the lockers.", "result_scene": f"s{i}",
+                                "effects": {"add_journal": f"Searched section {i}."}},
+            },
+        }
+    return compile_world({"title": "Ring", "start": "s0", "scenes": scenes})
+
+
+def use_saves(tmp: str):
+    agent.SAVES.close()
+    agent.SAVES = SaveStore(os.path.join(tmp, "savegame.sqlite"))
+
+
+def player_action_world(size: int, tmp: str):
+    use_saves(tmp)
+    agent.WORLD = make_world(size)
+    ctx = ToolContext(agent.Userdata())
+    agent.new_game(ctx.userdata)
+    actions = itertools.cycle(["walk further down the corridor", "go_forward", "search the lockers"])
+
+    async def op():
+        await agent.player_action(ctx, next(actions))
+        if len(ctx.userdata.journal) > 100:
+            ctx.userdata.journal.clear()
+
+    return op
+
+
+def _journal_session(size: int, tmp: str):
+    use_saves(tmp)
+    agent.WORLD = load_world(AUTHORED_WORLD)
+    ctx = ToolContext(agent.Userdata())
+    agent.new_game(ctx.userdata)
+    ctx.userdata.journal = [f"Entry {i}: the beacon pulses." for i in range(size)]
+    ctx.userdata.inventory = [f"item-{i}" for i in range(size)]
+    return ctx
+
+
+def player_action_journal(size: int, tmp: str):
+    ctx = _journal_session(size, tmp)
+    scene = agent.WORLD.start_scene
+
+    async def op():
+        # stay on the start scene: every call takes the same first choice from it
+        ctx.userdata.current_scene = scene.key
+        await agent.player_action(ctx, scene.choices[0].key)
+        del ctx.userdata.journal[size:]
+        del ctx.userdata.inventory[size:]
+
+    return op
+
+
+def show_journal(size: int, tmp: str):
+    ctx = _journal_session(size, tmp)
+
+    async def op():
+        await agent.show_journal(ctx)
+
+    return op
+
+
+CASES = [
+    BenchCase("player_action_world", player_action_world),
+    BenchCase("player_action_journal", player_action_journal),
+    BenchCase("show_journal", show_journal),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day8", CASES)
@@ -11,34 +11,50 @@ Day 8 – Voice Game Master (Sci-Fi Survival Adventure) - Voice-only GM agent
     - player_action(action_text): accept player's spoken action, update state, advance scene
     - show_journal(): list remembered facts, NPCs, named locations, choices
     - restart_adventure(): reset state and start over
+    - resume_adventure(session_id | player_name): continue a saved adventure
 - Userdata keeps continuity between turns: history, inventory, named NPCs/locations, choices, current_scene
+- The world map is authored in world.json and compiled at startup (see world.py)
+- Every turn is saved to 'savegame.sqlite' (see savegame.py); only recent history stays in memory
+- Plainly spoken choices skip the LLM and go straight to TTS (see fastpath.py)
 """
 
 import json
 import logging
 import os
+import sys
 import asyncio
+import sqlite3
+import time
 import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Optional, Annotated
+from typing import Deque, List, Dict, Optional, Annotated, Tuple
 
 from dotenv import load_dotenv
 from pydantic import Field
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
-    JobProcess,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
     RunContext,
+    StopResponse,
+    metrics,
 )
+from livekit.agents.llm import ChatContext, ChatMessage
 
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import VoiceConfig, attach_metrics, build_session, prewarm, start_session  # noqa: E402
+
+from fastpath import FastPathStats, fast_path_choice
+from savegame import SaveStore, iso_from_ms, now_ms
+from world import Choice, Scene, load_world
 
 # -------------------------
 # Logging
@@ -49,242 +65,25 @@ handler = logging.StreamHandler()
 handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
 logger.addHandler(handler)
 
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 # -------------------------
 # NEW WORLD: Sci-Fi Mini-Arc “Echoes of Titan-Prime”
+# Authored in world.json, compiled once into an immutable scene graph.
+# -------------------------
+WORLD_FILE = "world.json"
+WORLD = load_world(os.path.join(os.path.dirname(os.path.abspath(__file__)), WORLD_FILE))
+
+# -------------------------
+# Save games
 # -------------------------
-WORLD = {
-    "intro": {
-        "title": "Echoes of Titan-Prime",
-        "desc": (
-            "Your eyes open inside a half-crashed escape pod. Orange methane fog rolls across "
-            "Titan-Prime’s frozen plain. The hull around you is cracked, sparking faintly. "
-            "A dim beacon pulses from a ridge to the north, while strange footprints lead toward "
-            "a metallic ruin in the west."
-        ),
-        "choices": {
-            "check_pod": {
-                "desc": "Inspect the damaged escape pod.",
-                "result_scene": "pod",
-            },
-            "follow_footprints": {
-                "desc": "Follow the unknown footprints toward the metallic ruin.",
-                "result_scene": "ruin_approach",
-            },
-            "move_towards_beacon": {
-                "desc": "Head north toward the pulsing ridge beacon.",
-                "result_scene": "ridge",
-            },
-        },
-    },
-    "pod": {
-        "title": "Damaged Escape Pod",
-        "desc": (
-            "Inside the pod you find a cracked datapad flickering with static and a portable "
-            "oxygen cell. A message loops: 'Core unit missing… signal compromised… locate source.'"
-        ),
-        "choices": {
-            "take_oxygen": {
-                "desc": "Take the oxygen cell.",
-                "result_scene": "pod_taken",
-                "effects": {"add_inventory": "oxygen_cell", "add_journal": "Collected oxygen cell from pod."},
-            },
-            "inspect_datapad": {
-                "desc": "Try to read the cracked datapad.",
-                "result_scene": "datapad",
-            },
-            "leave_pod": {
-                "desc": "Exit the pod and look around.",
-                "result_scene": "intro",
-            },
-        },
-    },
-    "pod_taken": {
-        "title": "Supplies Secured",
-        "desc": (
-            "You secure the oxygen cell to your suit. Automated vents hiss as pressure stabilizes. "
-            "The datapad sparks again, pointing west—toward the metallic ruin."
-        ),
-        "choices": {
-            "go_to_ruin": {
-                "desc": "Head toward the metallic ruin.",
-                "result_scene": "ruin_approach",
-            },
-            "check_datapad": {
-                "desc": "Inspect the datapad more closely.",
-                "result_scene": "datapad",
-            },
-        },
-    },
-    "datapad": {
-        "title": "Glitched Datapad",
-        "desc": (
-            "The screen stabilizes long enough to show a single coordinate and a warning: "
-            "'Power Core displaced. Entity detected.' A faint map overlay points west."
-        ),
-        "choices": {
-            "follow_map": {
-                "desc": "Follow the datapad map to the west.",
-                "result_scene": "ruin_approach",
-            },
-            "return_outside": {
-                "desc": "Return outside the escape pod.",
-                "result_scene": "intro",
-            },
-        },
-    },
-    "ruin_approach": {
-        "title": "Approaching the Metallic Ruin",
-        "desc": (
-            "The ruin hums with a soft vibration. A fractured door panel lies open, and strange "
-            "claw-like marks run across the metal. Something inside emits a rhythmic signal."
-        ),
-        "choices": {
-            "enter_ruin": {
-                "desc": "Enter the metallic ruin.",
-                "result_scene": "ruin_inside",
-            },
-            "scan_area": {
-                "desc": "Scan the surroundings for movement.",
-                "result_scene": "scan",
-            },
-            "retreat": {
-                "desc": "Retreat back to the escape pod.",
-                "result_scene": "intro",
-            },
-        },
-    },
-    "scan": {
-        "title": "Brief Scan",
-        "desc": (
-            "Your suit scanner picks up a heat signature inside the ruin—small, fast-moving, "
-            "possibly non-hostile. The rhythmic signal spikes momentarily."
-        ),
-        "choices": {
-            "enter_ruin": {
-                "desc": "Enter the metallic ruin cautiously.",
-                "result_scene": "ruin_inside",
-            },
-            "wait_outside": {
-                "desc": "Wait outside and observe.",
-                "result_scene": "ridge",
-            },
-        },
-    },
-    "ridge": {
-        "title": "Beacon Ridge",
-        "desc": (
-            "The ridge beacon emits short coded bursts. A metal crate lies half-buried nearby, "
-            "and the atmosphere crackles with static."
-        ),
-        "choices": {
-            "open_crate": {
-                "desc": "Try to open the metal crate.",
-                "result_scene": "crate",
-            },
-            "follow_signal": {
-                "desc": "Follow the beacon signal pattern.",
-                "result_scene": "ruin_approach",
-            },
-            "return_back": {
-                "desc": "Return toward the crash site.",
-                "result_scene": "intro",
-            },
-        },
-    },
-    "crate": {
-        "title": "Supply Crate",
-        "desc": (
-            "Inside the crate you find a glowing tri-core module. Your suit identifies it as the "
-            "missing Power Core mentioned by the datapad."
-        ),
-        "choices": {
-            "take_core": {
-                "desc": "Take the tri-core module.",
-                "result_scene": "core_obtained",
-                "effects": {"add_inventory": "tri_core_module", "add_journal": "Recovered main Power Core."},
-            },
-            "leave_crate": {
-                "desc": "Leave the crate undisturbed.",
-                "result_scene": "ridge",
-            },
-        },
-    },
-    "core_obtained": {
-        "title": "Power Core Secured",
-        "desc": (
-            "With the Power Core secured, the beacon shifts tone—almost relieved. A debug message "
-            "appears on your suit: 'Return Core to Ruin Chamber for extraction.'"
-        ),
-        "choices": {
-            "go_to_ruin": {
-                "desc": "Head to the ruin chamber.",
-                "result_scene": "ruin_inside",
-            },
-            "return_pod": {
-                "desc": "Take the core back to the escape pod.",
-                "result_scene": "end_arc",
-            },
-        },
-    },
-    "ruin_inside": {
-        "title": "Inside the Ruin",
-        "desc": (
-            "You enter a circular chamber filled with cracked machinery. At its center, a socket matches "
-            "the shape of your tri-core module. A faint mechanical voice repeats: 'Restore… restore… restore…'"
-        ),
-        "choices": {
-            "insert_core": {
-                "desc": "Insert the tri-core module into the socket.",
-                "result_scene": "end_arc",
-                "effects": {"add_journal": "Core restored. System reboot initiated."},
-            },
-            "inspect_room": {
-                "desc": "Look for other clues in the room.",
-                "result_scene": "room_scan",
-            },
-            "retreat": {
-                "desc": "Retreat back outside the ruin.",
-                "result_scene": "ruin_approach",
-            },
-        },
-    },
-    "room_scan": {
-        "title": "Room Scan",
-        "desc": (
-            "You find inscriptions describing an extinct research crew that once lived here. "
-            "A symbol on the wall resembles the tri-core module."
-        ),
-        "choices": {
-            "insert_core": {
-                "desc": "Insert the tri-core module.",
-                "result_scene": "end_arc",
-            },
-            "leave_room": {
-                "desc": "Leave the room.",
-                "result_scene": "ruin_approach",
-            },
-        },
-    },
-    "end_arc": {
-        "title": "Mini-Arc Complete",
-        "desc": (
-            "As the Power Core activates, the ruin lights up. Your suit projects a safe extraction route. "
-            "A calm hum spreads through the ground—this chapter of Titan-Prime’s mystery concludes… for now."
-        ),
-        "choices": {
-            "restart": {
-                "desc": "Restart the adventure.",
-                "result_scene": "intro",
-            },
-            "explore_more": {
-                "desc": "Continue exploring the world.",
-                "result_scene": "intro",
-            },
-        },
-    },
-}
+SAVE_FILE = "savegame.sqlite"
+SAVES = SaveStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), SAVE_FILE))
+
+# Turns kept in memory per session; older turns live only in the save file.
+HISTORY_IN_MEMORY = 50
 
 # -------------------------
 # Per-session Userdata
@@ -293,36 +92,31 @@ WORLD = {
 class Userdata:
     player_name: Optional[str] = None
     current_scene: str = "intro"
-    history: List[Dict] = field(default_factory=list)
+    history: Deque[Dict] = field(default_factory=lambda: deque(maxlen=HISTORY_IN_MEMORY))
     journal: List[str] = field(default_factory=list)
     inventory: List[str] = field(default_factory=list)
     named_npcs: Dict[str, str] = field(default_factory=dict)
-    choices_made: List[str] = field(default_factory=list)
+    choices_made: Deque[str] = field(default_factory=lambda: deque(maxlen=HISTORY_IN_MEMORY))
     session_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
+    started_ms: int = field(default_factory=now_ms)
     started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+    save_created: bool = False
 
 # -------------------------
 # Helper functions
 # -------------------------
 def scene_text(scene_key: str, userdata: Userdata) -> str:
-    scene = WORLD.get(scene_key)
+    scene = WORLD.scene(scene_key)
     if not scene:
         return "You are in a featureless void. What do you do?"
+    return scene.text
 
-    desc = f"{scene['desc']}\n\nChoices:\n"
-    for cid, cmeta in scene.get("choices", {}).items():
-        desc += f"- {cmeta['desc']} (say: {cid})\n"
-
-    desc += "\nWhat do you do?"
-    return desc
-
-def apply_effects(effects: dict, userdata: Userdata):
-    if not effects:
-        return
-    if "add_journal" in effects:
-        userdata.journal.append(effects["add_journal"])
-    if "add_inventory" in effects:
-        userdata.inventory.append(effects["add_inventory"])
+def apply_effects(effects, userdata: Userdata):
+    for kind, value in effects:
+        if kind == "add_journal":
+            userdata.journal.append(value)
+        elif kind == "add_inventory":
+            userdata.inventory.append(value)
 
 def summarize_scene_transition(old_scene: str, action_key: str, result_scene: str, userdata: Userdata) -> str:
     entry = {
@@ -335,6 +129,45 @@ def summarize_scene_transition(old_scene: str, action_key: str, result_scene: st
     userdata.choices_made.append(action_key)
     return f"You chose '{action_key}'."
 
+def new_game(userdata: Userdata):
+    userdata.current_scene = WORLD.start_scene.key
+    userdata.history = deque(maxlen=HISTORY_IN_MEMORY)
+    userdata.journal = []
+    userdata.inventory = []
+    userdata.named_npcs = {}
+    userdata.choices_made = deque(maxlen=HISTORY_IN_MEMORY)
+    userdata.session_id = str(uuid.uuid4())[:8]
+    userdata.started_ms = now_ms()
+    userdata.started_at = iso_from_ms(userdata.started_ms)
+    userdata.save_created = False
+
+async def save_turn(userdata: Userdata, action_key: str, result_scene: str):
+    """Persist one turn; a failed save is logged and never interrupts the game."""
+    try:
+        if not userdata.save_created:
+            await asyncio.to_thread(
+                SAVES.create_session, userdata.session_id, userdata.player_name,
+                WORLD.start_scene.key, userdata.started_ms,
+            )
+            userdata.save_created = True
+        await asyncio.to_thread(
+            SAVES.record_turn, userdata.session_id, action_key, result_scene, now_ms(),
+            list(userdata.journal), list(userdata.inventory),
+        )
+    except (sqlite3.Error, KeyError) as e:
+        logger.warning("Save failed for session %s: %s", userdata.session_id, e)
+
+async def advance_scene(userdata: Userdata, scene: Scene, chosen: Choice) -> Tuple[str, Scene]:
+    """Apply a chosen action (effects, history, save); returns the note and the next scene."""
+    next_scene = WORLD.target(chosen)
+
+    apply_effects(chosen.effects, userdata)
+    note = summarize_scene_transition(scene.key, chosen.key, next_scene.key, userdata)
+
+    userdata.current_scene = next_scene.key
+    await save_turn(userdata, chosen.key, next_scene.key)
+    return note, next_scene
+
 # -------------------------
 # Tools
 # -------------------------
@@ -348,17 +181,11 @@ async def start_adventure(
     if player_name:
         userdata.player_name = player_name
 
-    userdata.current_scene = "intro"
-    userdata.history = []
-    userdata.journal = []
-    userdata.inventory = []
-    userdata.named_npcs = {}
-    userdata.choices_made = []
-    userdata.session_id = str(uuid.uuid4())[:8]
-    userdata.started_at = datetime.utcnow().isoformat() + "Z"
+    new_game(userdata)
 
     opening = (
-        f"Welcome {userdata.player_name or 'traveler'} to Titan-Prime.\n\n"
+        f"Welcome {userdata.player_name or 'traveler'} to Titan-Prime.\n"
+        f"(Your save code is {userdata.session_id}.)\n\n"
         + scene_text("intro", userdata)
     )
     if not opening.endswith("What do you do?"):
@@ -377,44 +204,20 @@ async def player_action(
 ) -> str:
     userdata = ctx.userdata
     current = userdata.current_scene
-    scene = WORLD.get(current)
+    scene = WORLD.scene(current) or WORLD.start_scene
     action_text = (action or "").strip().lower()
 
-    chosen_key = None
-
-    if action_text in (scene.get("choices") or {}):
-        chosen_key = action_text
-    if not chosen_key:
-        for cid, cmeta in (scene.get("choices") or {}).items():
-            desc = cmeta.get("desc", "").lower()
-            if cid in action_text or any(w in action_text for w in desc.split()[:4]):
-                chosen_key = cid
-                break
-    if not chosen_key:
-        for cid, cmeta in (scene.get("choices") or {}).items():
-            for keyword in cmeta.get("desc", "").lower().split():
-                if keyword and keyword in action_text:
-                    chosen_key = cid
-                    break
-            if chosen_key:
-                break
-
-    if not chosen_key:
+    chosen = scene.match(action_text)
+
+    if not chosen:
         resp = (
             "I couldn't match that action. Try one of the listed choices.\n\n"
             + scene_text(current, userdata)
         )
         return resp
 
-    choice_meta = scene["choices"][chosen_key]
-    result_scene = choice_meta.get("result_scene", current)
-    effects = choice_meta.get("effects", None)
-
-    apply_effects(effects or {}, userdata)
-    note = summarize_scene_transition(current, chosen_key, result_scene, userdata)
-
-    userdata.current_scene = result_scene
-    next_desc = scene_text(result_scene, userdata)
+    note, next_scene = await advance_scene(userdata, scene, chosen)
+    next_desc = next_scene.text
 
     persona = "Sigma-4 (your calm sci-fi Game Master) says:\n\n"
     reply = f"{persona}{note}\n\n{next_desc}"
@@ -443,7 +246,7 @@ async def show_journal(ctx: RunContext[Userdata]) -> str:
     else:
         lines.append("\nNo items in inventory.")
     lines.append("\nRecent choices:")
-    for h in userdata.history[-6:]:
+    for h in list(userdata.history)[-6:]:
         lines.append(f"- {h['time']} | from {h['from']} -> {h['to']} via {h['action']}")
     lines.append("\nWhat do you do?")
     return "\n".join(lines)
@@ -451,14 +254,7 @@ async def show_journal(ctx: RunContext[Userdata]) -> str:
 @function_tool
 async def restart_adventure(ctx: RunContext[Userdata]) -> str:
     userdata = ctx.userdata
-    userdata.current_scene = "intro"
-    userdata.history = []
-    userdata.journal = []
-    userdata.inventory = []
-    userdata.named_npcs = {}
-    userdata.choices_made = []
-    userdata.session_id = str(uuid.uuid4())[:8]
-    userdata.started_at = datetime.utcnow().isoformat() + "Z"
+    new_game(userdata)
 
     greet = (
         "The simulation resets. The fog rolls anew. You stand at the beginning once more.\n\n"
@@ -468,11 +264,40 @@ async def restart_adventure(ctx: RunContext[Userdata]) -> str:
         greet += "\nWhat do you do?"
     return greet
 
+@function_tool
+async def resume_adventure(
+    ctx: RunContext[Userdata],
+    session_id: Annotated[Optional[str], Field(description="Save code the player was given", default=None)] = None,
+    player_name: Annotated[Optional[str], Field(description="Player name, to resume their latest game", default=None)] = None,
+) -> str:
+    userdata = ctx.userdata
+    if not session_id and player_name:
+        session_id = await asyncio.to_thread(SAVES.latest_session, player_name)
+    saved = await asyncio.to_thread(SAVES.load, session_id, HISTORY_IN_MEMORY) if session_id else None
+    if not saved or not WORLD.scene(saved.current_scene):
+        return "I couldn't find a saved adventure for that. Start a new one?"
+
+    userdata.session_id = saved.session_id
+    userdata.player_name = saved.player_name or player_name or userdata.player_name
+    userdata.current_scene = saved.current_scene
+    userdata.journal = list(saved.journal)
+    userdata.inventory = list(saved.inventory)
+    userdata.named_npcs = {}
+    userdata.history = deque(saved.history, maxlen=HISTORY_IN_MEMORY)
+    userdata.choices_made = deque((h["action"] for h in saved.history), maxlen=HISTORY_IN_MEMORY)
+    userdata.started_at = saved.started_at
+    userdata.save_created = True
+
+    return (
+        f"Welcome back {userdata.player_name or 'traveler'}. Resuming after {saved.turns} moves.\n\n"
+        + scene_text(userdata.current_scene, userdata)
+    )
+
 # -------------------------
 # Agent
 # -------------------------
 class GameMasterAgent(Agent):
-    def __init__(self):
+    def __init__(self, fast_path: Optional[FastPathStats] = None):
         instructions = """
         You are 'Sigma-4', the AI Game Master for a voice-only sci-fi survival adventure.
         Universe: Titan-Prime — a frozen exoplanet with crashed pods, abandoned research ruins, and unknown signals.
@@ -481,23 +306,39 @@ class GameMasterAgent(Agent):
 
         Rules:
             - Use tools to start adventures, get scenes, process actions, show journals, or restart.
+            - If the player wants to continue an earlier game, call resume_adventure with their save code or name.
             - Maintain continuity using per-session userdata.
             - Voice-first responses: clear, short, immersive.
             - NEVER forget to end with: "What do you do?"
         """
         super().__init__(
             instructions=instructions,
-            tools=[start_adventure, get_scene, player_action, show_journal, restart_adventure],
+            tools=[start_adventure, get_scene, player_action, show_journal, restart_adventure, resume_adventure],
         )
+        self.fast_path = fast_path or FastPathStats()
+
+    async def on_user_turn_completed(self, turn_ctx: ChatContext, new_message: ChatMessage) -> None:
+        # Fast path: a plainly spoken choice is resolved here and spoken directly,
+        # skipping the tool-call and narration LLM round trips.
+        started = time.perf_counter()
+        userdata: Userdata = self.session.userdata
+        scene = WORLD.scene(userdata.current_scene) or WORLD.start_scene
+        chosen = fast_path_choice(scene, new_message.text_content or "")
+        if chosen is None:
+            self.fast_path.record_miss()
+            return
+
+        note, next_scene = await advance_scene(userdata, scene, chosen)
+        self.session.say(f"{note}\n\n{next_scene.text}")
+        self.fast_path.record_hit(started)
+        logger.info("FAST PATH: %s -> %s", scene.key, chosen.key)
+        raise StopResponse()
 
 # -------------------------
 # Entrypoint
 # -------------------------
-def prewarm(proc: JobProcess):
-    try:
-        proc.userdata["vad"] = silero.VAD.load()
-    except Exception:
-        logger.warning("VAD prewarm failed; continuing without VAD.")
+VOICE = VoiceConfig()
+
 
 async def entrypoint(ctx: JobContext):
     ctx.log_context_fields = {"room": ctx.room.name}
@@ -505,27 +346,23 @@ async def entrypoint(ctx: JobContext):
     logger.info("STARTING VOICE GAME MASTER – TITAN-PRIME EDITION")
 
     userdata = Userdata()
+    fast_path = FastPathStats()
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-marcus",
-            style="Conversational",
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata.get("vad"),
-        userdata=userdata,
-    )
+    session = build_session(ctx, VOICE, userdata=userdata)
+    session_metrics = attach_metrics(ctx, session, agent="day8")
 
-    await session.start(
-        agent=GameMasterAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(noise_cancellation=noise_cancellation.BVC()),
-    )
+    def _record_llm_call(m: metrics.AgentMetrics):
+        if isinstance(m, metrics.LLMMetrics):
+            fast_path.record_llm_call(m.duration)
+
+    session_metrics.add_listener(_record_llm_call)
+
+    async def log_fast_path():
+        logger.info(fast_path.summary())
+
+    ctx.add_shutdown_callback(log_fast_path)
 
-    await ctx.connect()
+    await start_session(ctx, session, GameMasterAgent(fast_path))
 
 if __name__ == "__main__":
     cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
@@ -0,0 +1,90 @@
+"""
+Day 8 – Deterministic fast path for game turns
+
+When the player plainly says one of the current scene's choices ("check pod",
+"take the oxygen"), the turn is resolved without the LLM: the transition runs
+locally and the pre-rendered scene text goes straight to TTS. Anything longer,
+questions, negations ("don't take the oxygen"), or low-confidence matches fall
+through to the normal LLM turn.
+
+FastPathStats counts hits and misses and estimates the LLM time saved, using
+the LLM call durations observed on the slow path.
+"""
+
+import logging
+import re
+import time
+from typing import Optional
+
+from intent import tokenize
+from world import Choice, Scene
+
+logger = logging.getLogger("voice_game_master")
+
+# Exact keys (1.0) and spoken key phrases (0.9) qualify; keyword-only matches rarely do.
+MIN_CONFIDENCE = 0.9
+# Longer utterances usually carry more than a bare choice ("take the oxygen and then...").
+MAX_CONTENT_WORDS = 4
+# A choice's keywords still match when the player says not to do it.
+NEGATIONS = frozenset({"not", "no", "never", "don't", "dont", "without", "stop"})
+_RAW_WORD_RE = re.compile(r"[a-z]+(?:'[a-z]+)?")
+# A slow-path action turn costs a tool-call round trip plus the narration round trip.
+LLM_CALLS_PER_ACTION_TURN = 2
+
+
+def fast_path_choice(scene: Scene, text: str) -> Optional[Choice]:
+    """The choice to apply without the LLM, or None to let the LLM handle the turn."""
+    text = (text or "").strip()
+    if not text or "?" in text:
+        return None
+    if len(tokenize(text)) > MAX_CONTENT_WORDS:
+        return None
+    words = _RAW_WORD_RE.findall(text.lower().replace("\u2019", "'"))
+    if any(w in NEGATIONS or w.endswith("n't") for w in words):
+        return None
+    found = scene.matcher.match(text)
+    if found is None or found.confidence < MIN_CONFIDENCE:
+        return None
+    return scene.choices[found.position]
+
+
+class FastPathStats:
+    """Per-session counters for the fast path."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.fast_seconds = 0.0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def record_hit(self, started: float):
+        self.hits += 1
+        self.fast_seconds += time.perf_counter() - started
+
+    def record_miss(self):
+        self.misses += 1
+
+    def record_llm_call(self, duration: float):
+        self.llm_calls += 1
+        self.llm_seconds += duration
+
+    @property
+    def hit_rate(self) -> float:
+        turns = self.hits + self.misses
+        return self.hits / turns if turns else 0.0
+
+    @property
+    def estimated_seconds_saved(self) -> float:
+        if not self.llm_calls:
+            return 0.0
+        avg_llm_call = self.llm_seconds / self.llm_calls
+        return self.hits * LLM_CALLS_PER_ACTION_TURN * avg_llm_call - self.fast_seconds
+
+    def summary(self) -> str:
+        avg_fast_ms = self.fast_seconds / self.hits * 1000 if self.hits else 0.0
+        return (
+            f"fast path: {self.hits}/{self.hits + self.misses} turns ({self.hit_rate:.0%}), "
+            f"avg {avg_fast_ms:.1f} ms per fast turn, "
+            f"~{self.estimated_seconds_saved:.1f} s of LLM time saved"
+        )
@@ -0,0 +1,142 @@
+"""
+Day 8 – Per-scene intent matcher for player_action
+
+- Built once per scene when the world is compiled
+- Choice descriptions and keys are tokenized with stopwords removed
+- An inverted index maps keyword -> choices, with rarer keywords weighted higher
+- Matching a spoken action:
+    1. exact choice key ("check_pod", "check pod")
+    2. choice key phrase spoken inside the action ("let's take the oxygen now")
+    3. weighted keyword overlap, ranked by score
+- Ties between different choices are reported as ambiguous instead of picking the first
+- Per-turn cost depends on the length of the utterance, not on the number of choices
+"""
+
+import math
+import re
+from types import MappingProxyType
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+STOPWORDS = frozenset("""
+    a an and are as at be but by do for from go i im in into is it its just let lets me more my
+    now of on or out please some that the then this to try up want we what with you your
+""".split())
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Confidence assigned to the two key-based match kinds.
+EXACT_CONFIDENCE = 1.0
+PHRASE_CONFIDENCE = 0.9
+
+
+def _stem(word: str) -> str:
+    # Plural-only stemming: "footprints" -> "footprint", "towards" -> "toward".
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased, stemmed content words of `text` (underscores split words)."""
+    words = _WORD_RE.findall((text or "").lower().replace("_", " "))
+    return [_stem(w) for w in words if w not in STOPWORDS]
+
+
+class IntentMatch(NamedTuple):
+    position: int
+    score: float
+    confidence: float
+    kind: str  # "exact" | "phrase" | "keywords"
+
+
+class ChoiceMatcher:
+    """Ranks a scene's choices against a spoken action."""
+
+    __slots__ = ("_keys", "_phrases", "_max_phrase_len", "_postings", "_weights", "_totals")
+
+    def __init__(self, choices: Sequence[Tuple[str, str]]):
+        """`choices` is the scene's ordered (key, description) pairs."""
+        self._keys: Dict[str, int] = {}
+        self._phrases: Dict[Tuple[str, ...], int] = {}
+        postings: Dict[str, List[int]] = {}
+        choice_tokens: List[frozenset] = []
+
+        for pos, (key, desc) in enumerate(choices):
+            self._keys[key.lower()] = pos
+            words = _WORD_RE.findall(key.lower().replace("_", " "))
+            if words:
+                self._keys.setdefault(" ".join(words), pos)
+            # Key phrases ignore stopwords ("take the oxygen" -> take_oxygen), but a
+            # multi-word key must keep at least two content words to count as a phrase.
+            phrase = tuple(tokenize(key))
+            if phrase and (len(phrase) > 1 or len(words) == 1):
+                self._phrases.setdefault(phrase, pos)
+            tokens = frozenset(tokenize(key) + tokenize(desc))
+            choice_tokens.append(tokens)
+            for tok in tokens:
+                postings.setdefault(tok, []).append(pos)
+
+        n = max(1, len(choice_tokens))
+        self._max_phrase_len = max((len(p) for p in self._phrases), default=0)
+        self._postings = MappingProxyType({t: tuple(p) for t, p in postings.items()})
+        # Keywords shared by many choices carry less evidence than unique ones.
+        self._weights = MappingProxyType({
+            t: math.log(1.0 + n / len(p)) for t, p in postings.items()
+        })
+        self._totals = tuple(sum(self._weights[t] for t in toks) or 1.0 for toks in choice_tokens)
+
+    def rank(self, action_text: str) -> List[IntentMatch]:
+        """All choices sharing at least one keyword with the action, best first."""
+        scores: Dict[int, float] = {}
+        for tok in set(tokenize(action_text)):
+            weight = self._weights.get(tok)
+            if weight is None:
+                continue
+            for pos in self._postings[tok]:
+                scores[pos] = scores.get(pos, 0.0) + weight
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+        if not ranked:
+            return []
+        best = ranked[0][1]
+        second = ranked[1][1] if len(ranked) > 1 else 0.0
+        out = []
+        for i, (pos, score) in enumerate(ranked):
+            # Confidence = share of the choice's keywords heard x lead over the nearest rival.
+            rival = second if i == 0 else best
+            coverage = min(1.0, score / self._totals[pos])
+            margin = max(0.0, 1.0 - rival / score)
+            out.append(IntentMatch(pos, score, coverage * margin, "keywords"))
+        return out
+
+    def match(self, action_text: str) -> Optional[IntentMatch]:
+        """Best choice for the action, or None when nothing matches or the top score is tied."""
+        text = (action_text or "").strip().lower()
+        pos = self._keys.get(text)
+        if pos is not None:
+            return IntentMatch(pos, math.inf, EXACT_CONFIDENCE, "exact")
+
+        phrase = self._match_phrase(tokenize(text))
+        if phrase is not None:
+            return IntentMatch(phrase, math.inf, PHRASE_CONFIDENCE, "phrase")
+
+        ranked = self.rank(text)
+        if not ranked:
+            return None
+        if len(ranked) > 1 and ranked[1].score == ranked[0].score:
+            return None
+        return ranked[0]
+
+    def _match_phrase(self, words: Iterable[str]) -> Optional[int]:
+        words = tuple(words)
+        found = None
+        # Longest key phrase wins; two different phrases of that length are ambiguous.
+        for size in range(min(self._max_phrase_len, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                pos = self._phrases.get(words[start:start + size])
+                if pos is not None:
+                    if found is not None and found != pos:
+                        return None
+                    found = pos
+            if found is not None:
+                return found
+        return None
@@ -0,0 +1,200 @@
+"""
+Day 8 – Save games for the voice Game Master (SQLite)
+
+- Every adventure is a session row keyed by session id and by player
+- Each turn appends one compact history row and updates the session state:
+    - scene ids and action keys are interned into a small symbol table (ints on disk)
+    - the "from" scene is not stored: it is the previous row's "to" (or the session origin)
+    - time is stored as milliseconds since the previous turn
+- Sessions can be resumed by session id, or by player name (latest session)
+- Only the most recent turns are loaded back into memory; older turns stay on disk
+  and can be paged with history_page()
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS symbols (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS sessions (
+        session_id TEXT PRIMARY KEY,
+        player_key TEXT,
+        player_name TEXT,
+        origin_scene INTEGER NOT NULL,
+        current_scene INTEGER NOT NULL,
+        journal TEXT NOT NULL DEFAULT '[]',
+        inventory TEXT NOT NULL DEFAULT '[]',
+        started_ms INTEGER NOT NULL,
+        last_ms INTEGER NOT NULL,
+        turns INTEGER NOT NULL DEFAULT 0
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_sessions_player ON sessions (player_key, last_ms DESC);
+
+    CREATE TABLE IF NOT EXISTS history (
+        session_id TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        action INTEGER NOT NULL,
+        to_scene INTEGER NOT NULL,
+        dt_ms INTEGER NOT NULL,
+        PRIMARY KEY (session_id, seq)
+    ) WITHOUT ROWID;
+"""
+
+# Decodes history rows [:start, :stop) back into {"from", "action", "to", "time"} entries.
+# Only those rows and the one before :start (for the first "from") are windowed. Times
+# count back from the session's last_ms, which is started_ms plus every dt_ms, so only
+# the rows after :stop are summed, and a load of the latest turns reads nothing else.
+_HISTORY_SQL = """
+    SELECT h.seq, a.name, f.name, t.name,
+           s.last_ms - COALESCE(h.later, 0) - (
+               SELECT COALESCE(SUM(dt_ms), 0) FROM history WHERE session_id = :sid AND seq >= :stop
+           )
+    FROM (
+        SELECT seq, action, to_scene,
+               LAG(to_scene) OVER (ORDER BY seq) AS from_scene,
+               SUM(dt_ms) OVER (ORDER BY seq DESC ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING) AS later
+        FROM history
+        WHERE session_id = :sid AND seq >= :start - 1 AND seq < :stop
+    ) h
+    JOIN sessions s ON s.session_id = :sid
+    JOIN symbols a ON a.id = h.action
+    JOIN symbols f ON f.id = COALESCE(h.from_scene, s.origin_scene)
+    JOIN symbols t ON t.id = h.to_scene
+    WHERE h.seq >= :start
+    ORDER BY h.seq
+"""
+
+
+def player_key(name: Optional[str]) -> Optional[str]:
+    return " ".join(name.split()).lower() if name else None
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def iso_from_ms(ms: int) -> str:
+    return datetime.fromtimestamp(ms / 1000, tz=timezone.utc).replace(tzinfo=None).isoformat() + "Z"
+
+
+class SavedGame(NamedTuple):
+    session_id: str
+    player_name: Optional[str]
+    current_scene: str
+    journal: List[str]
+    inventory: List[str]
+    started_at: str
+    turns: int
+    history: List[Dict]  # most recent turns only, oldest first
+
+
+class SaveStore:
+    """Thread-safe save-game store; calls are short and meant to run via asyncio.to_thread."""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._symbols: Dict[str, int] = dict(self._conn.execute("SELECT name, id FROM symbols"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            try:
+                with self._conn:
+                    yield
+            except Exception:
+                # Symbols interned inside a rolled-back transaction no longer exist.
+                self._symbols = dict(self._conn.execute("SELECT name, id FROM symbols"))
+                raise
+
+    def _intern(self, name: str) -> int:
+        sid = self._symbols.get(name)
+        if sid is None:
+            self._conn.execute("INSERT OR IGNORE INTO symbols (name) VALUES (?)", (name,))
+            sid = self._conn.execute("SELECT id FROM symbols WHERE name = ?", (name,)).fetchone()[0]
+            self._symbols[name] = sid
+        return sid
+
+    # ---- writes ----
+    def create_session(self, session_id: str, player_name: Optional[str], scene: str, started_ms: int):
+        with self._transaction():
+            scene_id = self._intern(scene)
+            self._conn.execute("""
+                INSERT OR REPLACE INTO sessions
+                    (session_id, player_key, player_name, origin_scene, current_scene, started_ms, last_ms)
+                VALUES (?,?,?,?,?,?,?)
+            """, (session_id, player_key(player_name), player_name, scene_id, scene_id, started_ms, started_ms))
+
+    def record_turn(self, session_id: str, action: str, to_scene: str, at_ms: int,
+                    journal: List[str], inventory: List[str]):
+        """Append one turn and update the session's current state in a single transaction."""
+        with self._transaction():
+            row = self._conn.execute(
+                "SELECT turns, last_ms FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(session_id)
+            turns, last_ms = row
+            to_id = self._intern(to_scene)
+            self._conn.execute(
+                "INSERT INTO history (session_id, seq, action, to_scene, dt_ms) VALUES (?,?,?,?,?)",
+                (session_id, turns, self._intern(action), to_id, max(0, at_ms - last_ms)),
+            )
+            self._conn.execute("""
+                UPDATE sessions
+                SET current_scene = ?, journal = ?, inventory = ?, last_ms = ?, turns = turns + 1
+                WHERE session_id = ?
+            """, (to_id, json.dumps(journal), json.dumps(inventory), max(at_ms, last_ms), session_id))
+
+    # ---- reads ----
+    def load(self, session_id: str, tail: int) -> Optional[SavedGame]:
+        """Session state plus its last `tail` turns."""
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT s.session_id, s.player_name, c.name, s.journal, s.inventory, s.started_ms, s.turns
+                FROM sessions s JOIN symbols c ON c.id = s.current_scene
+                WHERE s.session_id = ?
+            """, (session_id,)).fetchone()
+            if row is None:
+                return None
+            sid, name, scene, journal, inventory, started_ms, turns = row
+            history = self._history(session_id, max(0, turns - tail), turns)
+        return SavedGame(sid, name, scene, json.loads(journal), json.loads(inventory),
+                         iso_from_ms(started_ms), turns, history)
+
+    def latest_session(self, player_name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT session_id FROM sessions WHERE player_key = ? ORDER BY last_ms DESC LIMIT 1",
+                (player_key(player_name),),
+            ).fetchone()
+        return row[0] if row else None
+
+    def history_page(self, session_id: str, start: int, stop: int) -> List[Dict]:
+        """Turns [start, stop) of a session, including ones no longer held in memory."""
+        with self._lock:
+            return self._history(session_id, start, stop)
+
+    def _history(self, session_id: str, start: int, stop: int) -> List[Dict]:
+        return [
+            {"from": frm, "action": action, "to": to, "time": iso_from_ms(ms)}
+            for _, action, frm, to, ms in self._conn.execute(
+                _HISTORY_SQL, {"sid": session_id, "start": start, "stop": stop})
+        ]
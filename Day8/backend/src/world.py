@@ -0,0 +1,151 @@
+"""
+Day 8 – World compiler for the voice Game Master
+
+- Loads the authored world (world.json) once at startup
+- Compiles it into an immutable scene graph:
+    - scenes and choices are NamedTuples (slotted, read-only)
+    - every choice points at its target scene by integer index
+    - each scene's GM text ("desc + choices + What do you do?") is rendered once
+    - each scene gets its own intent matcher (see intent.py)
+- Validates the graph at load time:
+    - dangling result_scene links
+    - scenes that cannot be reached from the start scene
+    - unknown effect types
+- Per-turn work is then a dict lookup plus a tuple index, independent of world size
+"""
+
+import json
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, List, Mapping, NamedTuple, Optional, Tuple
+
+from intent import ChoiceMatcher
+
+KNOWN_EFFECTS = ("add_journal", "add_inventory")
+
+
+class WorldError(ValueError):
+    """Raised when an authored world fails validation."""
+
+
+class Choice(NamedTuple):
+    key: str
+    desc: str
+    target: int
+    effects: Tuple[Tuple[str, str], ...] = ()
+
+
+class Scene(NamedTuple):
+    index: int
+    key: str
+    title: str
+    desc: str
+    choices: Tuple[Choice, ...]
+    choice_index: Mapping[str, int]
+    text: str
+    matcher: ChoiceMatcher
+
+    def choice(self, key: str) -> Optional[Choice]:
+        pos = self.choice_index.get(key)
+        return None if pos is None else self.choices[pos]
+
+    def match(self, action_text: str) -> Optional[Choice]:
+        found = self.matcher.match(action_text)
+        return None if found is None else self.choices[found.position]
+
+
+class World(NamedTuple):
+    title: str
+    start: int
+    scenes: Tuple[Scene, ...]
+    index: Mapping[str, int]
+
+    def scene(self, key: str) -> Optional[Scene]:
+        pos = self.index.get(key)
+        return None if pos is None else self.scenes[pos]
+
+    def target(self, choice: Choice) -> Scene:
+        return self.scenes[choice.target]
+
+    @property
+    def start_scene(self) -> Scene:
+        return self.scenes[self.start]
+
+
+def render_scene_text(desc: str, choices: List[Tuple[str, str]]) -> str:
+    lines = [f"- {cdesc} (say: {cid})" for cid, cdesc in choices]
+    return f"{desc}\n\nChoices:\n" + "".join(line + "\n" for line in lines) + "\nWhat do you do?"
+
+
+def compile_world(data: dict) -> World:
+    """Compile the authored world dict ({"start", "scenes": {key: scene}}) into a World."""
+    raw_scenes: Dict[str, dict] = data.get("scenes") or {}
+    start_key = data.get("start", "intro")
+    if start_key not in raw_scenes:
+        raise WorldError(f"Start scene '{start_key}' is not defined.")
+
+    index = {key: i for i, key in enumerate(raw_scenes)}
+    errors = []
+
+    # Pass 1: resolve links and effects.
+    compiled_choices: List[Tuple[Choice, ...]] = []
+    for key, raw in raw_scenes.items():
+        choices = []
+        for cid, cmeta in (raw.get("choices") or {}).items():
+            target_key = cmeta.get("result_scene", key)
+            if target_key not in index:
+                errors.append(f"{key}.{cid}: result_scene '{target_key}' does not exist")
+                continue
+            effects = cmeta.get("effects") or {}
+            for kind in effects:
+                if kind not in KNOWN_EFFECTS:
+                    errors.append(f"{key}.{cid}: unknown effect '{kind}'")
+            choices.append(Choice(
+                key=cid,
+                desc=cmeta.get("desc", ""),
+                target=index[target_key],
+                effects=tuple((k, v) for k, v in effects.items() if k in KNOWN_EFFECTS),
+            ))
+        compiled_choices.append(tuple(choices))
+
+    # Pass 2: reachability from the start scene (BFS over integer edges).
+    seen = [False] * len(index)
+    seen[index[start_key]] = True
+    frontier = deque([index[start_key]])
+    while frontier:
+        for choice in compiled_choices[frontier.popleft()]:
+            if not seen[choice.target]:
+                seen[choice.target] = True
+                frontier.append(choice.target)
+    for key, i in index.items():
+        if not seen[i]:
+            errors.append(f"{key}: unreachable from start scene '{start_key}'")
+
+    if errors:
+        raise WorldError("Invalid world:\n" + "\n".join(f"- {e}" for e in errors))
+
+    scenes = []
+    for (key, raw), choices in zip(raw_scenes.items(), compiled_choices):
+        desc = raw.get("desc", "")
+        scenes.append(Scene(
+            index=index[key],
+            key=key,
+            title=raw.get("title", key),
+            desc=desc,
+            choices=choices,
+            choice_index=MappingProxyType({c.key: pos for pos, c in enumerate(choices)}),
+            text=render_scene_text(desc, [(c.key, c.desc) for c in choices]),
+            matcher=ChoiceMatcher([(c.key, c.desc) for c in choices]),
+        ))
+
+    return World(
+        title=data.get("title", ""),
+        start=index[start_key],
+        scenes=tuple(scenes),
+        index=MappingProxyType(index),
+    )
+
+
+def load_world(path: str) -> World:
+    with open(path, "r", encoding="utf-8") as f:
+        return compile_world(json.load(f))
@@ -0,0 +1,52 @@
+import os
+import time
+
+import pytest
+
+from fastpath import FastPathStats, fast_path_choice
+from world import load_world
+
+WORLD = load_world(os.path.join(os.path.dirname(__file__), "..", "src", "world.json"))
+
+
+@pytest.mark.parametrize(
+    ("scene", "text", "expected"),
+    [
+        ("intro", "check_pod", "check_pod"),
+        ("intro", "Check pod.", "check_pod"),
+        ("pod", "take the oxygen", "take_oxygen"),
+        ("ridge", "open the crate", "open_crate"),
+    ],
+)
+def test_plain_choices_take_the_fast_path(scene, text, expected) -> None:
+    assert fast_path_choice(WORLD.scene(scene), text).key == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "what happens if I check pod?",
+        "take the oxygen and then tell me about the planet's history",
+        "hmm, the beacon",
+        "don't take the oxygen",
+        "do not check the pod",
+        "never take oxygen",
+        "I won\u2019t take the oxygen",
+    ],
+)
+def test_everything_else_goes_to_the_llm(text) -> None:
+    scene = WORLD.scene("intro") if "oxygen" not in text else WORLD.scene("pod")
+    assert fast_path_choice(scene, text) is None
+
+
+def test_stats_report_hit_rate_and_savings() -> None:
+    stats = FastPathStats()
+    stats.record_llm_call(0.8)
+    stats.record_llm_call(1.2)
+    stats.record_miss()
+    stats.record_hit(time.perf_counter())
+
+    assert stats.hit_rate == 0.5
+    assert stats.estimated_seconds_saved == pytest.approx(2.0, abs=0.01)
+    assert "1/2 turns (50%)" in stats.summary()
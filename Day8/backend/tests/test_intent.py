@@ -0,0 +1,58 @@
+import pytest
+
+from intent import ChoiceMatcher, tokenize
+
+INTRO = [
+    ("check_pod", "Inspect the damaged escape pod."),
+    ("follow_footprints", "Follow the unknown footprints toward the metallic ruin."),
+    ("move_towards_beacon", "Head north toward the pulsing ridge beacon."),
+]
+
+
+def _key(matcher, text):
+    found = matcher.match(text)
+    return None if found is None else INTRO[found.position][0]
+
+
+def test_tokenize_drops_stopwords() -> None:
+    assert tokenize("Go to the Ruins, please!") == ["ruin"]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("check_pod", "check_pod"),
+        ("Check pod", "check_pod"),
+        ("let's follow the footprints", "follow_footprints"),
+        ("head for the beacon", "move_towards_beacon"),
+        ("look at the pod", "check_pod"),
+    ],
+)
+def test_matches_expected_choice(text, expected) -> None:
+    assert _key(ChoiceMatcher(INTRO), text) == expected
+
+
+def test_stopwords_alone_do_not_match() -> None:
+    # The old substring pass matched "the" inside every description and picked choice one.
+    assert _key(ChoiceMatcher(INTRO), "the") is None
+    assert _key(ChoiceMatcher(INTRO), "to do it") is None
+
+
+def test_tied_scores_are_ambiguous() -> None:
+    # "toward" appears in both the footprints and the beacon descriptions.
+    assert _key(ChoiceMatcher(INTRO), "toward") is None
+
+
+def test_exact_key_beats_keywords() -> None:
+    found = ChoiceMatcher(INTRO).match("check_pod")
+    assert found.kind == "exact"
+    assert found.confidence == 1.0
+
+
+def test_scales_to_many_choices() -> None:
+    choices = [(f"door_{i}", f"Open door number d{i} in the long corridor.") for i in range(2000)]
+    matcher = ChoiceMatcher(choices)
+
+    found = matcher.match("open door d1234")
+    assert found is not None
+    assert choices[found.position][0] == "door_1234"
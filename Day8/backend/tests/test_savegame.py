@@ -0,0 +1,57 @@
+import pytest
+
+from savegame import SaveStore, iso_from_ms
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = SaveStore(str(tmp_path / "saves.sqlite"))
+    yield s
+    s.close()
+
+
+def test_resume_restores_state_and_recent_history(store) -> None:
+    store.create_session("abc", "Nova", "intro", started_ms=1_000)
+    store.record_turn("abc", "check_pod", "pod", 2_000, [], [])
+    store.record_turn("abc", "take_oxygen", "pod_taken", 3_500, ["Collected oxygen cell from pod."], ["oxygen_cell"])
+    store.record_turn("abc", "go_to_ruin", "ruin_approach", 4_000, ["Collected oxygen cell from pod."], ["oxygen_cell"])
+
+    saved = store.load("abc", tail=2)
+
+    assert saved.current_scene == "ruin_approach"
+    assert saved.inventory == ["oxygen_cell"]
+    assert saved.turns == 3
+    assert [(h["from"], h["action"], h["to"]) for h in saved.history] == [
+        ("pod", "take_oxygen", "pod_taken"),
+        ("pod_taken", "go_to_ruin", "ruin_approach"),
+    ]
+    assert saved.history[-1]["time"] == "1970-01-01T00:00:04Z"
+
+
+def test_older_turns_are_paged_from_disk(store) -> None:
+    store.create_session("long", None, "intro", started_ms=0)
+    for i in range(500):
+        store.record_turn("long", f"step_{i % 3}", f"scene_{i % 7}", i * 10, [], [])
+
+    page = store.history_page("long", 0, 3)
+
+    assert [h["from"] for h in page] == ["intro", "scene_0", "scene_1"]
+    middle = store.history_page("long", 200, 203)
+    assert [(h["from"], h["to"]) for h in middle] == [("scene_3", "scene_4"), ("scene_4", "scene_5"), ("scene_5", "scene_6")]
+    assert [h["time"] for h in middle] == [iso_from_ms(i * 10) for i in range(200, 203)]
+    assert store.load("long", tail=50).turns == 500
+
+
+def test_latest_session_by_player(store) -> None:
+    store.create_session("old", "Nova", "intro", started_ms=1)
+    store.create_session("new", "  nova ", "intro", started_ms=5)
+    store.create_session("other", "Rex", "intro", started_ms=9)
+
+    assert store.latest_session("NOVA") == "new"
+    assert store.latest_session("nobody") is None
+
+
+def test_unknown_session_is_rejected(store) -> None:
+    with pytest.raises(KeyError):
+        store.record_turn("missing", "look", "intro", 0, [], [])
+    assert store.load("missing", tail=10) is None
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from world import WorldError, compile_world, load_world
+
+WORLD_PATH = os.path.join(os.path.dirname(__file__), "..", "src", "world.json")
+
+
+def _scene(desc, **choices):
+    return {"title": desc, "desc": desc, "choices": choices}
+
+
+def test_shipped_world_compiles() -> None:
+    world = load_world(WORLD_PATH)
+    intro = world.start_scene
+
+    assert intro.key == "intro"
+    assert intro.text.endswith("What do you do?")
+    assert "(say: check_pod)" in intro.text
+
+    pod = world.target(intro.choice("check_pod"))
+    assert pod.key == "pod"
+    assert pod.choice("take_oxygen").effects == (
+        ("add_inventory", "oxygen_cell"),
+        ("add_journal", "Collected oxygen cell from pod."),
+    )
+
+
+def test_scenes_are_immutable() -> None:
+    world = load_world(WORLD_PATH)
+    with pytest.raises(AttributeError):
+        world.start_scene.text = "changed"
+    with pytest.raises(TypeError):
+        world.index["intro"] = 5
+
+
+def test_dangling_result_scene_is_rejected() -> None:
+    data = {"start": "a", "scenes": {
+        "a": _scene("A", go={"desc": "Go", "result_scene": "missing"}),
+    }}
+    with pytest.raises(WorldError, match="a.go: result_scene 'missing'"):
+        compile_world(data)
+
+
+def test_unreachable_scene_is_rejected() -> None:
+    data = {"start": "a", "scenes": {
+        "a": _scene("A", stay={"desc": "Stay", "result_scene": "a"}),
+        "orphan": _scene("Orphan", back={"desc": "Back", "result_scene": "a"}),
+    }}
+    with pytest.raises(WorldError, match="orphan: unreachable"):
+        compile_world(data)
+
+
+def test_large_world_compiles() -> None:
+    n = 5000
+    scenes = {
+        f"s{i}": _scene(f"Scene {i}", next={"desc": "Onward", "result_scene": f"s{(i + 1) % n}"})
+        for i in range(n)
+    }
+    world = compile_world({"start": "s0", "scenes": scenes})
+
+    assert len(world.scenes) == n
+    assert world.target(world.scene("s4999").choice("next")).key == "s0"
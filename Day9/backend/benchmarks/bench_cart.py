@@ -0,0 +1,68 @@
+"""
+Day 9 – Cart pricing micro-benchmark
+
+Prices large carts against a synthetic catalog for:
+    - scan: next(p for p in CATALOG if p["id"] == pid) per line item (previous show_cart / create_order_object)
+    - mapped: price_line_items() over the index's id -> Product map
+
+Usage:
+    uv run benchmarks/bench_cart.py --products 10000 --cart 10 100 1000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from catalog import CatalogIndex, price_line_items
+from bench_catalog import make_catalog
+
+
+def scan_price(catalog, line_items):
+    total = 0
+    items = []
+    for li in line_items:
+        prod = next((p for p in catalog if p["id"] == li["product_id"]), None)
+        if not prod:
+            raise ValueError(li["product_id"])
+        line_total = prod["price"] * int(li.get("quantity", 1))
+        total += line_total
+        items.append((prod["name"], line_total))
+    return items, total
+
+
+def timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--cart", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.products)
+    index = CatalogIndex(catalog)
+    rng = random.Random(2)
+
+    print(f"{args.products} products")
+    for size in args.cart:
+        cart = [
+            {"product_id": rng.choice(catalog)["id"], "quantity": rng.randrange(1, 4), "attrs": {}}
+            for _ in range(size)
+        ]
+        assert scan_price(catalog, cart)[1] == price_line_items(index, cart)[1]
+        scan_ms = timed(lambda cart=cart: scan_price(catalog, cart), args.repeat)
+        mapped_ms = timed(lambda cart=cart: price_line_items(index, cart), args.repeat)
+        print(f"cart of {size:5d} lines: scan {scan_ms:9.2f} ms  mapped {mapped_ms:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Day 9 – Catalog filtering benchmark
+
+Builds a synthetic catalog and times typical show_catalog filters for:
+    - scan: the previous per-product loop over every product
+    - indexed: CatalogIndex facet intersection + price bisect
+
+Usage:
+    uv run benchmarks/bench_catalog.py --products 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from catalog import CatalogIndex
+
+CATEGORIES = ["mug", "bottle", "electronics", "home", "accessories", "kitchen", "mobile", "tshirt", "hoodie"]
+COLORS = ["white", "black", "blue", "red", "green", "grey", None]
+WORDS = ["steel", "ceramic", "wireless", "compact", "cotton", "smart", "classic", "travel", "premium", "mini"]
+
+QUERIES = [
+    {"category": "mug"},
+    {"category": "tshirt", "color": "black", "max_price": 800},
+    {"q": "wireless", "max_price": 3000},
+    {"min_price": 1000, "max_price": 1100},
+    {"category": "hoodie", "size": "L", "color": "grey"},
+]
+
+
+def make_catalog(n: int, seed: int = 1):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"p-{i}",
+            "name": f"{rng.choice(WORDS).title()} {rng.choice(CATEGORIES).title()} {i}",
+            "description": f"A {rng.choice(WORDS)} product.",
+            "price": rng.randrange(100, 20000),
+            "currency": "INR",
+            "category": rng.choice(CATEGORIES),
+            "color": rng.choice(COLORS),
+            "sizes": rng.sample(["S", "M", "L", "XL"], rng.randrange(0, 4)),
+        }
+        for i in range(n)
+    ]
+
+
+def scan(catalog, filters):
+    """The loop list_products used before the index (query branch simplified to substring)."""
+    results = []
+    q = (filters.get("q") or "").lower()
+    category = filters.get("category")
+    for p in catalog:
+        if category:
+            pcat = p.get("category", "").lower()
+            if pcat != category and category not in pcat and pcat not in category:
+                continue
+        if filters.get("max_price") and p.get("price", 0) > int(filters["max_price"]):
+            continue
+        if filters.get("min_price") and p.get("price", 0) < int(filters["min_price"]):
+            continue
+        if filters.get("color") and p.get("color") and p.get("color") != filters["color"]:
+            continue
+        if filters.get("size") and filters["size"] not in (p.get("sizes") or []):
+            continue
+        if q and q not in p.get("name", "").lower() and q not in p.get("description", "").lower():
+            continue
+        results.append(p)
+    return results
+
+
+def timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.products)
+    t0 = time.perf_counter()
+    index = CatalogIndex(catalog)
+    print(f"{args.products} products, index built in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    for filters in QUERIES:
+        scan_ms = timed(lambda filters=filters: scan(catalog, filters), args.repeat)
+        index_ms = timed(lambda filters=filters: index.search(**filters), args.repeat)
+        hits = len(index.search(**filters))
+        print(f"{str(filters):60s} {hits:6d} hits  scan {scan_ms:8.2f} ms  indexed {index_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Day 9 – Per-customer order history benchmark
+
+Writes a legacy orders.json array with many orders across many customers,
+migrates it (streaming) into the JSON Lines log, then times per-customer
+queries for:
+    - scan: read every line of the log and filter (what "my orders" costs without an index)
+    - indexed: OrderLog.customer_orders() (last-N, date range, per-product)
+
+Usage:
+    uv run benchmarks/bench_customer_orders.py --orders 1000000 --customers 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from order_log import OrderLog, customer_key, timestamp_ms
+
+PRODUCTS = ["mug-001", "bottle-001", "earbuds-001", "lamp-001", "mouse-001", "pan-001", "cable-001", "notebook-001"]
+
+
+def write_legacy(path: str, orders: int, customers: int):
+    rng = random.Random(3)
+    start = 1_700_000_000
+    with open(path, "w") as f:
+        f.write("[\n")
+        for i in range(orders):
+            name = f"Customer {rng.randrange(customers)}"
+            pids = rng.sample(PRODUCTS, rng.randrange(1, 3))
+            order = {
+                "id": f"order-{i:08x}",
+                "items": [{"product_id": pid, "name": pid, "unit_price": 100, "quantity": 1,
+                           "line_total": 100, "attrs": {}} for pid in pids],
+                "total": 100 * len(pids),
+                "currency": "INR",
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(start + i * 30)) + "Z",
+                "customer_name": name,
+            }
+            f.write(("," if i else "") + json.dumps(order) + "\n")
+        f.write("]\n")
+
+
+def scan(path: str, name: str, limit: int, since=None, until=None, product_id=None):
+    key = customer_key(name)
+    lo = timestamp_ms(since) if since else None
+    hi = timestamp_ms(until) if until else None
+    found = []
+    with open(path, "rb") as f:
+        for line in f:
+            order = json.loads(line)
+            if order.get("customer_key") != key:
+                continue
+            ms = timestamp_ms(order["created_at"])
+            if (lo is not None and ms < lo) or (hi is not None and ms > hi):
+                continue
+            if product_id and not any(it["product_id"] == product_id for it in order["items"]):
+                continue
+            found.append(order)
+    return found[::-1][:limit]
+
+
+def timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--customers", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--scan-repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "orders.json")
+        log_path = os.path.join(tmp, "orders.jsonl")
+        write_legacy(legacy, args.orders, args.customers)
+
+        rss0 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        t0 = time.perf_counter()
+        log = OrderLog(log_path, legacy_path=legacy)
+        open_s = time.perf_counter() - t0
+        rss1 = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"{len(log)} orders, {args.customers} customers: migrate + index {open_s:.1f} s, "
+              f"peak RSS +{(rss1 - rss0) / 1024:.0f} MB")
+
+        name = "Customer 42"
+        queries = {
+            "last 5": dict(limit=5),
+            "date range": dict(limit=10, since="2023-12-01", until="2024-03-01T00:00:00"),
+            "with product": dict(limit=5, product_id="lamp-001"),
+        }
+        for label, q in queries.items():
+            assert [o["id"] for o in log.customer_orders(name, **q)] == [o["id"] for o in scan(log_path, name, **q)]
+            index_ms = timed(lambda q=q: log.customer_orders(name, **q), args.repeat)
+            scan_ms = timed(lambda q=q: scan(log_path, name, **q), args.scan_repeat)
+            print(f"{label:14s} scan {scan_ms:10.1f} ms  indexed {index_ms:7.3f} ms")
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Day 9 – Order placement / last-order benchmark
+
+Times placing one order and reading the most recent order with N existing orders for:
+    - legacy: read the orders.json array, append, rewrite it (and parse it all for "last order")
+    - log: OrderLog append (one line) and last() from the tail cache
+
+Usage:
+    uv run benchmarks/bench_order_log.py --orders 1000 10000 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from order_log import OrderLog
+
+
+def make_order(i: int):
+    return {
+        "id": f"order-{i:08d}",
+        "items": [{"product_id": "mug-001", "name": "Ceramic Coffee Mug", "unit_price": 350,
+                   "quantity": 1, "line_total": 350, "attrs": {}}],
+        "total": 350,
+        "currency": "INR",
+        "created_at": "2025-01-01T00:00:00Z",
+    }
+
+
+def legacy_place(path: str, order):
+    with open(path) as f:
+        orders = json.load(f)
+    orders.append(order)
+    with open(path, "w") as f:
+        json.dump(orders, f, indent=2)
+
+
+def legacy_last(path: str):
+    with open(path) as f:
+        return json.load(f)[-1]
+
+
+def timed(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for n in args.orders:
+        with tempfile.TemporaryDirectory() as tmp:
+            legacy = os.path.join(tmp, "orders.json")
+            with open(legacy, "w") as f:
+                json.dump([make_order(i) for i in range(n)], f, indent=2)
+
+            t0 = time.perf_counter()
+            log = OrderLog(os.path.join(tmp, "orders.jsonl"), legacy_path=legacy)
+            open_ms = (time.perf_counter() - t0) * 1000
+
+            legacy_place_ms = timed(lambda legacy=legacy, n=n: legacy_place(legacy, make_order(n)), args.repeat)
+            legacy_last_ms = timed(lambda legacy=legacy: legacy_last(legacy), args.repeat)
+            log_place_ms = timed(lambda log=log, n=n: log.append(make_order(n)), args.repeat)
+            log_last_ms = timed(log.last, args.repeat)
+            log.close()
+
+        print(f"{n:8d} orders: place legacy {legacy_place_ms:8.2f} ms  log {log_place_ms:6.3f} ms | "
+              f"last legacy {legacy_last_ms:8.2f} ms  log {log_last_ms:6.3f} ms | migrate+open {open_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Day 9 – Function tool benchmarks
+
+Times the shopping tools against N synthetic products (catalog cases, from
+bench_catalog.make_catalog) or a temporary order log of N past orders (order
+cases):
+    - show_catalog: category / price / query filters through CATALOG_INDEX
+    - add_to_cart: spoken references ("the second one", "black mug", an id)
+      resolved against the last list shown and the catalog
+    - place_order: prices the cart and appends to ORDER_LOG
+    - order_history: one customer's newest orders
+
+Usage:
+    uv run benchmarks/bench_tools.py --sizes 1000 1000000 --save baseline.json
+    uv run benchmarks/bench_tools.py --compare baseline.json
+    uv run pytest benchmarks/bench_tools.py      (with pytest-benchmark installed)
+"""
+
+import itertools
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, HERE)
+
+import agent  # noqa: E402
+from agent_runtime.toolbench import BenchCase, ToolContext, main, parametrize, run_benchmark  # noqa: E402
+from bench_catalog import make_catalog  # noqa: E402
+from catalog import CatalogIndex  # noqa: E402
+from order_log import OrderLog, customer_key  # noqa: E402
+
+SHOP_CATALOG = list(agent.CATALOG)
+CUSTOMERS = 100
+SEARCHES = [
+    {"category": "mug"},
+    {"category": "tshirt", "color": "black", "max_price": 800},
+    {"q": "wireless", "max_price": 3000},
+    {"q": "travel bottle"},
+]
+
+
+def use_catalog(size: int):
+    agent.CATALOG_INDEX = CatalogIndex(make_catalog(size))
+
+
+def use_order_log(size: int, tmp: str):
+    path = os.path.join(tmp, "orders.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(size):
+            name = f"Customer {i % CUSTOMERS}"
+            f.write(json.dumps({
+                "id": f"order-{i:08d}",
+                "items": [{"product_id": f"p-{i % 50}", "name": f"Product {i % 50}", "unit_price": 350,
+                           "quantity": 1, "line_total": 350, "attrs": {}}],
+                "total": 350,
+                "currency": "INR",
+                "created_at": f"2025-01-{1 + i % 28:02d}T00:00:00Z",
+                "customer_name": name,
+                "customer_key": customer_key(name),
+            }, separators=(",", ":")) + "\n")
+    agent.CATALOG_INDEX = CatalogIndex(SHOP_CATALOG)
+    agent.ORDER_LOG.close()
+    agent.ORDER_LOG = OrderLog(path)
+
+
+def show_catalog(size: int, tmp: str):
+    use_catalog(size)
+    ctx = ToolContext(agent.Userdata())
+    searches = itertools.cycle(SEARCHES)
+
+    async def op():
+        await agent.show_catalog(ctx, **next(searches))
+
+    return op
+
+
+def add_to_cart(size: int, tmp: str):
+    use_catalog(size)
+    ctx = ToolContext(agent.Userdata())
+    refs = itertools.cycle(["the second one", "ceramic mug", f"p-{size - 1}"])
+
+    async def op():
+        await agent.show_catalog(ctx, category="mug")
+        await agent.add_to_cart(ctx, next(refs))
+        if len(ctx.userdata.history) > 100:
+            ctx.userdata.history.clear()
+            ctx.userdata.cart.clear()
+
+    return op
+
+
+def place_order(size: int, tmp: str):
+    use_order_log(size, tmp)
+    ctx = ToolContext(agent.Userdata(player_name="Customer 7"))
+    mug = agent.CATALOG_INDEX.get("mug-001")
+
+    async def op():
+        ctx.userdata.cart.add(mug, 2)
+        await agent.place_order(ctx)
+        ctx.userdata.orders.clear()
+        ctx.userdata.history.clear()
+
+    return op
+
+
+def order_history(size: int, tmp: str):
+    use_order_log(size, tmp)
+    ctx = ToolContext(agent.Userdata(player_name="Customer 7"))
+
+    async def op():
+        await agent.order_history(ctx, limit=3)
+
+    return op
+
+
+CASES = [
+    BenchCase("show_catalog", show_catalog),
+    BenchCase("add_to_cart", add_to_cart),
+    BenchCase("place_order", place_order),
+    BenchCase("order_history", order_history),
+]
+
+
+def pytest_generate_tests(metafunc):
+    parametrize(metafunc, CASES)
+
+
+def test_tool(benchmark, bench_case):
+    run_benchmark(benchmark, bench_case)
+
+
+if __name__ == "__main__":
+    main("day9", CASES)
@@ -1,6 +1,6 @@
-import json
 import logging
 import os
+import sys
 import asyncio
 import uuid
 from dataclasses import dataclass, field
@@ -11,18 +11,24 @@ from dotenv import load_dotenv
 from pydantic import Field
 from livekit.agents import (
     Agent,
-    AgentSession,
     JobContext,
-    JobProcess,
-    RoomInputOptions,
     WorkerOptions,
     cli,
     function_tool,
     RunContext,
 )
 
-from livekit.plugins import murf, silero, google, deepgram, noise_cancellation
-from livekit.plugins.turn_detector.multilingual import MultilingualModel
+# Shared runtime (session factory, storage, metrics) lives in <repo>/shared
+_SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "shared"))
+if _SHARED_DIR not in sys.path:
+    sys.path.insert(0, _SHARED_DIR)
+
+from agent_runtime import VoiceConfig, attach_metrics, build_session, prewarm, start_session  # noqa: E402
+
+from cart import Cart
+from catalog import CatalogIndex, Product, category_from_query, normalize_category, price_line_items
+from order_log import OrderLog, customer_key
+from resolver import resolve_reference
 
 # -------------------------
 # Logging
@@ -33,7 +39,9 @@ handler = logging.StreamHandler()
 handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
 logger.addHandler(handler)
 
-load_dotenv(".env.local")
+# backend/ holds .env.local and the data files, wherever the worker (or the router) runs from
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+load_dotenv(os.path.join(BACKEND_DIR, ".env.local"))
 
 # -------------------------
 # Simple Product Catalog (Amazon India style, pronounceable names)
@@ -123,194 +131,98 @@ CATALOG = [
 
 ]
 
-ORDERS_FILE = "orders.json"
+# Built once; every catalog query and id lookup goes through the index instead of scanning CATALOG.
+CATALOG_INDEX = CatalogIndex(CATALOG)
+
+ORDERS_FILE = os.path.join(BACKEND_DIR, "orders.json")  # legacy JSON array, migrated into the log on first start
+ORDER_LOG_FILE = os.path.join(BACKEND_DIR, "orders.jsonl")
 
-# ensure orders file exists
-if not os.path.exists(ORDERS_FILE):
-    with open(ORDERS_FILE, "w") as f:
-        json.dump([], f)
+ORDER_LOG = OrderLog(ORDER_LOG_FILE, legacy_path=ORDERS_FILE)
 
 # -------------------------
 # Per-session Userdata (shopping-centric)
 # -------------------------
 @dataclass
 class Userdata:
-    player_name: Optional[str] = None  # retained name field (player -> customer)
+    player_name: Optional[str] = None  # retained name field (player -> customer); owns the orders placed
     session_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
     started_at: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
-    cart: List[Dict] = field(default_factory=list)  # list of {product_id, quantity, attrs}
+    cart: Cart = field(default_factory=Cart)  # lines keyed by (product_id, attrs), running total
     orders: List[Dict] = field(default_factory=list)  # orders placed in this session
     history: List[Dict] = field(default_factory=list)  # conversational actions for trace
+    last_shown: List[str] = field(default_factory=list)  # product ids from the last show_catalog, in spoken order
 
 # -------------------------
 # Merchant-layer helpers (ACP-inspired mini layer)
 # -------------------------
 
-def _load_all_orders() -> List[Dict]:
-    try:
-        with open(ORDERS_FILE, "r") as f:
-            return json.load(f)
-    except Exception:
-        return []
-
-
 def _save_order(order: Dict):
-    orders = _load_all_orders()
-    orders.append(order)
-    with open(ORDERS_FILE, "w") as f:
-        json.dump(orders, f, indent=2)
+    ORDER_LOG.append(order)
 
 
 def list_products(filters: Optional[Dict] = None) -> List[Dict]:
-    """Naive filtering by category, max_price, color, size substring, or query words."""
+    """Filter by category, price range, color, size, or query words via the catalog index."""
     filters = filters or {}
-    results = []
-    query = filters.get("q")
-    category = filters.get("category")
-    max_price = filters.get("max_price") or filters.get("to") or filters.get("max")
-    min_price = filters.get("min_price") or filters.get("from") or filters.get("min")
-    color = filters.get("color")
-    size = filters.get("size")
-
-    # normalize category synonyms
-    if category:
-        cat = category.lower()
-        if cat in ("phone", "phones", "mobile", "mobile phone", "mobiles"):
-            category = "mobile"
-        elif cat in ("tshirt", "t-shirts", "tees", "tee"):
-            category = "tshirt"
-        else:
-            category = cat
-
-    for p in CATALOG:
-        ok = True
-        # category matching: allow substring matches if direct equality fails
-        if category:
-            pcat = p.get("category", "").lower()
-            if pcat != category and category not in pcat and pcat not in category:
-                ok = False
-        if max_price:
-            try:
-                if p.get("price", 0) > int(max_price):
-                    ok = False
-            except Exception:
-                pass
-        if min_price:
-            try:
-                if p.get("price", 0) < int(min_price):
-                    ok = False
-            except Exception:
-                pass
-        if color and p.get("color") and p.get("color") != color:
-            ok = False
-        if size and (not p.get("sizes") or size not in p.get("sizes")):
-            ok = False
-        if query:
-            q = query.lower()
-            # if query mentions 'phone' or 'mobile', accept mobile category too
-            if "phone" in q or "mobile" in q:
-                if p.get("category") != "mobile":
-                    ok = False
-            else:
-                if q not in p.get("name", "").lower() and q not in p.get("description", "").lower():
-                    ok = False
-        if ok:
-            results.append(p)
-    return results
-
-
-def find_product_by_ref(ref_text: str, candidates: Optional[List[Dict]] = None) -> Optional[Dict]:
-    """Resolve references like 'second mug' or 'black bottle' to a product dict."""
-    ref = (ref_text or "").lower().strip()
-    cand = candidates if candidates is not None else CATALOG
-
-    # prefer mobiles if user explicitly mentions phone/mobile
-    wants_mobile = any(w in ref for w in ("phone", "phones", "mobile", "mobiles"))
-    filtered = cand
-    if wants_mobile:
-        filtered = [p for p in cand if p.get("category") == "mobile"]
-        if not filtered:
-            filtered = cand
-
-    # ordinal handling
-    ordinals = {"first": 0, "second": 1, "third": 2, "fourth": 3}
-    for word, idx in ordinals.items():
-        if word in ref:
-            if idx < len(filtered):
-                return filtered[idx]
-
-    # direct id match
-    for p in cand:
-        if p["id"].lower() == ref:
-            return p
-
-    # color + category matching
-    for p in cand:
-        if p.get("color") and p["color"] in ref and p.get("category") and p["category"] in ref:
-            return p
-
-    # name substring or keywords
-    for p in filtered:
-        name = p["name"].lower()
-        if all(tok in name for tok in ref.split() if len(tok) > 2):
-            return p
-    for p in cand:
-        for tok in ref.split():
-            if len(tok) > 2 and tok in p["name"].lower():
-                return p
-
-    # numeric index like '2' -> second
-    for token in ref.split():
-        if token.isdigit():
-            idx = int(token) - 1
-            if 0 <= idx < len(filtered):
-                return filtered[idx]
-
-    # fallback: if user said 'second item' but we couldn't match earlier, try overall cand ordinals
-    for word, idx in ordinals.items():
-        if word in ref and idx < len(cand):
-            return cand[idx]
-
-    return None
-
-
-def create_order_object(line_items: List[Dict], currency: str = "INR") -> Dict:
-    """line_items: [{product_id, quantity, attrs}] Returns an order dict (id, items, total, currency, created_at)"""
-    items = []
-    total = 0
-    for li in line_items:
-        pid = li.get("product_id")
-        qty = int(li.get("quantity", 1))
-        prod = next((p for p in CATALOG if p["id"] == pid), None)
-        if not prod:
-            raise ValueError(f"Product {pid} not found")
-        line_total = prod["price"] * qty
-        total += line_total
-        items.append({
-            "product_id": pid,
-            "name": prod["name"],
-            "unit_price": prod["price"],
-            "quantity": qty,
-            "line_total": line_total,
-            "attrs": li.get("attrs", {}),
-        })
+    return CATALOG_INDEX.search(
+        q=filters.get("q"),
+        category=filters.get("category"),
+        min_price=filters.get("min_price") or filters.get("from") or filters.get("min"),
+        max_price=filters.get("max_price") or filters.get("to") or filters.get("max"),
+        color=filters.get("color"),
+        size=filters.get("size"),
+    )
+
+
+def find_product_by_ref(ref_text: str, shown_ids: Optional[List[str]] = None) -> Optional[Product]:
+    """Resolve references like 'second mug' or 'black bottle', preferring the list last shown."""
+    return resolve_reference(CATALOG_INDEX, ref_text, shown_ids)
+
+
+def create_order_object(line_items: List[Dict], currency: str = "INR",
+                        customer_name: Optional[str] = None) -> Dict:
+    """line_items: [{product_id, quantity, attrs}] Returns an order dict (id, items, total, currency, created_at, customer)"""
+    items, total = price_line_items(CATALOG_INDEX, line_items)
     order = {
         "id": f"order-{str(uuid.uuid4())[:8]}",
         "items": items,
         "total": total,
         "currency": currency,
         "created_at": datetime.utcnow().isoformat() + "Z",
+        "customer_name": customer_name,
+        "customer_key": customer_key(customer_name),
     }
     # persist
     _save_order(order)
     return order
 
 
-def get_most_recent_order() -> Optional[Dict]:
-    all_orders = _load_all_orders()
-    if not all_orders:
-        return None
-    return all_orders[-1]
+def get_most_recent_order(userdata: Userdata) -> Optional[Dict]:
+    """The speaking customer's latest order; without a known name, the latest order from this session."""
+    if userdata.player_name:
+        found = ORDER_LOG.customer_orders(userdata.player_name, limit=1)
+        return found[0] if found else None
+    return userdata.orders[-1] if userdata.orders else None
+
+
+def _is_date(value: str) -> bool:
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return False
+    return len(value) == 10
+
+
+def _end_of_day(value: Optional[str]) -> Optional[str]:
+    # "2025-01-31" as an upper bound means the whole day
+    return f"{value}T23:59:59.999" if value and len(value) == 10 else value
+
+
+def _speak_order(order: Dict, heading: str) -> List[str]:
+    lines = [f"{heading}: {order['id']} — {order['created_at']}"]
+    for it in order['items']:
+        lines.append(f"- {it['name']} x {it['quantity']}: {it['line_total']} {order['currency']}")
+    lines.append(f"Total: {order['total']} {order['currency']}")
+    return lines
 
 # -------------------------
 # Agent Tools (function_tool) exposed to the LLM layer
@@ -326,26 +238,15 @@ async def show_catalog(
 ) -> str:
     """Return a short spoken summary of matching products (name, price, id)."""
     userdata = ctx.userdata
-    # normalize category input
-    if category:
-        cat = category.lower()
-        if cat in ("phone", "phones", "mobile", "mobile phone", "mobiles"):
-            category = "mobile"
-        elif cat in ("tshirt", "t-shirts", "tees", "tee"):
-            category = "tshirt"
-        else:
-            category = cat
-    # If query mentions phones, prefer category mobile
-    if not category and q:
-        if any(w in q.lower() for w in ("phone", "phones", "mobile", "mobiles")):
-            category = "mobile"
-        if any(w in q.lower() for w in ("tee", "tshirt", "t-shirts", "tees")):
-            category = "tshirt"
+    # If query mentions phones or tees, prefer that category
+    category = normalize_category(category) or category_from_query(q)
 
     filters = {"q": q, "category": category, "max_price": max_price, "color": color}
     prods = list_products({k: v for k, v in filters.items() if v is not None})
     if not prods:
         return "Sorry — I couldn't find any items that match. Would you like to try another search?"
+    # "the second one" refers to this list from now on
+    userdata.last_shown = [p["id"] for p in prods[:6]]
     # Summarize top 6 (short for TTS)
     lines = [f"Here are the top {min(6, len(prods))} items I found:"]
     for idx, p in enumerate(prods[:6], start=1):
@@ -366,22 +267,21 @@ async def add_to_cart(
 ) -> str:
     """Resolve a product and add to the session cart."""
     userdata = ctx.userdata
-    candidates = CATALOG
-    prod = find_product_by_ref(product_ref, candidates)
+    prod = find_product_by_ref(product_ref, userdata.last_shown)
     if not prod:
         return "I couldn't resolve which product you meant. Try using the item id or say 'show catalog' to hear options."
-    userdata.cart.append({
-        "product_id": prod["id"],
-        "quantity": int(quantity),
-        "attrs": {"size": size} if size else {},
-    })
+    if int(quantity) < 1:
+        return "How many would you like? The quantity needs to be at least one."
+    line = userdata.cart.add(prod, int(quantity), {"size": size} if size else {})
     userdata.history.append({
         "time": datetime.utcnow().isoformat() + "Z",
         "action": "add_to_cart",
-        "product_id": prod["id"],
+        "product_id": prod.id,
         "quantity": int(quantity),
     })
-    return f"Added {quantity} x {prod['name']} to your cart. What would you like to do next?"
+    if line.quantity > int(quantity):
+        return f"Added {quantity} more {prod.name}; you now have {line.quantity} in your cart. What would you like to do next?"
+    return f"Added {quantity} x {prod.name} to your cart. What would you like to do next?"
 
 
 @function_tool
@@ -392,17 +292,11 @@ async def show_cart(
     if not userdata.cart:
         return "Your cart is empty. You can say 'show catalog' to browse items."
     lines = ["Items in your cart:"]
-    total = 0
-    for li in userdata.cart:
-        p = next((x for x in CATALOG if x["id"] == li["product_id"]), None)
-        if not p:
-            continue
-        line_total = p["price"] * li.get("quantity", 1)
-        total += line_total
-        sz = li.get("attrs", {}).get("size")
+    for line in userdata.cart:
+        sz = line.attrs.get("size")
         sz_text = f", size {sz}" if sz else ""
-        lines.append(f"- {p['name']} x {li['quantity']}{sz_text}: {line_total} INR")
-    lines.append(f"Cart total: {total} INR")
+        lines.append(f"- {line.name} x {line.quantity}{sz_text}: {line.line_total} INR")
+    lines.append(f"Cart total: {userdata.cart.total} INR")
     lines.append("Say 'place my order' to checkout or 'clear cart' to empty the cart.")
     return "\n".join(lines)
 
@@ -412,7 +306,7 @@ async def clear_cart(
     ctx: RunContext[Userdata],
 ) -> str:
     userdata = ctx.userdata
-    userdata.cart = []
+    userdata.cart.clear()
     userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "clear_cart"})
     return "Your cart has been cleared. What would you like to do next?"
 
@@ -426,33 +320,70 @@ async def place_order(
     userdata = ctx.userdata
     if not userdata.cart:
         return "Your cart is empty — nothing to place. Would you like to browse items?"
-    # Build line_items
-    line_items = []
-    for li in userdata.cart:
-        line_items.append({
-            "product_id": li["product_id"],
-            "quantity": li.get("quantity", 1),
-            "attrs": li.get("attrs", {}),
-        })
-    order = create_order_object(line_items)
+    order = create_order_object(userdata.cart.line_items(), customer_name=userdata.player_name)
     userdata.orders.append(order)
     userdata.history.append({"time": datetime.utcnow().isoformat() + "Z", "action": "place_order", "order_id": order["id"]})
     # clear cart after order
-    userdata.cart = []
+    userdata.cart.clear()
     return f"Order placed. Order ID {order['id']}. Total {order['total']} {order['currency']}. What would you like to do next?"
 
 
+@function_tool
+async def set_customer_name(
+    ctx: RunContext[Userdata],
+    name: Annotated[str, Field(description="The customer's name")],
+) -> str:
+    """Remember who is shopping, so orders and order history belong to them."""
+    userdata = ctx.userdata
+    userdata.player_name = " ".join(name.split())
+    count = ORDER_LOG.customer_order_count(userdata.player_name)
+    if count:
+        return f"Welcome back, {userdata.player_name}. You have {count} past orders with us."
+    return f"Nice to meet you, {userdata.player_name}."
+
+
 @function_tool
 async def last_order(
     ctx: RunContext[Userdata],
 ) -> str:
-    ord = get_most_recent_order()
+    ord = get_most_recent_order(ctx.userdata)
     if not ord:
+        if not ctx.userdata.player_name:
+            return "I don't see an order yet. If you've shopped with us before, tell me your name and I'll look it up."
         return "You have no past orders yet."
-    lines = [f"Most recent order: {ord['id']} — {ord['created_at']}"]
-    for it in ord['items']:
-        lines.append(f"- {it['name']} x {it['quantity']}: {it['line_total']} {ord['currency']}")
-    lines.append(f"Total: {ord['total']} {ord['currency']}")
+    return "\n".join(_speak_order(ord, "Most recent order"))
+
+
+@function_tool
+async def order_history(
+    ctx: RunContext[Userdata],
+    limit: Annotated[int, Field(description="How many orders to read out", default=3)] = 3,
+    since: Annotated[Optional[str], Field(description="Start date YYYY-MM-DD (optional)", default=None)] = None,
+    until: Annotated[Optional[str], Field(description="End date YYYY-MM-DD (optional)", default=None)] = None,
+    product_ref: Annotated[Optional[str], Field(description="Only orders containing this product (optional)", default=None)] = None,
+) -> str:
+    """Read out the customer's past orders, newest first, optionally by date range or product."""
+    userdata = ctx.userdata
+    if not userdata.player_name:
+        return "Tell me your name first and I'll look up your orders."
+    since, until = (since or "").strip() or None, (until or "").strip() or None
+    if any(d and not _is_date(d) for d in (since, until)):
+        return "Which dates should I look between? I need them as year, month and day, like 2025-03-14."
+    product_id = None
+    if product_ref:
+        prod = find_product_by_ref(product_ref, userdata.last_shown)
+        if not prod:
+            return "I couldn't tell which product you meant. Try the item id."
+        product_id = prod.id
+    orders = ORDER_LOG.customer_orders(
+        userdata.player_name, limit=max(1, min(int(limit), 10)),
+        since=since, until=_end_of_day(until), product_id=product_id,
+    )
+    if not orders:
+        return "I couldn't find any matching orders."
+    lines = []
+    for idx, order in enumerate(orders, start=1):
+        lines.extend(_speak_order(order, f"Order {idx}"))
     return "\n".join(lines)
 
 # -------------------------
@@ -468,25 +399,24 @@ class GameMasterAgent(Agent):
         Role: Help the customer browse the catalog, add items to cart, place orders, and review recent orders.
 
         Rules:
-            - Use the provided tools to show the catalog, add items to cart, show the cart, place orders, show last order and clear the cart.
+            - Early on, ask for the customer's name and save it with set_customer_name; orders and order history are per customer.
+            - Use the provided tools to show the catalog, add items to cart, show the cart, place orders, show last order or order history, and clear the cart.
             - Keep continuity using the per-session userdata. Mention cart contents if relevant.
             - Drive short voice-first turns suitable for spoken delivery.
             - When presenting options, include product id and price (e.g. 'mug-001 — 350 INR').
         """
         super().__init__(
             instructions=instructions,
-            tools=[show_catalog, add_to_cart, show_cart, clear_cart, place_order, last_order],
+            tools=[
+                show_catalog, add_to_cart, show_cart, clear_cart, place_order,
+                set_customer_name, last_order, order_history,
+            ],
         )
 
 # -------------------------
 # Entrypoint & Prewarm (keeps speech functionality untouched)
 # -------------------------
-def prewarm(proc: JobProcess):
-    # load VAD model and stash on process userdata, try/catch like original file
-    try:
-        proc.userdata["vad"] = silero.VAD.load()
-    except Exception:
-        logger.warning("VAD prewarm failed; continuing without preloaded VAD.")
+VOICE = VoiceConfig()
 
 
 async def entrypoint(ctx: JobContext):
@@ -496,27 +426,11 @@ async def entrypoint(ctx: JobContext):
 
     userdata = Userdata()
 
-    session = AgentSession(
-        stt=deepgram.STT(model="nova-3"),
-        llm=google.LLM(model="gemini-2.5-flash"),
-        tts=murf.TTS(
-            voice="en-US-marcus",
-            style="Conversational",
-            text_pacing=True,
-        ),
-        turn_detection=MultilingualModel(),
-        vad=ctx.proc.userdata.get("vad"),
-        userdata=userdata,
-    )
+    session = build_session(ctx, VOICE, userdata=userdata)
+    attach_metrics(ctx, session, agent="day9")
 
     # Start the agent session with the GameMasterAgent
-    await session.start(
-        agent=GameMasterAgent(),
-        room=ctx.room,
-        room_input_options=RoomInputOptions(noise_cancellation=noise_cancellation.BVC()),
-    )
-
-    await ctx.connect()
+    await start_session(ctx, session, GameMasterAgent())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""
+Day 9 – Session cart
+
+- Lines are keyed by (product_id, attrs): adding the same product with the
+  same size again raises the quantity instead of adding a duplicate line
+- Unit prices are captured when a product is added, and the cart total is
+  kept up to date on every change, so reading it never re-prices the cart
+- Lines keep insertion order, which is the order they are read back
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from catalog import Product
+
+LineKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def line_key(product_id: str, attrs: Optional[Dict] = None) -> LineKey:
+    return product_id, tuple(sorted((k, str(v)) for k, v in (attrs or {}).items() if v is not None))
+
+
+class CartLine(NamedTuple):
+    product_id: str
+    name: str
+    unit_price: int
+    quantity: int
+    attrs: Dict
+
+    @property
+    def line_total(self) -> int:
+        return self.unit_price * self.quantity
+
+
+class Cart:
+    """Per-session cart; add/remove are O(1) and keep `total` current."""
+
+    def __init__(self):
+        self._lines: Dict[LineKey, CartLine] = {}
+        self.total = 0
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __bool__(self) -> bool:
+        return bool(self._lines)
+
+    def __iter__(self) -> Iterator[CartLine]:
+        return iter(self._lines.values())
+
+    @property
+    def item_count(self) -> int:
+        return sum(line.quantity for line in self._lines.values())
+
+    def add(self, product: Product, quantity: int = 1, attrs: Optional[Dict] = None) -> CartLine:
+        """Add quantity of a product; merges into an existing line with the same attrs."""
+        if quantity < 1:
+            raise ValueError("quantity must be at least 1")
+        key = line_key(product.id, attrs)
+        line = self._lines.get(key)
+        if line is None:
+            line = CartLine(product.id, product.name, product.price, quantity, dict(attrs or {}))
+        else:
+            line = line._replace(quantity=line.quantity + quantity)
+        self._lines[key] = line
+        self.total += line.unit_price * quantity
+        return line
+
+    def remove(self, product_id: str, attrs: Optional[Dict] = None,
+               quantity: Optional[int] = None) -> Optional[CartLine]:
+        """Remove quantity (default: all) from a line; returns the updated line, or None if it is gone."""
+        if quantity is not None and quantity < 1:
+            raise ValueError("quantity must be at least 1")
+        key = line_key(product_id, attrs)
+        line = self._lines.get(key)
+        if line is None:
+            raise KeyError(product_id)
+        removed = line.quantity if quantity is None else min(quantity, line.quantity)
+        self.total -= line.unit_price * removed
+        if removed == line.quantity:
+            del self._lines[key]
+            return None
+        line = self._lines[key] = line._replace(quantity=line.quantity - removed)
+        return line
+
+    def lines_for(self, product_id: str) -> List[CartLine]:
+        return [line for (pid, _), line in self._lines.items() if pid == product_id]
+
+    def clear(self):
+        self._lines.clear()
+        self.total = 0
+
+    def line_items(self) -> List[Dict]:
+        """[{product_id, quantity, attrs}] for order creation."""
+        return [
+            {"product_id": line.product_id, "quantity": line.quantity, "attrs": dict(line.attrs)}
+            for line in self._lines.values()
+        ]
@@ -0,0 +1,268 @@
+"""
+Day 9 – Catalog index for the voice shop
+
+Built once from the product list, so catalog queries never scan every product:
+- facet posting lists: category, color, size -> product positions
+- products sorted by price, range-filtered with binary search
+- pre-tokenized name + description -> product positions
+- product id -> read-only Product record, for cart and order pricing
+- spoken-reference tokens (name, color, category and its aliases) per product,
+  used by resolver.py to score "the black one" / "second mug"
+A filtered query starts from its most selective posting list and intersects
+the rest; results come back in catalog order. The index is immutable: a
+catalog reload builds a new one, which drops the old id map with it.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Set, Tuple
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+CATEGORY_ALIASES = {
+    "phone": "mobile",
+    "phones": "mobile",
+    "mobile": "mobile",
+    "mobile phone": "mobile",
+    "mobiles": "mobile",
+    "tshirt": "tshirt",
+    "t-shirts": "tshirt",
+    "tees": "tshirt",
+    "tee": "tshirt",
+}
+
+# Query words that imply a category on their own (whole words only, so "steel" is not a tee).
+QUERY_CATEGORY_WORDS = {
+    "phone": "mobile",
+    "phones": "mobile",
+    "mobile": "mobile",
+    "mobiles": "mobile",
+    "tee": "tshirt",
+    "tees": "tshirt",
+    "tshirt": "tshirt",
+    "t-shirts": "tshirt",
+}
+_QUERY_CATEGORY_RE = re.compile(
+    r"\b(" + "|".join(sorted(map(re.escape, QUERY_CATEGORY_WORDS), key=len, reverse=True)) + r")\b"
+)
+
+
+def normalize_category(category: Optional[str]) -> Optional[str]:
+    if not category:
+        return None
+    cat = category.strip().lower()
+    return CATEGORY_ALIASES.get(cat, cat)
+
+
+def category_from_query(q: Optional[str]) -> Optional[str]:
+    """Category implied by a free-text query ("cheap phones" -> "mobile"), if any."""
+    found = _QUERY_CATEGORY_RE.findall((q or "").lower())
+    return QUERY_CATEGORY_WORDS[found[-1]] if found else None
+
+
+def _stem(word: str) -> str:
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [_stem(w) for w in _WORD_RE.findall((text or "").lower())]
+
+
+def _to_int(value) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Product(NamedTuple):
+    """Compact read-only product record."""
+    id: str
+    name: str
+    price: int
+    currency: str = "INR"
+    category: str = ""
+    color: Optional[str] = None
+    sizes: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, p: Dict) -> "Product":
+        return cls(
+            id=p["id"],
+            name=p["name"],
+            price=p.get("price", 0),
+            currency=p.get("currency", "INR"),
+            category=p.get("category") or "",
+            color=p.get("color"),
+            sizes=tuple(p.get("sizes") or ()),
+        )
+
+
+class CatalogIndex:
+    """Read-only search index over a product list (dicts with id/name/price/...)."""
+
+    def __init__(self, products: Iterable[Dict]):
+        self.products: List[Dict] = list(products)
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_color: Dict[str, Set[int]] = {}
+        self._no_color: Set[int] = set()
+        self._by_size: Dict[str, Set[int]] = {}
+        self._by_token: Dict[str, Set[int]] = {}
+        self._category_matches: Dict[str, FrozenSet[int]] = {}
+        self.records: Tuple[Product, ...] = tuple(Product.from_dict(p) for p in self.products)
+        self.by_id: Mapping[str, Product] = MappingProxyType({r.id: r for r in self.records})
+        self._ref_tokens: Dict[str, FrozenSet[str]] = {}
+        self._by_ref_token: Dict[str, Set[int]] = {}
+
+        aliases: Dict[str, Set[str]] = {}
+        for word, cat in list(CATEGORY_ALIASES.items()) + list(QUERY_CATEGORY_WORDS.items()):
+            aliases.setdefault(cat, set()).update(t for t in tokenize(word) if len(t) > 1)
+
+        for pos, p in enumerate(self.products):
+            category = (p.get("category") or "").lower()
+            ref = set(tokenize(p.get("name")) + tokenize(p.get("color")) + tokenize(category))
+            ref |= aliases.get(category, set())
+            self._ref_tokens[p["id"]] = frozenset(ref)
+            for tok in ref:
+                self._by_ref_token.setdefault(tok, set()).add(pos)
+
+            self._by_category.setdefault((p.get("category") or "").lower(), set()).add(pos)
+            color = (p.get("color") or "").lower()
+            if color:
+                self._by_color.setdefault(color, set()).add(pos)
+            else:
+                self._no_color.add(pos)
+            for size in p.get("sizes") or []:
+                self._by_size.setdefault(size, set()).add(pos)
+            for tok in set(tokenize(p.get("name")) + tokenize(p.get("description"))):
+                self._by_token.setdefault(tok, set()).add(pos)
+
+        self._prices = [p.get("price", 0) for p in self.products]
+        self._price_order = sorted(range(len(self.products)), key=self._prices.__getitem__)
+        self._sorted_prices = [self._prices[pos] for pos in self._price_order]
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def get(self, product_id: Optional[str]) -> Optional[Product]:
+        return self.by_id.get(product_id)
+
+    def ref_tokens(self, product_id: str) -> FrozenSet[str]:
+        return self._ref_tokens.get(product_id, frozenset())
+
+    def ref_candidates(self, words: Iterable[str]) -> List[Product]:
+        """Products sharing at least one reference token with `words`, in catalog order."""
+        positions: Set[int] = set()
+        for w in words:
+            positions |= self._by_ref_token.get(w, set())
+        return [self.records[pos] for pos in sorted(positions)]
+
+    # ---- facets ----
+    def _category(self, category: str) -> FrozenSet[int]:
+        """Exact category, or any category containing / contained in it (cached per query)."""
+        hit = self._category_matches.get(category)
+        if hit is None:
+            matched: Set[int] = set()
+            for pcat, positions in self._by_category.items():
+                if pcat == category or category in pcat or pcat in category:
+                    matched |= positions
+            if len(self._category_matches) >= 256:
+                self._category_matches.clear()
+            hit = self._category_matches[category] = frozenset(matched)
+        return hit
+
+    def _color(self, color: str) -> Set[int]:
+        # Products without a color are never excluded by a color filter.
+        return self._by_color.get(color.lower(), set()) | self._no_color
+
+    def _text(self, query: str) -> Set[int]:
+        tokens = set(tokenize(query))
+        if not tokens:
+            return set(range(len(self.products)))
+        postings = sorted((self._by_token.get(t, set()) for t in tokens), key=len)
+        result = set(postings[0])
+        for other in postings[1:]:
+            result &= other
+        return result
+
+    def _price_range(self, lo: Optional[int], hi: Optional[int]) -> List[int]:
+        start = 0 if lo is None else bisect_left(self._sorted_prices, lo)
+        stop = len(self._sorted_prices) if hi is None else bisect_right(self._sorted_prices, hi)
+        return self._price_order[start:stop]
+
+    # ---- search ----
+    def search(self, q: Optional[str] = None, category: Optional[str] = None,
+               min_price=None, max_price=None, color: Optional[str] = None,
+               size: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
+        lo, hi = _to_int(min_price), _to_int(max_price)
+        category = normalize_category(category)
+
+        sets = []
+        if category:
+            sets.append(self._category(category))
+        if color:
+            sets.append(self._color(color))
+        if size:
+            sets.append(self._by_size.get(size, set()))
+        if q:
+            implied = category_from_query(q)
+            sets.append(self._category(implied) if implied else self._text(q))
+
+        if not sets:
+            if lo is None and hi is None:
+                positions = list(range(len(self.products) if limit is None else min(limit, len(self.products))))
+            else:
+                positions = sorted(self._price_range(lo, hi))
+        else:
+            sets.sort(key=len)
+            result = set(sets[0])
+            for other in sets[1:]:
+                if not result:
+                    break
+                result &= other
+            if lo is not None or hi is not None:
+                prices = self._prices
+                result = {
+                    pos for pos in result
+                    if (lo is None or prices[pos] >= lo) and (hi is None or prices[pos] <= hi)
+                }
+            positions = sorted(result)
+
+        if limit is not None:
+            positions = positions[:limit]
+        return [self.products[pos] for pos in positions]
+
+
+def price_line_items(index: CatalogIndex, line_items: Iterable[Dict],
+                     skip_missing: bool = False) -> Tuple[List[Dict], int]:
+    """Price cart lines ({product_id, quantity, attrs}) -> (order items, total).
+
+    Unknown products raise ValueError, or are dropped when skip_missing is set.
+    """
+    items = []
+    total = 0
+    by_id = index.by_id
+    for li in line_items:
+        pid = li.get("product_id")
+        prod = by_id.get(pid)
+        if prod is None:
+            if skip_missing:
+                continue
+            raise ValueError(f"Product {pid} not found")
+        qty = int(li.get("quantity", 1))
+        line_total = prod.price * qty
+        total += line_total
+        items.append({
+            "product_id": pid,
+            "name": prod.name,
+            "unit_price": prod.price,
+            "quantity": qty,
+            "line_total": line_total,
+            "attrs": li.get("attrs", {}),
+        })
+    return items, total
@@ -0,0 +1,307 @@
+"""
+Day 9 – Append-only order log (JSON Lines)
+
+- One order per line in orders.jsonl; placing an order appends a single line
+  instead of rewriting the whole file
+- An in-memory offset index (byte offset of every line) gives random access
+  by sequence number
+- The most recent orders are kept parsed in a small tail cache, so "last order"
+  never touches the disk
+- Orders carry customer_name / customer_key; a per-customer index (built in the
+  same pass that builds the offsets) answers last-N, date-range and
+  per-product history without scanning other customers' orders
+- Appends take a process lock plus an advisory file lock (where available);
+  lines appended by another process are picked up before the next write
+- A complete line that does not decode to an order is logged and skipped (it
+  gets no sequence number), so one bad line never stops the agent from loading
+- A legacy orders.json array is migrated once, streamed element by element,
+  when the log does not exist yet; the old file is left in place
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: the process lock still serializes writers in this process
+    fcntl = None
+
+logger = logging.getLogger("voice_game_master")
+
+TAIL_CACHE = 50
+_READ_CHUNK = 1 << 16
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+def customer_key(name: Optional[str]) -> Optional[str]:
+    return " ".join(name.split()).lower() if name and name.strip() else None
+
+
+def parse_timestamp_ms(value: str) -> int:
+    """Milliseconds since the epoch for an ISO date or timestamp ("2025-01-01T10:00:00Z"); ValueError if unparseable."""
+    dt = datetime.fromisoformat(value.strip().rstrip("Z"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def timestamp_ms(value: Optional[str]) -> int:
+    """parse_timestamp_ms for stored orders: 0 if missing or unparseable, so such orders sort first."""
+    if not value:
+        return 0
+    try:
+        return parse_timestamp_ms(value)
+    except ValueError:
+        return 0
+
+
+class _CustomerOrders:
+    """One customer's orders: sequence numbers sorted by time, plus per-product postings."""
+
+    __slots__ = ("by_product", "seqs", "times")
+
+    def __init__(self):
+        self.times = array("q")
+        self.seqs = array("q")
+        self.by_product: Dict[str, array] = {}
+
+    def add(self, seq: int, ms: int, product_ids):
+        if not self.times or ms >= self.times[-1]:
+            self.times.append(ms)
+            self.seqs.append(seq)
+        else:  # out-of-order timestamp (clock skew between writers)
+            pos = bisect_right(self.times, ms)
+            self.times.insert(pos, ms)
+            self.seqs.insert(pos, seq)
+        for pid in product_ids:
+            self.by_product.setdefault(pid, array("q")).append(seq)
+
+
+class OrderLog:
+    """Thread-safe JSON Lines order log with offset, tail and per-customer indexes."""
+
+    def __init__(self, path: str, legacy_path: Optional[str] = None, tail_cache: int = TAIL_CACHE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._offsets = array("q")
+        self._times = array("q")  # created_at (ms) per sequence number
+        self._customers: Dict[str, _CustomerOrders] = {}
+        self._end = 0  # byte offset just past the last complete line
+        self._tail: Deque[Dict] = deque(maxlen=tail_cache)
+
+        if not os.path.exists(path) and legacy_path and os.path.exists(legacy_path):
+            migrate_json_array(legacy_path, path)
+        if not os.path.exists(path):
+            with open(path, "ab"):
+                pass
+
+        self._file = open(path, "a+b")  # noqa: SIM115 - held open until close()
+        self._catch_up()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    # ---- loading ----
+    def _index(self, seq: int, order: Dict):
+        ms = timestamp_ms(order.get("created_at"))
+        self._times.append(ms)
+        key = order.get("customer_key") or customer_key(order.get("customer_name"))
+        if key:
+            products = {it.get("product_id") for it in order.get("items") or [] if it.get("product_id")}
+            orders = self._customers.get(key)
+            if orders is None:
+                orders = self._customers[key] = _CustomerOrders()
+            orders.add(seq, ms, products)
+
+    def _catch_up(self):
+        """Index lines written since self._end (all of them on first load)."""
+        f = self._file
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == self._end:
+            return
+        f.seek(self._end)
+        pos = self._end
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # torn write at the tail; truncated before the next append
+            try:
+                order = json.loads(line)
+            except ValueError:
+                order = None
+            if not isinstance(order, dict):
+                logger.error("order log %s: skipping undecodable line at byte %d", self.path, pos)
+                pos += len(line)
+                continue
+            self._index(len(self._offsets), order)
+            self._offsets.append(pos)
+            self._tail.append(order)
+            pos += len(line)
+        self._end = pos
+        if pos != size:
+            logger.warning("order log %s: ignoring %d bytes of incomplete trailing line", self.path, size - pos)
+
+    # ---- writes ----
+    def append(self, order: Dict) -> int:
+        """Append one order; returns its sequence number."""
+        line = (json.dumps(order, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._catch_up()
+                if self._file.seek(0, os.SEEK_END) != self._end:
+                    self._file.truncate(self._end)
+                self._file.write(line)
+                self._file.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            seq = len(self._offsets)
+            self._index(seq, order)
+            self._offsets.append(self._end)
+            self._end += len(line)
+            self._tail.append(order)
+        return seq
+
+    # ---- reads ----
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def last(self) -> Optional[Dict]:
+        with self._lock:
+            self._catch_up()  # other job processes may have appended
+            if self._tail:
+                return self._tail[-1]
+        return self.get(len(self) - 1) if len(self) else None
+
+    def tail(self, n: int) -> List[Dict]:
+        """The last n orders, oldest first."""
+        with self._lock:
+            self._catch_up()
+            if n <= len(self._tail):
+                return list(self._tail)[len(self._tail) - n:] if n > 0 else []
+        return [self.get(seq) for seq in range(max(0, len(self) - n), len(self))]
+
+    def get(self, seq: int) -> Dict:
+        """Order by sequence number (0 = oldest); served from the tail cache or one disk read."""
+        with self._lock:
+            return self._get(seq)
+
+    def _get(self, seq: int) -> Dict:
+        from_tail = seq - (len(self._offsets) - len(self._tail))
+        if from_tail >= 0:
+            return self._tail[from_tail]
+        self._file.seek(self._offsets[seq])
+        return json.loads(self._file.readline())
+
+    def __iter__(self) -> Iterator[Dict]:
+        with open(self.path, "rb") as f:
+            for pos in self._offsets[:len(self)]:  # skipped lines have no offset
+                f.seek(pos)
+                yield json.loads(f.readline())
+
+    def customer_orders(self, name: Optional[str], limit: Optional[int] = None,
+                        since: Optional[str] = None, until: Optional[str] = None,
+                        product_id: Optional[str] = None) -> List[Dict]:
+        """A customer's orders, newest first; optionally within [since, until] and/or containing a product.
+
+        An unparseable `since` or `until` raises ValueError rather than matching from (or up to) the epoch.
+        """
+        key = customer_key(name)
+        with self._lock:
+            self._catch_up()
+            orders = self._customers.get(key) if key else None
+            if orders is None:
+                return []
+            lo_ms = parse_timestamp_ms(since) if since else None
+            hi_ms = parse_timestamp_ms(until) if until else None
+            if product_id is None:
+                lo = bisect_left(orders.times, lo_ms) if lo_ms is not None else 0
+                hi = bisect_right(orders.times, hi_ms) if hi_ms is not None else len(orders.times)
+                if limit is not None:
+                    lo = max(lo, hi - limit)
+                seqs = orders.seqs[lo:hi][::-1]
+            else:
+                times = self._times
+                seqs = [
+                    s for s in orders.by_product.get(product_id, ())
+                    if (lo_ms is None or times[s] >= lo_ms) and (hi_ms is None or times[s] <= hi_ms)
+                ]
+                seqs.sort(key=lambda s: (times[s], s), reverse=True)
+                if limit is not None:
+                    seqs = seqs[:limit]
+            return [self._get(s) for s in seqs]
+
+    def customer_order_count(self, name: Optional[str]) -> int:
+        key = customer_key(name)
+        with self._lock:
+            self._catch_up()
+            orders = self._customers.get(key) if key else None
+            return len(orders.seqs) if orders else 0
+
+
+def _iter_json_array(f, chunk_size: int = _READ_CHUNK) -> Iterator:
+    """Yield the elements of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buf = f.read(chunk_size)
+    pos = _WS.match(buf).end()
+    if not buf.startswith("[", pos):
+        raise ValueError("expected a JSON array")
+    pos += 1
+    eof = False
+    while True:
+        pos = _WS.match(buf, pos).end()
+        if buf.startswith(",", pos):
+            pos = _WS.match(buf, pos + 1).end()
+        if buf.startswith("]", pos):
+            return
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+            after = _WS.match(buf, end).end()
+        except ValueError:
+            after = -1
+        # Only a following "," or "]" proves the value is complete (e.g. "12" may continue as "125").
+        if 0 <= after < len(buf) and buf[after] in ",]":
+            yield value
+            pos = after
+            continue
+        if eof:
+            raise ValueError("malformed or truncated JSON array")
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf, pos = buf[pos:] + chunk, 0
+
+
+def migrate_json_array(src: str, dest: str) -> int:
+    """Stream a legacy JSON array of orders into a new JSON Lines log; returns the order count.
+
+    Orders that carry a customer_name gain the matching customer_key on the way.
+    """
+    tmp = dest + ".tmp"
+    count = 0
+    try:
+        with open(src, encoding="utf-8") as f, open(tmp, "w", encoding="utf-8") as out:
+            for order in _iter_json_array(f):
+                if order.get("customer_name") and not order.get("customer_key"):
+                    order["customer_key"] = customer_key(order["customer_name"])
+                out.write(json.dumps(order, separators=(",", ":")) + "\n")
+                count += 1
+            out.flush()
+            os.fsync(out.fileno())
+    except (OSError, ValueError):
+        logger.warning("could not read legacy orders file %s; starting an empty log", src)
+        open(tmp, "w").close()
+        count = 0
+    os.replace(tmp, dest)
+    logger.info("migrated %d orders from %s to %s", count, src, dest)
+    return count
@@ -0,0 +1,90 @@
+"""
+Day 9 – Spoken product references ("the second one", "the black bottle")
+
+- References resolve against the list the customer last heard from
+  show_catalog (kept per session as product ids), then fall back to the catalog
+- Every candidate is scored in a single pass: overlap between the reference's
+  words and the product's pre-tokenized name / color / category
+- An ordinal ("second", "2nd", "3", "last") picks among the best-scoring
+  candidates in the order they were presented. Filler words ("the second one")
+  leave the ordinal to pick from the whole list; a description that fits
+  nothing shown ("the second lamp") falls back to the catalog instead
+- Exact product ids always win
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from catalog import CatalogIndex, Product, tokenize
+
+ORDINALS: Dict[str, int] = {
+    "first": 0, "1st": 0,
+    "second": 1, "2nd": 1,
+    "third": 2, "3rd": 2,
+    "fourth": 3, "4th": 3,
+    "fifth": 4, "5th": 4,
+    "sixth": 5, "6th": 5,
+    "last": -1,
+}
+
+
+# Words that describe no product, so they never stop an ordinal from picking.
+FILLER_WORDS = frozenset({"a", "an", "the", "one", "item", "product", "thing", "that", "this"})
+
+
+def parse_ordinal(tokens: Iterable[str]) -> Tuple[Optional[int], List[str]]:
+    """Split reference tokens into (ordinal position or None, remaining words)."""
+    ordinal = None
+    words = []
+    for tok in tokens:
+        if ordinal is None and tok in ORDINALS:
+            ordinal = ORDINALS[tok]
+        elif ordinal is None and tok.isdigit() and 0 < int(tok) <= 99:
+            ordinal = int(tok) - 1
+        else:
+            words.append(tok)
+    return ordinal, words
+
+
+def _pick(index: CatalogIndex, candidates: Sequence[Product], words: set,
+          ordinal: Optional[int]) -> Optional[Product]:
+    if not candidates:
+        return None
+    if words:
+        scored = [(len(words & index.ref_tokens(p.id)), p) for p in candidates]
+        best = max(score for score, _ in scored)
+        if best:
+            candidates = [p for score, p in scored if score == best]
+        elif ordinal is None or words - FILLER_WORDS:
+            return None  # nothing here fits the description; an ordinal must not pick something else
+        # else: only filler words ("the second one"); the ordinal alone decides
+    if ordinal is None:
+        return candidates[0]
+    if -len(candidates) <= ordinal < len(candidates):
+        return candidates[ordinal]
+    return None
+
+
+def resolve_reference(index: CatalogIndex, ref_text: str,
+                      shown_ids: Optional[Sequence[str]] = None) -> Optional[Product]:
+    """Resolve a spoken reference to a product, preferring the last list shown."""
+    ref = (ref_text or "").strip()
+    if not ref:
+        return None
+    exact = index.get(ref) or index.get(ref.lower())
+    if exact is not None:
+        return exact
+
+    ordinal, words = parse_ordinal(tokenize(ref))
+    word_set = set(words)
+
+    shown = [p for p in (index.get(pid) for pid in shown_ids or ()) if p is not None]
+    found = _pick(index, shown, word_set, ordinal)
+    if found is not None:
+        return found
+
+    # Nothing shown yet (or no match in it): fall back to the catalog.
+    # A bare ordinal only indexes the catalog when no list has been shown.
+    candidates: Sequence[Product] = index.ref_candidates(word_set) if word_set else []
+    if not candidates and ordinal is not None and not shown:
+        candidates = index.records
+    return _pick(index, candidates, word_set, ordinal)
@@ -0,0 +1,52 @@
+import pytest
+
+from cart import Cart
+from catalog import Product
+
+MUG = Product("mug-001", "Ceramic Coffee Mug", 350)
+MOUSE = Product("mouse-001", "Wireless Mouse", 449)
+TEE = Product("tee-001", "Cotton Tee", 499, sizes=("M", "L"))
+
+
+def test_same_product_and_attrs_merge_into_one_line() -> None:
+    cart = Cart()
+    cart.add(MUG)
+    cart.add(MOUSE)
+    line = cart.add(MOUSE, 2)
+
+    assert line.quantity == 3
+    assert len(cart) == 2 and cart.item_count == 4
+    assert cart.total == 350 + 3 * 449
+    assert cart.line_items() == [
+        {"product_id": "mug-001", "quantity": 1, "attrs": {}},
+        {"product_id": "mouse-001", "quantity": 3, "attrs": {}},
+    ]
+
+
+def test_attrs_keep_lines_apart() -> None:
+    cart = Cart()
+    cart.add(TEE, 1, {"size": "M"})
+    cart.add(TEE, 1, {"size": "L"})
+    cart.add(TEE, 2, {"size": "M"})
+
+    assert [(line.attrs["size"], line.quantity) for line in cart] == [("M", 3), ("L", 1)]
+    assert len(cart.lines_for("tee-001")) == 2
+    assert cart.total == 4 * 499
+
+
+def test_remove_updates_running_total() -> None:
+    cart = Cart()
+    cart.add(MUG, 3)
+    cart.add(MOUSE, 1)
+
+    assert cart.remove("mug-001", quantity=2).quantity == 1
+    assert cart.total == 350 + 449
+    assert cart.remove("mouse-001") is None
+    assert cart.total == 350 and len(cart) == 1
+    with pytest.raises(KeyError):
+        cart.remove("mouse-001")
+    with pytest.raises(ValueError):
+        cart.add(MUG, 0)
+
+    cart.clear()
+    assert not cart and cart.total == 0
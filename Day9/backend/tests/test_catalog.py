@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from catalog import CatalogIndex, category_from_query, normalize_category, price_line_items
+
+CATEGORIES = ["mug", "bottle", "electronics", "home", "accessories", "kitchen", "mobile", "tshirt"]
+COLORS = ["white", "black", "blue", "red", None]
+WORDS = ["steel", "ceramic", "wireless", "compact", "cotton", "smart", "classic", "travel"]
+
+
+def _catalog(n, seed=7):
+    rng = random.Random(seed)
+    products = []
+    for i in range(n):
+        words = rng.sample(WORDS, 2)
+        products.append({
+            "id": f"p-{i}",
+            "name": f"{words[0].title()} {rng.choice(CATEGORIES).title()}",
+            "description": f"A {words[1]} item for daily use.",
+            "price": rng.randrange(100, 5000),
+            "currency": "INR",
+            "category": rng.choice(CATEGORIES),
+            "color": rng.choice(COLORS),
+            "sizes": rng.sample(["S", "M", "L"], rng.randrange(0, 3)),
+        })
+    return products
+
+
+def _naive(products, category=None, color=None, size=None, lo=None, hi=None):
+    out = []
+    for p in products:
+        if category and p["category"] != category and category not in p["category"] and p["category"] not in category:
+            continue
+        if color and p["color"] and p["color"] != color:
+            continue
+        if size and size not in p["sizes"]:
+            continue
+        if lo is not None and p["price"] < lo:
+            continue
+        if hi is not None and p["price"] > hi:
+            continue
+        out.append(p)
+    return out
+
+
+def test_category_aliases() -> None:
+    assert normalize_category("Phones") == "mobile"
+    assert normalize_category("tee") == "tshirt"
+    assert normalize_category("Mug") == "mug"
+    assert category_from_query("cheap mobile phones") == "mobile"
+    assert category_from_query("coffee mug") is None
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {},
+        {"category": "mug"},
+        {"color": "black"},
+        {"size": "M"},
+        {"lo": 500, "hi": 1500},
+        {"category": "electronics", "color": "black", "hi": 2000},
+        {"category": "tshirt", "size": "L", "lo": 1000},
+    ],
+)
+def test_search_matches_full_scan(filters) -> None:
+    products = _catalog(3000)
+    index = CatalogIndex(products)
+
+    got = index.search(
+        category=filters.get("category"),
+        color=filters.get("color"),
+        size=filters.get("size"),
+        min_price=filters.get("lo"),
+        max_price=filters.get("hi"),
+    )
+
+    assert got == _naive(products, **filters)
+
+
+def test_text_query_intersects_tokens() -> None:
+    index = CatalogIndex([
+        {"id": "a", "name": "Steel Water Bottle", "description": "Double wall bottle.", "price": 599},
+        {"id": "b", "name": "Ceramic Coffee Mug", "description": "For hot drinks.", "price": 350},
+        {"id": "c", "name": "Steel Mug", "description": "Camping mug.", "price": 299},
+    ])
+
+    assert [p["id"] for p in index.search(q="steel")] == ["a", "c"]
+    assert [p["id"] for p in index.search(q="steel mugs")] == ["c"]
+    assert [p["id"] for p in index.search(q="steel", max_price="400")] == ["c"]
+    assert index.search(q="laptop") == []
+
+
+def test_id_map_returns_read_only_records() -> None:
+    index = CatalogIndex(_catalog(50))
+
+    prod = index.get("p-7")
+
+    assert prod.id == "p-7" and prod.price == index.products[7]["price"]
+    assert isinstance(prod.sizes, tuple)
+    assert index.get("missing") is None
+    with pytest.raises(AttributeError):
+        prod.price = 1
+    with pytest.raises(TypeError):
+        index.by_id["p-7"] = prod
+
+
+def test_price_line_items() -> None:
+    index = CatalogIndex([
+        {"id": "mug-001", "name": "Mug", "price": 350},
+        {"id": "cap-001", "name": "Cap", "price": 499},
+    ])
+    cart = [
+        {"product_id": "mug-001", "quantity": 2, "attrs": {}},
+        {"product_id": "gone-001", "quantity": 1},
+        {"product_id": "cap-001", "quantity": "3", "attrs": {"size": "M"}},
+    ]
+
+    items, total = price_line_items(index, cart, skip_missing=True)
+
+    assert total == 350 * 2 + 499 * 3
+    assert [(it["product_id"], it["quantity"], it["line_total"]) for it in items] == [
+        ("mug-001", 2, 700), ("cap-001", 3, 1497),
+    ]
+    with pytest.raises(ValueError):
+        price_line_items(index, cart)
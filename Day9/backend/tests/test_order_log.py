@@ -0,0 +1,124 @@
+import json
+
+import pytest
+
+from order_log import OrderLog
+
+
+def _order(i):
+    return {"id": f"order-{i}", "items": [], "total": i, "currency": "INR", "created_at": f"2025-01-01T00:00:{i:02d}Z"}
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "orders.jsonl")
+
+
+def test_append_and_read_back(log_path) -> None:
+    log = OrderLog(log_path, tail_cache=3)
+    assert log.last() is None and len(log) == 0
+
+    seqs = [log.append(_order(i)) for i in range(10)]
+
+    assert seqs == list(range(10))
+    assert log.last()["id"] == "order-9"
+    assert [o["id"] for o in log.tail(2)] == ["order-8", "order-9"]
+    assert [o["id"] for o in log.tail(5)] == [f"order-{i}" for i in range(5, 10)]
+    assert log.get(3)["total"] == 3
+    assert [o["total"] for o in log] == list(range(10))
+    log.close()
+
+    reopened = OrderLog(log_path, tail_cache=3)
+    assert len(reopened) == 10 and reopened.last()["id"] == "order-9"
+    reopened.close()
+
+
+def test_migrates_legacy_json_array_once(tmp_path, log_path) -> None:
+    legacy = tmp_path / "orders.json"
+    legacy.write_text(json.dumps([_order(1), _order(2)], indent=2))
+
+    log = OrderLog(log_path, legacy_path=str(legacy))
+    log.append(_order(3))
+    log.close()
+    again = OrderLog(log_path, legacy_path=str(legacy))
+
+    assert [o["id"] for o in again] == ["order-1", "order-2", "order-3"]
+    assert json.loads(legacy.read_text())[0]["id"] == "order-1"  # legacy file untouched
+    again.close()
+
+
+def test_sees_other_writers_and_drops_torn_tail(log_path) -> None:
+    a = OrderLog(log_path)
+    b = OrderLog(log_path)
+    a.append(_order(1))
+    b.append(_order(2))
+    assert a.last()["id"] == "order-2"
+    with open(log_path, "ab") as f:
+        f.write(b'{"id": "order-tor')  # crashed writer
+
+    assert a.append(_order(3)) == 2
+    assert [o["id"] for o in OrderLog(log_path)] == ["order-1", "order-2", "order-3"]
+    a.close()
+    b.close()
+
+
+
+def test_skips_undecodable_lines(log_path) -> None:
+    with open(log_path, "w") as f:
+        f.write(json.dumps(_order(1)) + "\n" + '{"id": "order-2", "items": [\n' + "7\n" + json.dumps(_order(3)) + "\n")
+
+    log = OrderLog(log_path)
+    assert [o["id"] for o in log] == ["order-1", "order-3"]
+    assert log.get(1)["id"] == "order-3"
+    assert log.append(_order(4)) == 2
+    assert [o["id"] for o in OrderLog(log_path, tail_cache=1)] == ["order-1", "order-3", "order-4"]
+    log.close()
+
+def _customer_order(i, name, day, products):
+    return {
+        "id": f"order-{i}",
+        "items": [{"product_id": pid, "quantity": 1} for pid in products],
+        "total": i,
+        "currency": "INR",
+        "created_at": f"2025-03-{day:02d}T12:00:00Z",
+        "customer_name": name,
+    }
+
+
+def test_customer_history_queries(log_path) -> None:
+    log = OrderLog(log_path, tail_cache=2)
+    log.append(_customer_order(1, "Asha", 1, ["mug-001"]))
+    log.append(_customer_order(2, "Ravi", 2, ["mug-001"]))
+    log.append(_customer_order(3, "asha ", 5, ["cap-001", "mug-001"]))
+    log.append(_customer_order(4, "Asha", 9, ["cap-001"]))
+    log.append(_customer_order(5, None, 10, ["mug-001"]))
+
+    def ids(orders):
+        return [o["id"] for o in orders]
+
+    assert ids(log.customer_orders("ASHA")) == ["order-4", "order-3", "order-1"]
+    assert ids(log.customer_orders("Asha", limit=1)) == ["order-4"]
+    assert ids(log.customer_orders("Asha", since="2025-03-02", until="2025-03-08")) == ["order-3"]
+    assert ids(log.customer_orders("Asha", product_id="mug-001")) == ["order-3", "order-1"]
+    assert ids(log.customer_orders("Asha", product_id="cap-001", until="2025-03-06")) == ["order-3"]
+    assert log.customer_orders("Nobody") == [] and log.customer_orders(None) == []
+    assert log.customer_order_count("ravi") == 1
+    with pytest.raises(ValueError):
+        log.customer_orders("Asha", until="last week")  # not the epoch, which would match nothing
+    log.close()
+
+
+def test_legacy_migration_streams_and_keys_customers(tmp_path, log_path) -> None:
+    legacy = tmp_path / "orders.json"
+    legacy.write_text(json.dumps([_customer_order(i, "Asha" if i % 2 else None, 1 + i % 28, ["mug-001"])
+                                  for i in range(200)], indent=2))
+
+    log = OrderLog(log_path, legacy_path=str(legacy))
+
+    assert len(log) == 200
+    assert log.customer_order_count("asha") == 100
+    with open(log_path) as f:
+        first, second = json.loads(f.readline()), json.loads(f.readline())
+    assert "customer_key" not in first
+    assert second["customer_key"] == "asha"
+    log.close()
@@ -0,0 +1,64 @@
+import pytest
+
+from catalog import CatalogIndex
+from resolver import parse_ordinal, resolve_reference
+
+PRODUCTS = [
+    {"id": "mug-001", "name": "Ceramic Coffee Mug", "price": 350, "category": "mug", "color": "white"},
+    {"id": "bottle-001", "name": "Steel Water Bottle", "price": 599, "category": "bottle", "color": "silver"},
+    {"id": "mug-002", "name": "Travel Mug", "price": 450, "category": "mug", "color": "black"},
+    {"id": "bottle-002", "name": "Sports Bottle", "price": 299, "category": "bottle", "color": "black"},
+    {"id": "tee-001", "name": "Cotton Tee", "price": 499, "category": "tshirt", "color": "blue", "sizes": ["M"]},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return CatalogIndex(PRODUCTS)
+
+
+def test_parse_ordinal() -> None:
+    assert parse_ordinal(["the", "second", "one"]) == (1, ["the", "one"])
+    assert parse_ordinal(["item", "3"]) == (2, ["item"])
+    assert parse_ordinal(["last", "mug"]) == (-1, ["mug"])
+    assert parse_ordinal(["black", "bottle"]) == (None, ["black", "bottle"])
+
+
+def test_ordinal_follows_the_list_last_shown(index) -> None:
+    shown = ["bottle-002", "bottle-001"]  # e.g. cheapest-first bottles
+
+    assert resolve_reference(index, "the second one", shown).id == "bottle-001"
+    assert resolve_reference(index, "first", shown).id == "bottle-002"
+    assert resolve_reference(index, "the last one", shown).id == "bottle-001"
+    # Without a shown list, ordinals index the catalog as before.
+    assert resolve_reference(index, "the second one").id == "bottle-001"
+    assert resolve_reference(index, "the third one").id == "mug-002"
+
+
+def test_ordinal_beyond_shown_list_is_unresolved(index) -> None:
+    assert resolve_reference(index, "the fourth one", ["mug-001", "mug-002"]) is None
+
+
+def test_descriptors_narrow_before_ordinal(index) -> None:
+    shown = ["mug-001", "bottle-001", "mug-002", "bottle-002"]
+
+    assert resolve_reference(index, "the second mug", shown).id == "mug-002"
+    assert resolve_reference(index, "the black bottle", shown).id == "bottle-002"
+    assert resolve_reference(index, "the black one", shown).id == "mug-002"
+
+
+def test_ordinal_with_unshown_product_falls_back_to_catalog(index) -> None:
+    shown = ["mug-001", "bottle-001"]
+
+    assert resolve_reference(index, "second lamp", shown) is None
+    assert resolve_reference(index, "the second tee", shown) is None  # only one tee in the catalog
+    assert resolve_reference(index, "first cotton tee", shown).id == "tee-001"
+    assert resolve_reference(index, "the second item", shown).id == "bottle-001"
+
+
+def test_ids_names_and_category_aliases(index) -> None:
+    assert resolve_reference(index, "MUG-002", ["bottle-001"]).id == "mug-002"
+    assert resolve_reference(index, "the cotton tee").id == "tee-001"
+    assert resolve_reference(index, "a t-shirt").id == "tee-001"
+    assert resolve_reference(index, "something unrelated", ["mug-001"]) is None
+    assert resolve_reference(index, "", ["mug-001"]) is None
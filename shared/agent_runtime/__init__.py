@@ -0,0 +1,64 @@
+"""
+Shared runtime for the DayN voice agents
+
+- session: VoiceConfig, prewarm, build_session and start_session replace the
+  pipeline setup every day used to copy
+- storage: configured SQLite connections, a locked store base class and
+  atomic JSON file writes
+- metrics: one metrics_collected handler per session with a usage summary at
+  shutdown and listeners for per-day accounting
+- models: the per-process model registry (VAD, turn detector, noise
+  cancellation) with readiness checks, and per-job cold/warm startup timings
+- latency: per-turn latency waterfalls (EOU, STT, LLM TTFT, tools, TTS TTFB)
+  and rolling per-agent stage percentiles
+- telemetry: the process metrics registry (lock-free recording) and its
+  Prometheus text endpoint
+- batching: a micro-batching inference broker and a Silero VAD whose streams
+  share it
+- fakes: scripted offline STT, LLM and TTS plugins for tests and load runs
+  (import from agent_runtime.fakes)
+- toolbench: the harness behind each day's benchmarks/bench_tools.py (ops/sec,
+  allocations, JSON baselines)
+- watchdog: per-loop stall detection with the offending stack, attributed
+  to the function tool that blocked the loop
+- loadgen: N simulated sessions in one process against a local room
+  stand-in, with throughput, turn latency, loop lag and RSS per run
+
+Each day's agent.py puts the repo's `shared/` directory on sys.path and keeps
+only its Agent, tools and data.
+"""
+
+from .latency import TURN_LATENCY, LatencyStats, TurnTracer
+from .metrics import SessionMetrics, attach_metrics
+from .models import MODELS, STARTUPS, ModelRegistry
+from .session import VoiceConfig, build_session, prewarm, start_session
+from .storage import (
+    SqliteStore,
+    append_json_record,
+    connect,
+    read_json,
+    write_json_atomic,
+)
+from .telemetry import METRICS, MetricsRegistry
+
+__all__ = [
+    "METRICS",
+    "MODELS",
+    "STARTUPS",
+    "TURN_LATENCY",
+    "LatencyStats",
+    "MetricsRegistry",
+    "ModelRegistry",
+    "SessionMetrics",
+    "SqliteStore",
+    "TurnTracer",
+    "VoiceConfig",
+    "append_json_record",
+    "attach_metrics",
+    "build_session",
+    "connect",
+    "prewarm",
+    "read_json",
+    "start_session",
+    "write_json_atomic",
+]
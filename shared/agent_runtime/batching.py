@@ -0,0 +1,174 @@
+"""
+Shared runtime – Micro-batched local inference
+
+With many sessions in one worker (the router runs jobs on the thread
+executor), every session's Silero VAD used to run its own tiny ONNX call per
+32 ms window. The per-call overhead dominates at batch size 1; the model
+accepts a batch dimension, so:
+- InferenceBroker collects requests from all sessions and runs them as one
+  batch on a small thread pool; a request waits at most `max_wait_s` (the
+  latency budget) for company, and a full batch goes out immediately
+- BatchedVAD is a drop-in silero.VAD whose streams keep their own audio
+  context but send the model call through the broker. Like the plugin's
+  OnnxModel, which stores the returned RNN state but always feeds its initial
+  one, every window runs from the initial state, so speech probabilities (and
+  so the activation thresholds' behaviour) are identical to the unbatched VAD
+
+The turn detector is not batched here: it already runs in LiveKit's shared
+inference process, which serializes end-of-turn requests from every session of
+the worker.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("agent_runtime")
+
+# Budget a VAD window may wait for other sessions' windows (a window is 32 ms).
+VAD_MAX_WAIT_S = 0.004
+VAD_MAX_BATCH = 64
+
+
+class InferenceBroker:
+    """Runs `run_batch(items) -> results` over requests submitted from any thread."""
+
+    def __init__(self, run_batch: Callable[[List[Any]], List[Any]], max_batch: int = 32,
+                 max_wait_s: float = 0.005, workers: int = 1, name: str = "inference"):
+        self._run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait_s = max_wait_s
+        self.name = name
+        self._queue: queue.SimpleQueue[Optional[Tuple[Any, Future]]] = queue.SimpleQueue()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-batch")
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        self._collector = threading.Thread(target=self._collect, name=f"{name}-broker", daemon=True)
+        self._collector.start()
+
+    @property
+    def mean_batch(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    def submit(self, item: Any) -> Future:
+        if self._closed:
+            raise RuntimeError(f"{self.name} broker is closed")
+        fut: Future = Future()
+        self._queue.put((item, fut))
+        return fut
+
+    def __call__(self, item: Any) -> Any:
+        """Blocking submit, for callers that already run on a worker thread."""
+        return self.submit(item).result()
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._collector.join()
+            self._pool.shutdown(wait=True)
+
+    def _collect(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait_s
+            stop = False
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    nxt = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                batch.append(nxt)
+            self._pool.submit(self._run, batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[Tuple[Any, Future]]):
+        with self._stats_lock:
+            self.batches += 1
+            self.items += len(batch)
+            self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = self._run_batch([item for item, _ in batch])
+        except Exception as e:
+            for _, fut in batch:
+                fut.set_exception(e)
+            return
+        for (_, fut), result in zip(batch, results):
+            fut.set_result(result)
+
+
+# ---- Silero VAD ----
+def silero_batch_runner(session, sample_rate: int) -> Callable[[List[np.ndarray]], List[float]]:
+    """Batch function for input rows (context + window) -> speech probabilities."""
+    sr = np.array(sample_rate, dtype=np.int64)
+
+    def run(rows):
+        states = np.zeros((2, len(rows), 128), dtype=np.float32)  # the initial state, as the plugin feeds it
+        out, _ = session.run(None, {"input": np.stack(rows), "state": states, "sr": sr})
+        return [float(p) for p in out[:, 0]]
+
+    return run
+
+
+class BrokeredOnnxModel:
+    """Per-stream audio context; the same interface and results as silero's OnnxModel, inference via the broker."""
+
+    def __init__(self, broker: InferenceBroker, sample_rate: int):
+        if sample_rate == 8000:
+            self.window_size_samples, self.context_size = 256, 32
+        elif sample_rate == 16000:
+            self.window_size_samples, self.context_size = 512, 64
+        else:
+            raise ValueError("Silero VAD only supports 8KHz and 16KHz sample rates")
+        self.sample_rate = sample_rate
+        self._broker = broker
+        self._row = np.zeros(self.context_size + self.window_size_samples, dtype=np.float32)
+
+    def reset(self):
+        self._row.fill(0)
+
+    def __call__(self, x: np.ndarray) -> float:
+        row = self._row.copy()
+        row[self.context_size:] = x
+        prob = self._broker(row)
+        # the next window's context is the tail of this one
+        self._row[:self.context_size] = row[-self.context_size:]
+        return prob
+
+
+def load_batched_vad(max_batch: int = VAD_MAX_BATCH, max_wait_s: float = VAD_MAX_WAIT_S, workers: int = 1, **vad_options):
+    """A silero.VAD whose streams share one micro-batching broker."""
+    from livekit.plugins import silero
+    from livekit.plugins.silero.vad import VADStream
+
+    class BatchedVAD(silero.VAD):
+        broker: InferenceBroker
+
+        def stream(self) -> VADStream:
+            stream = VADStream(self, self._opts, BrokeredOnnxModel(self.broker, self._opts.sample_rate))
+            self._streams.add(stream)
+            return stream
+
+    base = silero.VAD.load(**vad_options)
+    vad = BatchedVAD(session=base._onnx_session, opts=base._opts)
+    vad.broker = InferenceBroker(
+        silero_batch_runner(base._onnx_session, base._opts.sample_rate),
+        max_batch=max_batch, max_wait_s=max_wait_s, workers=workers, name="vad",
+    )
+    return vad
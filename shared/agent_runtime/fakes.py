@@ -0,0 +1,312 @@
+"""
+Shared runtime – Offline test doubles for STT, LLM and TTS
+
+Every tests/test_agent.py talked to a hosted LLM, so agent tests needed the
+network, took seconds per turn and could not be benchmarked. These plugins
+are scripted and deterministic, with latencies you choose:
+- FakeLLM replies from a script. It accepts an ordered list of FakeResponse
+  (one per chat() call), keyword rules matched against the last user message,
+  or a default. A response can call function tools, and `then` is the text
+  it answers with once the tool results come back. Text streams word by word
+  after `ttft`
+- FakeSTT is a streaming STT that treats audio above an energy threshold as
+  speech. When a speech segment ends (end_silence_s of quiet), it emits the
+  next canned transcript after `latency`, framed by START/END_OF_SPEECH, so
+  turn_detection="stt" works without a VAD or turn-detector model
+- FakeTTS returns silent PCM sized to the text (chars / chars_per_second)
+  after `ttfb`
+- utterance_frames() builds the audio to push into FakeSTT
+
+They go wherever the real plugins go: AgentSession(stt=..., llm=..., tts=...).
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+from livekit import rtc
+from livekit.agents import (
+    DEFAULT_API_CONNECT_OPTIONS,
+    APIConnectOptions,
+    NotGivenOr,
+    llm,
+    stt,
+    tts,
+    utils,
+)
+from livekit.agents.types import NOT_GIVEN
+
+STT_SAMPLE_RATE = 16000
+TTS_SAMPLE_RATE = 24000
+
+
+# ---- LLM ----
+@dataclass
+class FakeToolCall:
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class FakeResponse:
+    text: str = ""
+    tool_calls: List[FakeToolCall] = field(default_factory=list)
+    then: Optional[str] = None  # reply after the tool results; "{output}" is replaced by them
+    ttft: Optional[float] = None  # overrides FakeLLM.ttft
+    when: Optional[str] = None  # rules only: case-insensitive substring of the user message
+
+
+ScriptEntry = Union[str, FakeResponse]
+ToolList = List[Union[llm.FunctionTool, llm.RawFunctionTool]]
+
+
+def _as_response(entry: ScriptEntry) -> FakeResponse:
+    return FakeResponse(text=entry) if isinstance(entry, str) else entry
+
+
+class FakeLLM(llm.LLM):
+    def __init__(self, script: Sequence[ScriptEntry] = (), rules: Sequence[FakeResponse] = (),
+                 default: ScriptEntry = "Okay.", ttft: float = 0.0, chunk_delay: float = 0.0):
+        super().__init__()
+        self._script = [_as_response(e) for e in script]
+        self._rules = list(rules)
+        self._default = _as_response(default)
+        self.ttft = ttft
+        self.chunk_delay = chunk_delay
+        self._pending: Dict[str, FakeResponse] = {}  # call_id -> response awaiting its tool output
+        self._calls = 0
+        self.requests: List[str] = []  # last user message of every chat() call
+
+    @property
+    def model(self) -> str:
+        return "fake"
+
+    @property
+    def provider(self) -> str:
+        return "fake"
+
+    def _next_call_id(self) -> str:
+        self._calls += 1
+        return f"fake_call_{self._calls}"
+
+    def respond(self, chat_ctx: llm.ChatContext) -> FakeResponse:
+        """The scripted response (with concrete text) for this chat context."""
+        items = chat_ctx.items
+        user = next((i.text_content or "" for i in reversed(items) if i.type == "message" and i.role == "user"), "")
+        self.requests.append(user)
+        if items and items[-1].type == "function_call_output":
+            outputs = []
+            source = None
+            for item in reversed(items):
+                if item.type != "function_call_output":
+                    break
+                outputs.append(item.output)
+                source = self._pending.pop(item.call_id, source)
+            if source is not None and source.then is not None:
+                return FakeResponse(text=source.then.replace("{output}", " ".join(reversed(outputs))), ttft=source.ttft)
+            if not self._script:
+                return FakeResponse(text=" ".join(reversed(outputs)))
+        if self._script:
+            return self._script.pop(0)
+        lowered = user.lower()
+        for rule in self._rules:
+            if rule.when and rule.when.lower() in lowered:
+                return rule
+        return self._default
+
+    def chat(self, *, chat_ctx: llm.ChatContext, tools: Optional[ToolList] = None,
+             conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS,
+             parallel_tool_calls: NotGivenOr[bool] = NOT_GIVEN, tool_choice: NotGivenOr[Any] = NOT_GIVEN,
+             extra_kwargs: NotGivenOr[Dict[str, Any]] = NOT_GIVEN) -> "FakeLLMStream":
+        return FakeLLMStream(self, chat_ctx=chat_ctx, tools=tools or [], conn_options=conn_options)
+
+
+class FakeLLMStream(llm.LLMStream):
+    def __init__(self, fake: FakeLLM, *, chat_ctx: llm.ChatContext, tools: ToolList,
+                 conn_options: APIConnectOptions):
+        super().__init__(fake, chat_ctx=chat_ctx, tools=tools, conn_options=conn_options)
+        self._fake = fake
+
+    async def _run(self) -> None:
+        fake = self._fake
+        response = fake.respond(self._chat_ctx)
+        request_id = utils.shortuuid("fake_")
+        ttft = fake.ttft if response.ttft is None else response.ttft
+        if ttft > 0:
+            await asyncio.sleep(ttft)
+        words = response.text.split(" ") if response.text else []
+        for i, word in enumerate(words):
+            if i and fake.chunk_delay > 0:
+                await asyncio.sleep(fake.chunk_delay)
+            delta = word if i == 0 else " " + word
+            self._event_ch.send_nowait(llm.ChatChunk(id=request_id, delta=llm.ChoiceDelta(role="assistant", content=delta)))
+        if response.tool_calls:
+            calls = []
+            for call in response.tool_calls:
+                call_id = fake._next_call_id()
+                if response.then is not None:
+                    fake._pending[call_id] = response
+                calls.append(llm.FunctionToolCall(name=call.name, arguments=json.dumps(call.arguments), call_id=call_id))
+            self._event_ch.send_nowait(llm.ChatChunk(id=request_id, delta=llm.ChoiceDelta(role="assistant", tool_calls=calls)))
+        prompt = sum(len((i.text_content or "").split()) for i in self._chat_ctx.items if i.type == "message")
+        self._event_ch.send_nowait(llm.ChatChunk(id=request_id, usage=llm.CompletionUsage(
+            completion_tokens=len(words), prompt_tokens=prompt, total_tokens=prompt + len(words),
+        )))
+
+
+# ---- STT ----
+class FakeSTT(stt.STT):
+    def __init__(self, transcripts: Union[Sequence[str], Callable[[int], str]] = ("hello",),
+                 latency: float = 0.0, end_silence_s: float = 0.3, energy_threshold: float = 0.01,
+                 language: str = "en"):
+        super().__init__(capabilities=stt.STTCapabilities(streaming=True, interim_results=False))
+        self._transcripts = transcripts
+        self.latency = latency
+        self.end_silence_s = end_silence_s
+        self.energy_threshold = energy_threshold
+        self.language = language
+        self._utterances = 0
+
+    @property
+    def model(self) -> str:
+        return "fake"
+
+    @property
+    def provider(self) -> str:
+        return "fake"
+
+    def next_transcript(self) -> str:
+        n = self._utterances
+        self._utterances += 1
+        if callable(self._transcripts):
+            return self._transcripts(n)
+        return self._transcripts[n % len(self._transcripts)] if self._transcripts else ""
+
+    def _final(self, text: str, request_id: str = "") -> stt.SpeechEvent:
+        return stt.SpeechEvent(
+            type=stt.SpeechEventType.FINAL_TRANSCRIPT, request_id=request_id,
+            alternatives=[stt.SpeechData(language=self.language, text=text, confidence=1.0)],
+        )
+
+    async def _recognize_impl(self, buffer, *, language: NotGivenOr[str] = NOT_GIVEN,
+                              conn_options: APIConnectOptions) -> stt.SpeechEvent:
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        return self._final(self.next_transcript())
+
+    def stream(self, *, language: NotGivenOr[str] = NOT_GIVEN,
+               conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> "FakeRecognizeStream":
+        return FakeRecognizeStream(self, conn_options=conn_options)
+
+
+class FakeRecognizeStream(stt.RecognizeStream):
+    def __init__(self, fake: FakeSTT, *, conn_options: APIConnectOptions):
+        super().__init__(stt=fake, conn_options=conn_options)
+        self._fake = fake
+
+    async def _run(self) -> None:
+        fake = self._fake
+        speaking = False
+        quiet = 0.0
+        audio = 0.0
+        request_id = utils.shortuuid("fake_")
+
+        async def end_of_speech():
+            if fake.latency > 0:
+                await asyncio.sleep(fake.latency)
+            self._event_ch.send_nowait(fake._final(fake.next_transcript(), request_id))
+            self._event_ch.send_nowait(stt.SpeechEvent(type=stt.SpeechEventType.END_OF_SPEECH, request_id=request_id))
+            self._event_ch.send_nowait(stt.SpeechEvent(
+                type=stt.SpeechEventType.RECOGNITION_USAGE, request_id=request_id,
+                recognition_usage=stt.RecognitionUsage(audio_duration=audio),
+            ))
+
+        async for item in self._input_ch:
+            if isinstance(item, self._FlushSentinel):
+                if speaking:
+                    speaking = False
+                    await end_of_speech()
+                    audio = 0.0
+                continue
+            duration = item.samples_per_channel / item.sample_rate
+            audio += duration
+            samples = np.frombuffer(item.data, dtype=np.int16)
+            loud = samples.size > 0 and float(np.sqrt(np.mean((samples / 32768.0) ** 2))) > fake.energy_threshold
+            if loud:
+                quiet = 0.0
+                if not speaking:
+                    speaking = True
+                    self._event_ch.send_nowait(stt.SpeechEvent(type=stt.SpeechEventType.START_OF_SPEECH, request_id=request_id))
+            elif speaking:
+                quiet += duration
+                if quiet >= fake.end_silence_s:
+                    speaking = False
+                    await end_of_speech()
+                    audio = 0.0
+
+
+def utterance_frames(speech_s: float, silence_s: float = 0.5, sample_rate: int = STT_SAMPLE_RATE,
+                     frame_ms: int = 10, amplitude: float = 0.2) -> List[rtc.AudioFrame]:
+    """A 220 Hz tone for `speech_s` followed by `silence_s` of silence, in `frame_ms` frames."""
+    per_frame = sample_rate * frame_ms // 1000
+    frames = []
+    n_speech = round(speech_s * 1000 / frame_ms)
+    n_total = n_speech + round(silence_s * 1000 / frame_ms)
+    t = np.arange(per_frame) / sample_rate
+    tone = (np.sin(2 * np.pi * 220 * t) * amplitude * 32767).astype(np.int16).tobytes()
+    silence = bytes(per_frame * 2)
+    for i in range(n_total):
+        frames.append(rtc.AudioFrame(tone if i < n_speech else silence, sample_rate, 1, per_frame))
+    return frames
+
+
+# ---- TTS ----
+class FakeTTS(tts.TTS):
+    def __init__(self, ttfb: float = 0.0, chars_per_second: float = 15.0, sample_rate: int = TTS_SAMPLE_RATE):
+        super().__init__(capabilities=tts.TTSCapabilities(streaming=False), sample_rate=sample_rate, num_channels=1)
+        self.ttfb = ttfb
+        self.chars_per_second = chars_per_second
+        self.spoken: List[str] = []
+
+    @property
+    def model(self) -> str:
+        return "fake"
+
+    @property
+    def provider(self) -> str:
+        return "fake"
+
+    def synthesize(self, text: str, *, conn_options: APIConnectOptions = DEFAULT_API_CONNECT_OPTIONS) -> "FakeChunkedStream":
+        return FakeChunkedStream(tts=self, input_text=text, conn_options=conn_options)
+
+
+class FakeChunkedStream(tts.ChunkedStream):
+    async def _run(self, output_emitter: tts.AudioEmitter) -> None:
+        fake: FakeTTS = self._tts  # type: ignore[assignment]
+        fake.spoken.append(self._input_text)
+        output_emitter.initialize(
+            request_id=utils.shortuuid("fake_"), sample_rate=fake.sample_rate, num_channels=1, mime_type="audio/pcm",
+        )
+        if fake.ttfb > 0:
+            await asyncio.sleep(fake.ttfb)
+        seconds = max(len(self._input_text), 1) / fake.chars_per_second
+        remaining = int(seconds * fake.sample_rate)
+        chunk = fake.sample_rate // 10  # 100 ms
+        while remaining > 0:
+            n = min(chunk, remaining)
+            output_emitter.push(bytes(n * 2))
+            remaining -= n
+        output_emitter.flush()
+
+
+def fake_plugins(script: Sequence[ScriptEntry] = (), rules: Sequence[FakeResponse] = (),
+                 transcripts: Iterable[str] = ("hello",), llm_ttft: float = 0.0, stt_latency: float = 0.0,
+                 tts_ttfb: float = 0.0) -> Dict[str, Any]:
+    """stt/llm/tts keyword arguments for AgentSession."""
+    return {
+        "stt": FakeSTT(list(transcripts), latency=stt_latency),
+        "llm": FakeLLM(script, rules=rules, ttft=llm_ttft),
+        "tts": FakeTTS(ttfb=tts_ttfb),
+    }
@@ -0,0 +1,294 @@
+"""
+Shared runtime – Per-turn latency waterfall
+
+metrics_collected reports each stage on its own: EOU and transcription delay,
+LLM TTFT and TTS TTFB, tied together only by a speech id. Tool execution is
+not a metric at all. TurnTracer reassembles them into turns:
+- a user turn opens at its EOUMetrics. The end of user speech is taken as the
+  emit time minus the EOU and on_user_turn_completed delays. LLM and TTS
+  metrics with the same speech id join that turn, and so do the tool spans
+  from function_tools_executed and the follow-up generation that answers the
+  tool results (which has a new speech id)
+- metrics for a speech id that no turn owns (the greeting, session.say) open
+  an agent-initiated turn
+- a turn closes when the next one opens or when the session ends. Its
+  waterfall (each stage as offset + duration from the end of user speech) is
+  logged, and its stage latencies go into the agent's rolling histograms
+- LatencyStats keeps, per agent and per stage, a fixed-size log-bucket
+  histogram over the most recent samples, for rolling p50/p95/p99
+
+STT latency is the transcription delay. It overlaps the EOU stage (the
+end-of-turn decision waits for the final transcript), so it is reported but
+never counted as the dominant stage.
+"""
+
+import bisect
+import logging
+import math
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional
+
+from livekit.agents import FunctionToolsExecutedEvent, metrics
+
+logger = logging.getLogger("agent_runtime")
+
+STAGES = ("stt", "eou", "on_user_turn", "llm_ttft", "tool", "tts_ttfb", "total")
+# Stages that run one after another between the end of user speech and first audio.
+CRITICAL_PATH = ("eou", "on_user_turn", "llm_ttft", "tool", "tts_ttfb")
+
+STAGE_WINDOW = 1000  # samples per stage histogram
+# ~5% wide buckets from 1 ms to ~2 min; percentiles are reported as bucket upper bounds
+BUCKET_BOUNDS = [0.001 * 1.05 ** i for i in range(int(math.log(120_000) / math.log(1.05)) + 1)]
+
+
+class RollingHistogram:
+    """Bucket counts over the last `window` samples; fixed memory, O(1) record."""
+
+    def __init__(self, window: int = STAGE_WINDOW):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self._recent: Deque[int] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._recent)
+
+    def record(self, seconds: float):
+        i = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        if len(self._recent) == self._recent.maxlen:
+            self.counts[self._recent[0]] -= 1
+        self._recent.append(i)
+        self.counts[i] += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        n = len(self._recent)
+        if not n:
+            return None
+        rank = max(1, math.ceil(q * n))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return BUCKET_BOUNDS[min(i, len(BUCKET_BOUNDS) - 1)]
+        return BUCKET_BOUNDS[-1]
+
+
+class LatencyStats:
+    """Rolling per-stage histograms for every agent in the process."""
+
+    def __init__(self, window: int = STAGE_WINDOW):
+        self.window = window
+        self._agents: Dict[str, Dict[str, RollingHistogram]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, agent: str, latencies: Dict[str, float]):
+        with self._lock:
+            stages = self._agents.setdefault(agent, {})
+            for stage, value in latencies.items():
+                hist = stages.get(stage)
+                if hist is None:
+                    hist = stages[stage] = RollingHistogram(self.window)
+                hist.record(value)
+
+    def agents(self) -> List[str]:
+        return sorted(self._agents)
+
+    def percentiles(self, agent: str) -> Dict[str, Dict[str, float]]:
+        """stage -> {"count", "p50", "p95", "p99"} in seconds."""
+        with self._lock:
+            stages = dict(self._agents.get(agent, {}))
+            return {
+                stage: {"count": len(h), "p50": h.percentile(0.50), "p95": h.percentile(0.95), "p99": h.percentile(0.99)}
+                for stage, h in sorted(stages.items(), key=lambda kv: STAGES.index(kv[0]) if kv[0] in STAGES else 99)
+            }
+
+    def dominant(self, agent: str, q: str = "p50") -> Optional[str]:
+        """The critical-path stage with the largest rolling percentile."""
+        stats = self.percentiles(agent)
+        candidates = [(stats[s][q], s) for s in CRITICAL_PATH if s in stats and stats[s][q] is not None]
+        return max(candidates)[1] if candidates else None
+
+    def describe(self, agent: str) -> str:
+        parts = [
+            f"{stage} p50={v['p50'] * 1000:.0f} p95={v['p95'] * 1000:.0f} p99={v['p99'] * 1000:.0f}ms (n={v['count']})"
+            for stage, v in self.percentiles(agent).items()
+        ]
+        return f"{agent} turn latency: " + "; ".join(parts) + f"; dominant={self.dominant(agent)}"
+
+    def reset(self):
+        with self._lock:
+            self._agents.clear()
+
+
+TURN_LATENCY = LatencyStats()
+
+
+# ---- per-turn waterfall ----
+@dataclass
+class Span:
+    stage: str
+    start: float  # wall clock (time.time), like the metrics' timestamps
+    duration: float
+    label: str = ""
+
+
+@dataclass
+class TurnWaterfall:
+    turn_id: str
+    user_turn: bool
+    anchor: float  # end of user speech, or the first span's start for agent turns
+    spans: List[Span] = field(default_factory=list)
+    speech_ids: List[str] = field(default_factory=list)
+    awaiting_tool_reply: bool = False
+
+    def add(self, span: Span):
+        self.spans.append(span)
+        if not self.user_turn:
+            self.anchor = min(self.anchor, span.start)
+
+    def perceived(self) -> Optional[float]:
+        """End of user speech (or turn start) to the first synthesized audio."""
+        firsts = [s.start + s.duration for s in self.spans if s.stage == "tts_ttfb"]
+        return min(firsts) - self.anchor if firsts else None
+
+    def stage_latencies(self) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        tools = [s for s in self.spans if s.stage == "tool"]
+        for s in self.spans:
+            if s.stage == "tool":
+                continue
+            if s.stage == "tts_ttfb" and "tts_ttfb" in out:
+                continue  # only the first audio is user-perceived
+            out[s.stage] = out.get(s.stage, 0.0) + s.duration  # llm_ttft adds up across tool rounds
+        if tools:
+            # parallel tools overlap; count the wall time they held the turn
+            out["tool"] = max(s.start + s.duration for s in tools) - min(s.start for s in tools)
+        total = self.perceived()
+        if total is not None:
+            out["total"] = total
+        return out
+
+    def dominant(self) -> Optional[str]:
+        lat = self.stage_latencies()
+        candidates = [(lat[s], s) for s in CRITICAL_PATH if s in lat]
+        return max(candidates)[1] if candidates else None
+
+    def format(self) -> str:
+        total = self.perceived()
+        head = f"turn {self.turn_id} ({'user' if self.user_turn else 'agent'})"
+        if total is not None:
+            head += f" {total * 1000:.0f}ms to first audio"
+        head += f", dominant {self.dominant()}"
+        rows = [
+            f"{s.stage}{' ' + s.label if s.label else ''} {(s.start - self.anchor) * 1000:+.0f}ms {s.duration * 1000:.0f}ms"
+            for s in sorted(self.spans, key=lambda s: s.start)
+        ]
+        return " | ".join([head, *rows])
+
+
+class TurnTracer:
+    """Correlates one session's metrics and tool events into per-turn waterfalls."""
+
+    def __init__(self, agent: str, prefix: Optional[str] = None, stats: LatencyStats = TURN_LATENCY,
+                 log_turns: bool = True, history: int = 20,
+                 on_close: Optional[Callable[["TurnWaterfall"], None]] = None):
+        self.agent = agent
+        self.on_close = on_close
+        self.prefix = prefix or agent
+        self.stats = stats
+        self.log_turns = log_turns
+        self.recent: Deque[TurnWaterfall] = deque(maxlen=history)
+        self._current: Optional[TurnWaterfall] = None
+        self._by_speech: Dict[str, TurnWaterfall] = {}
+        self._closed_ids: Deque[str] = deque(maxlen=64)  # late metrics of closed turns are dropped
+        self._turns = 0
+
+    @property
+    def current(self) -> Optional[TurnWaterfall]:
+        return self._current
+
+    def _open(self, user_turn: bool, anchor: float) -> TurnWaterfall:
+        self._close_current()
+        self._turns += 1
+        self._current = TurnWaterfall(f"{self.prefix}-{self._turns}", user_turn, anchor)
+        return self._current
+
+    def _claim(self, turn: TurnWaterfall, speech_id: Optional[str]):
+        if speech_id and speech_id not in self._by_speech:
+            self._by_speech[speech_id] = turn
+            turn.speech_ids.append(speech_id)
+
+    def _turn_for(self, speech_id: Optional[str], start: float) -> Optional[TurnWaterfall]:
+        turn = self._by_speech.get(speech_id) if speech_id else None
+        if turn is not None:
+            return turn
+        if speech_id in self._closed_ids:
+            return None
+        cur = self._current
+        if cur is not None and (cur.awaiting_tool_reply or not speech_id):
+            cur.awaiting_tool_reply = False
+            self._claim(cur, speech_id)
+            return cur
+        turn = self._open(user_turn=False, anchor=start)
+        self._claim(turn, speech_id)
+        return turn
+
+    def on_metrics(self, m: metrics.AgentMetrics):
+        if isinstance(m, metrics.EOUMetrics):
+            self._on_eou(m)
+        elif isinstance(m, metrics.LLMMetrics) and m.ttft >= 0:
+            self._add(m.speech_id, Span("llm_ttft", m.timestamp - m.duration, m.ttft))
+        elif isinstance(m, metrics.TTSMetrics) and m.ttfb >= 0:
+            self._add(m.speech_id, Span("tts_ttfb", m.timestamp - m.duration, m.ttfb))
+
+    def _add(self, speech_id: Optional[str], span: Span):
+        turn = self._turn_for(speech_id, span.start)
+        if turn is not None:
+            turn.add(span)
+
+    def _on_eou(self, m: metrics.EOUMetrics):
+        speech_end = m.timestamp - m.on_user_turn_completed_delay - m.end_of_utterance_delay
+        turn = self._by_speech.get(m.speech_id) if m.speech_id else None
+        if turn is not None and turn is self._current and not turn.user_turn:
+            # preemptive generation: the reply's LLM/TTS metrics arrived before its EOU
+            turn.user_turn, turn.anchor = True, speech_end
+        else:
+            turn = self._open(user_turn=True, anchor=speech_end)
+            self._claim(turn, m.speech_id)
+        turn.add(Span("stt", speech_end, m.transcription_delay))
+        turn.add(Span("eou", speech_end, m.end_of_utterance_delay))
+        turn.add(Span("on_user_turn", speech_end + m.end_of_utterance_delay, m.on_user_turn_completed_delay))
+
+    def on_tools_executed(self, ev: FunctionToolsExecutedEvent):
+        calls = ev.zipped()
+        if not calls:
+            return
+        turn = self._current or self._open(user_turn=False, anchor=min(c.created_at for c, _ in calls))
+        for call, output in calls:
+            if output is None:  # StopResponse or an unusable return value: no output, so no end time
+                continue
+            turn.add(Span("tool", call.created_at, max(0.0, output.created_at - call.created_at), call.name))
+        if any(output is not None for _, output in calls):  # otherwise no tool reply follows
+            turn.awaiting_tool_reply = True
+
+    def _close_current(self):
+        turn, self._current = self._current, None
+        if turn is None:
+            return
+        for sid in turn.speech_ids:
+            self._by_speech.pop(sid, None)
+            self._closed_ids.append(sid)
+        latencies = turn.stage_latencies()
+        if latencies:
+            self.stats.record(self.agent, latencies)
+        self.recent.append(turn)
+        if self.log_turns:
+            logger.info(turn.format())
+        if self.on_close is not None:
+            try:
+                self.on_close(turn)
+            except Exception:
+                logger.exception("turn close hook failed")
+
+    def close(self):
+        self._close_current()
@@ -0,0 +1,435 @@
+"""
+Shared runtime – Load generation with a local room stand-in
+
+Runs N simulated sessions in one process, the way a router worker hosts them,
+with nothing on the network:
+- LocalMic stands in for the caller's microphone track. It delivers frames in
+  real time: silence, then a tone for each scripted utterance (FakeSTT turns
+  the tone into the scripted transcript)
+- LocalSpeaker stands in for the room's audio output. It plays each reply out
+  in real time and reports playback back to the session, so interruptions,
+  agent states and playout waits behave as in a room
+- LocalJobContext gives SessionMetrics the job id and shutdown callbacks it
+  expects from a JobContext
+- a Script is one agent's conversation: what the caller says each turn, and
+  the tool calls and reply FakeLLM answers with
+- SimulatedSession plays its script in a loop, with think time between turns.
+  Each turn's latency runs from the end of the caller's speech to the first
+  reply frame at the speaker
+- run_load() starts N sessions round-robin over the scripts, samples
+  event-loop lag, CPU and RSS, counts the loop watchdog's stalls by tool, and
+  returns a LoadReport
+"""
+
+import asyncio
+import itertools
+import logging
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from livekit import rtc
+from livekit.agents import (
+    Agent,
+    AgentSession,
+    AgentStateChangedEvent,
+    FunctionToolsExecutedEvent,
+)
+from livekit.agents.voice import io
+
+from .fakes import (
+    STT_SAMPLE_RATE,
+    FakeLLM,
+    FakeResponse,
+    FakeSTT,
+    FakeToolCall,
+    FakeTTS,
+    utterance_frames,
+)
+from .metrics import SessionMetrics
+from .watchdog import watch_loop
+
+logger = logging.getLogger("agent_runtime")
+
+FRAME_MS = 20
+WORDS_PER_SECOND = 2.5  # how fast the simulated caller talks
+TURN_TIMEOUT_S = 15.0
+LAG_SAMPLE_S = 0.05
+# livekit-agents 1.3 has no playback-started hook; the session learns of playback from the frames
+_REPORTS_PLAYBACK_START = hasattr(io.AudioOutput, "on_playback_started")
+
+
+def percentile(values: Sequence[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile (q in 0..100) of unsorted values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def rss_mb() -> Optional[float]:
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / 1e6
+
+
+# ---- room stand-in ----
+class LocalMic(io.AudioInput):
+    def __init__(self, frame_ms: int = FRAME_MS, sample_rate: int = STT_SAMPLE_RATE):
+        super().__init__(label="local-mic")
+        self.frame_s = frame_ms / 1000
+        # one voiced and one silent frame, reused for every frame delivered
+        self._tone, self._silence = utterance_frames(self.frame_s, self.frame_s, sample_rate, frame_ms)
+        self._voiced = 0
+        self._spoken: Optional[asyncio.Future] = None
+        self._next_at: Optional[float] = None
+        self._closed = False
+
+    def say(self, speech_s: float) -> "asyncio.Future[float]":
+        """Voice `speech_s` of tone; resolves with the perf_counter time its last frame was delivered."""
+        self._voiced = max(1, round(speech_s / self.frame_s))
+        self._spoken = asyncio.get_running_loop().create_future()
+        return self._spoken
+
+    def close(self):
+        self._closed = True
+
+    async def __anext__(self) -> rtc.AudioFrame:
+        if self._closed:
+            raise StopAsyncIteration
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # a track delivers at the audio clock; after a stall it catches up, but not by more than a second
+        if self._next_at is None or now - self._next_at > 1.0:
+            self._next_at = now
+        self._next_at += self.frame_s
+        if self._next_at > now:
+            await asyncio.sleep(self._next_at - now)
+        if self._voiced <= 0:
+            return self._silence
+        self._voiced -= 1
+        if self._voiced == 0 and self._spoken is not None and not self._spoken.done():
+            self._spoken.set_result(time.perf_counter())
+        return self._tone
+
+
+class LocalSpeaker(io.AudioOutput):
+    def __init__(self):
+        super().__init__(label="local-speaker", capabilities=io.AudioOutputCapabilities(pause=False))
+        self.started: List[float] = []  # perf_counter of each segment's first frame
+        self._segment_started = asyncio.Event()
+        self._start: Optional[float] = None  # loop time the open segment starts playing
+        self._pushed = 0.0
+        self._busy_until = 0.0
+        self._discarding = False
+        self._playout: Optional[asyncio.Task] = None
+        self._playout_segment = (0.0, 0.0)  # (start, duration) of the segment being played out
+
+    async def capture_frame(self, frame: rtc.AudioFrame) -> None:
+        await super().capture_frame(frame)
+        if self._discarding:
+            return
+        if self._start is None:
+            self._start = max(asyncio.get_running_loop().time(), self._busy_until)
+            self._pushed = 0.0
+            self.started.append(time.perf_counter())
+            self._segment_started.set()
+            if _REPORTS_PLAYBACK_START:
+                self.on_playback_started(created_at=time.time())
+        self._pushed += frame.duration
+
+    def flush(self) -> None:
+        super().flush()
+        if self._discarding:
+            self._discarding = False
+            return
+        if self._start is None:
+            return
+        start, pushed = self._start, self._pushed
+        self._start = None
+        self._busy_until = start + pushed
+        self._playout_segment = (start, pushed)
+        self._playout = asyncio.get_running_loop().create_task(self._play_out(start + pushed, pushed))
+
+    async def _play_out(self, until: float, duration: float):
+        await asyncio.sleep(max(0.0, until - asyncio.get_running_loop().time()))
+        self._playout = None
+        self.on_playback_finished(playback_position=duration, interrupted=False)
+
+    def clear_buffer(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if self._start is not None:  # cleared before its flush: the rest of the segment is dropped
+            played = min(self._pushed, max(0.0, now - self._start))
+            self._start = None
+            self._discarding = True
+        elif self._playout is not None:
+            self._playout.cancel()
+            self._playout = None
+            start, duration = self._playout_segment
+            played = min(duration, max(0.0, now - start))
+        else:
+            return
+        self._busy_until = now
+        self.on_playback_finished(playback_position=played, interrupted=True)
+
+    async def wait_segment(self, index: int) -> float:
+        """perf_counter time of the index-th segment's first frame, once it arrives."""
+        while len(self.started) <= index:
+            self._segment_started.clear()
+            await self._segment_started.wait()
+        return self.started[index]
+
+
+class LocalJob:
+    def __init__(self, job_id: str):
+        self.id = job_id
+
+
+class LocalJobContext:
+    """What SessionMetrics and the days' handlers use of a JobContext."""
+
+    def __init__(self, job_id: str):
+        self.job = LocalJob(job_id)
+        self._shutdown_callbacks: List[Callable[[], Any]] = []
+
+    def add_shutdown_callback(self, callback: Callable[[], Any]):
+        self._shutdown_callbacks.append(callback)
+
+    async def shutdown(self):
+        for callback in self._shutdown_callbacks:
+            try:
+                await callback()
+            except Exception:
+                logger.exception("shutdown callback failed")
+
+
+# ---- scripts ----
+@dataclass
+class ScriptedTurn:
+    say: str  # the transcript FakeSTT emits for this turn
+    reply: str
+    tools: List[FakeToolCall] = field(default_factory=list)
+
+    def response(self) -> FakeResponse:
+        if self.tools:
+            return FakeResponse(tool_calls=list(self.tools), then=self.reply, when=self.say)
+        return FakeResponse(text=self.reply, when=self.say)
+
+    @property
+    def speech_s(self) -> float:
+        return max(0.5, len(self.say.split()) / WORDS_PER_SECOND)
+
+
+@dataclass
+class Script:
+    name: str  # also the agent label in metrics (e.g. "day6")
+    agent: Callable[[], Agent]
+    turns: Sequence[ScriptedTurn]
+    userdata: Callable[[], Any] = lambda: None
+
+
+@dataclass(frozen=True)
+class PluginLatency:
+    stt: float = 0.15  # after end of speech (FakeSTT adds end_silence_s on top)
+    end_silence: float = 0.3
+    llm_ttft: float = 0.35
+    tts_ttfb: float = 0.2
+    endpointing: float = 0.5  # the session's min_endpointing_delay, after the final transcript
+
+    def floor(self, turn: ScriptedTurn) -> float:
+        """The fakes' own share of a turn's latency (a tool turn waits for a second LLM reply); the rest is overhead."""
+        llm_calls = 2 if turn.tools else 1
+        return self.end_silence + self.stt + self.endpointing + llm_calls * self.llm_ttft + self.tts_ttfb
+
+
+# ---- sessions ----
+class SimulatedSession:
+    def __init__(self, index: int, script: Script, latency: PluginLatency, think_s: float = 1.0,
+                 frame_ms: int = FRAME_MS, turn_timeout: float = TURN_TIMEOUT_S, seed: int = 0):
+        self.index = index
+        self.script = script
+        self.latency = latency
+        self.think_s = think_s
+        self.turn_timeout = turn_timeout
+        self._rng = random.Random(seed * 100003 + index)
+        self.mic = LocalMic(frame_ms)
+        self.speaker = LocalSpeaker()
+        self.ctx = LocalJobContext(f"load-{script.name}-{index}")
+        self.session = AgentSession(
+            stt=FakeSTT([t.say for t in script.turns], latency=latency.stt, end_silence_s=latency.end_silence),
+            llm=FakeLLM(rules=[t.response() for t in script.turns], ttft=latency.llm_ttft),
+            tts=FakeTTS(ttfb=latency.tts_ttfb),
+            turn_detection="stt",
+            min_endpointing_delay=latency.endpointing,
+            userdata=script.userdata(),
+        )
+        self.latencies: List[float] = []
+        self.overheads: List[float] = []  # latency above the fakes' floor
+        self.turns = 0
+        self.tool_calls = 0
+        self.timeouts = 0
+        self._listening = asyncio.Event()
+
+    def _on_state(self, ev: AgentStateChangedEvent):
+        if ev.new_state == "listening":
+            self._listening.set()
+        else:
+            self._listening.clear()
+
+    def _on_tools(self, ev: FunctionToolsExecutedEvent):
+        self.tool_calls += len(ev.function_calls)
+
+    async def start(self):
+        self.session.on("agent_state_changed", self._on_state)
+        self.session.on("function_tools_executed", self._on_tools)
+        self.session.input.audio = self.mic
+        self.session.output.audio = self.speaker
+        SessionMetrics(agent=self.script.name, turn_prefix=self.ctx.job.id).attach(self.ctx, self.session)
+        await self.session.start(self.script.agent())
+
+    async def run(self, until: float):
+        """Play the script in a loop until loop time `until`; a turn that times out is counted and skipped."""
+        loop = asyncio.get_running_loop()
+        for turn in itertools.cycle(self.script.turns):
+            think = self.think_s * self._rng.uniform(0.5, 1.5)
+            if loop.time() + think + turn.speech_s >= until:
+                return
+            try:
+                await asyncio.wait_for(self._listening.wait(), self.turn_timeout)
+                await asyncio.sleep(think)
+                segment = len(self.speaker.started)
+                spoken_at = await self.mic.say(turn.speech_s)
+                first_audio = await asyncio.wait_for(self.speaker.wait_segment(segment), self.turn_timeout)
+                self.latencies.append(first_audio - spoken_at)
+                self.overheads.append(first_audio - spoken_at - self.latency.floor(turn))
+                self._listening.clear()
+                await asyncio.wait_for(self._listening.wait(), self.turn_timeout)
+                self.turns += 1
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+
+    async def close(self):
+        self.mic.close()
+        try:
+            await self.session.aclose()
+        finally:
+            await self.ctx.shutdown()
+
+
+# ---- load runs ----
+@dataclass
+class LoadReport:
+    sessions: int
+    duration_s: float
+    turns: int = 0
+    tool_calls: int = 0
+    timeouts: int = 0
+    failed_sessions: int = 0
+    latencies: List[float] = field(default_factory=list, repr=False)
+    overheads: List[float] = field(default_factory=list, repr=False)
+    loop_lag: List[float] = field(default_factory=list, repr=False)
+    per_script: Dict[str, List[float]] = field(default_factory=dict, repr=False)
+    stalls: Dict[str, int] = field(default_factory=dict)  # tool -> event-loop stalls
+    cpu_s: float = 0.0
+    rss_start_mb: Optional[float] = None
+    rss_peak_mb: Optional[float] = None
+    rss_end_mb: Optional[float] = None
+
+    @property
+    def turns_per_s(self) -> float:
+        return self.turns / self.duration_s if self.duration_s else 0.0
+
+    @property
+    def rss_per_session_mb(self) -> Optional[float]:
+        if self.rss_start_mb is None or self.rss_peak_mb is None or not self.sessions:
+            return None
+        return (self.rss_peak_mb - self.rss_start_mb) / self.sessions
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "sessions": self.sessions,
+            "duration_s": self.duration_s,
+            "turns": self.turns,
+            "turns_per_s": self.turns_per_s,
+            "tool_calls": self.tool_calls,
+            "timeouts": self.timeouts,
+            "failed_sessions": self.failed_sessions,
+            "latency_s": {f"p{q}": percentile(self.latencies, q) for q in (50, 95, 99)}
+            | {"max": max(self.latencies, default=None)},
+            "overhead_s": {f"p{q}": percentile(self.overheads, q) for q in (50, 95, 99)},
+            "latency_p95_by_script": {name: percentile(v, 95) for name, v in sorted(self.per_script.items())},
+            "loop_lag_s": {f"p{q}": percentile(self.loop_lag, q) for q in (50, 99)}
+            | {"max": max(self.loop_lag, default=None)},
+            "stalls": dict(sorted(self.stalls.items(), key=lambda kv: -kv[1])),
+            "cpu_util": self.cpu_s / self.duration_s if self.duration_s else 0.0,
+            "rss_start_mb": self.rss_start_mb,
+            "rss_peak_mb": self.rss_peak_mb,
+            "rss_end_mb": self.rss_end_mb,
+            "rss_per_session_mb": self.rss_per_session_mb,
+        }
+
+
+async def _sample(report: LoadReport, interval: float = LAG_SAMPLE_S):
+    """Loop lag every `interval` (how late a sleep wakes up) and peak RSS about once a second."""
+    loop = asyncio.get_running_loop()
+    every = max(1, int(1.0 / interval))
+    for n in itertools.count():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        report.loop_lag.append(max(0.0, loop.time() - expected))
+        if n % every == 0:
+            rss = rss_mb()
+            if rss is not None:
+                report.rss_peak_mb = max(report.rss_peak_mb or 0.0, rss)
+
+
+async def run_load(scripts: Sequence[Script], sessions: int, duration_s: float,
+                   latency: Optional[PluginLatency] = None, think_s: float = 1.0, ramp_s: float = 2.0,
+                   frame_ms: int = FRAME_MS, seed: int = 0) -> LoadReport:
+    """Start `sessions` sessions (round-robin over `scripts`, spread over `ramp_s`) and drive them for `duration_s`."""
+    loop = asyncio.get_running_loop()
+    latency = latency or PluginLatency()
+    report = LoadReport(sessions=sessions, duration_s=duration_s, rss_start_mb=rss_mb())
+    report.rss_peak_mb = report.rss_start_mb
+    sampler = loop.create_task(_sample(report))
+    watchdog = watch_loop()
+    started_at = loop.time()
+    cpu_start = time.process_time()
+    until = started_at + ramp_s + duration_s
+    sims = [SimulatedSession(i, scripts[i % len(scripts)], latency, think_s, frame_ms, seed=seed)
+            for i in range(sessions)]
+
+    async def one(sim: SimulatedSession):
+        await asyncio.sleep(ramp_s * sim.index / max(1, sessions))
+        try:
+            await sim.start()
+            await sim.run(until)
+        except Exception:
+            logger.exception(f"session {sim.ctx.job.id} failed")
+            report.failed_sessions += 1
+        finally:
+            await sim.close()
+
+    try:
+        await asyncio.gather(*(one(sim) for sim in sims))
+    finally:
+        sampler.cancel()
+        if watchdog is not None:
+            report.stalls = dict(watchdog.counts)
+            watchdog.release()
+    report.duration_s = loop.time() - started_at
+    report.cpu_s = time.process_time() - cpu_start
+    report.rss_end_mb = rss_mb()
+    for sim in sims:
+        report.turns += sim.turns
+        report.tool_calls += sim.tool_calls
+        report.timeouts += sim.timeouts
+        report.latencies.extend(sim.latencies)
+        report.overheads.extend(sim.overheads)
+        report.per_script.setdefault(sim.script.name, []).extend(sim.latencies)
+    return report
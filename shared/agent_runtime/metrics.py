@@ -0,0 +1,148 @@
+"""
+Shared runtime – Session metrics
+
+One metrics_collected handler per session:
+- collects usage (LLM tokens, TTS characters, STT audio) for a summary that is
+  logged when the job shuts down
+- optionally logs every metric as it arrives (the Day 1 starter behaviour)
+- fans each metric out to listeners, so a day can add its own accounting
+  (e.g. Day 8's fast-path stats) without registering another handler
+- feeds a TurnTracer (latency.py) with the metrics and tool executions, so
+  every turn gets a latency waterfall and the agent's rolling per-stage
+  percentiles are logged at shutdown
+- records turns, tool calls, TTS characters, STT audio, LLM tokens, active
+  sessions and event-loop lag in the process metrics (telemetry.py)
+- holds the event loop's stall watchdog (watchdog.py) while the session runs,
+  registers each agent's tools with it, and logs the loop's stalls by tool at
+  shutdown
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from typing import Callable, List, Optional
+
+from livekit.agents import (
+    Agent,
+    AgentSession,
+    AgentStateChangedEvent,
+    FunctionToolsExecutedEvent,
+    JobContext,
+    MetricsCollectedEvent,
+    metrics,
+)
+
+from .latency import TURN_LATENCY, TurnTracer, TurnWaterfall
+from .telemetry import (
+    ACTIVE_SESSIONS,
+    LLM_TOKENS,
+    STT_AUDIO_SECONDS,
+    TOOL_CALLS,
+    TOOL_SECONDS,
+    TTS_CHARACTERS,
+    TURN_LATENCY_SECONDS,
+    TURNS,
+    monitor_loop_lag,
+)
+from .watchdog import register_tools, watch_loop
+
+logger = logging.getLogger("agent_runtime")
+
+MetricsListener = Callable[[metrics.AgentMetrics], None]
+
+
+class SessionMetrics:
+    def __init__(self, log_each: bool = False, agent: Optional[str] = None, turn_prefix: Optional[str] = None):
+        self.log_each = log_each
+        self.agent = agent or "agent"
+        self.usage = metrics.UsageCollector()
+        self.turns = TurnTracer(self.agent, prefix=turn_prefix, on_close=self._record_turn)
+        self._tts_chars = TTS_CHARACTERS.labels(self.agent)
+        self._stt_audio = STT_AUDIO_SECONDS.labels(self.agent)
+        self.counts: Counter = Counter()  # metric type name -> events seen
+        self._listeners: List[MetricsListener] = []
+        self._tools_of: Optional[Agent] = None  # the agent whose tools are registered with the watchdog
+
+    def add_listener(self, fn: MetricsListener):
+        self._listeners.append(fn)
+
+    def collect(self, m: metrics.AgentMetrics):
+        self.counts[type(m).__name__] += 1
+        if self.log_each:
+            metrics.log_metrics(m)
+        self.usage.collect(m)
+        if isinstance(m, metrics.TTSMetrics):
+            self._tts_chars.inc(m.characters_count)
+        elif isinstance(m, metrics.STTMetrics):
+            self._stt_audio.inc(m.audio_duration)
+        elif isinstance(m, metrics.LLMMetrics):
+            LLM_TOKENS.labels(self.agent, "prompt").inc(m.prompt_tokens)
+            LLM_TOKENS.labels(self.agent, "completion").inc(m.completion_tokens)
+        try:
+            self.turns.on_metrics(m)
+        except Exception:
+            logger.exception("turn tracer failed")
+        for fn in self._listeners:
+            try:
+                fn(m)
+            except Exception:
+                logger.exception("metrics listener failed")
+
+    def _record_turn(self, turn: TurnWaterfall):
+        TURNS.labels(self.agent, "user" if turn.user_turn else "agent").inc()
+        for stage, seconds in turn.stage_latencies().items():
+            TURN_LATENCY_SECONDS.labels(self.agent, stage).observe(seconds)
+
+    def record_tools(self, ev: FunctionToolsExecutedEvent):
+        for call, output in ev.zipped():
+            TOOL_CALLS.labels(self.agent, call.name, "true" if output is not None and output.is_error else "false").inc()
+            if output is not None:  # None: StopResponse or an unusable return value, with no end time
+                TOOL_SECONDS.labels(self.agent, call.name).observe(max(0.0, output.created_at - call.created_at))
+        self.turns.on_tools_executed(ev)
+
+    def summary(self):
+        return self.usage.get_summary()
+
+    def attach(self, ctx: JobContext, session: AgentSession) -> "SessionMetrics":
+        @session.on("metrics_collected")
+        def _on_metrics_collected(ev: MetricsCollectedEvent):
+            self.collect(ev.metrics)
+
+        @session.on("function_tools_executed")
+        def _on_tools_executed(ev: FunctionToolsExecutedEvent):
+            self.record_tools(ev)
+
+        @session.on("agent_state_changed")
+        def _on_agent_state_changed(ev: AgentStateChangedEvent):
+            if session.current_agent is not self._tools_of:  # started, or handed off to another agent
+                self._tools_of = session.current_agent
+                register_tools(self._tools_of.tools)
+
+        active = ACTIVE_SESSIONS.labels(self.agent)
+        active.inc()
+        try:
+            lag_task = asyncio.get_running_loop().create_task(monitor_loop_lag(self.agent))
+        except RuntimeError:  # not attached from a job's event loop
+            lag_task = None
+        watchdog = watch_loop(self.agent)
+
+        async def log_usage():
+            active.dec()
+            if lag_task is not None:
+                lag_task.cancel()
+            self.turns.close()
+            logger.info(f"Usage: {self.summary()}")
+            logger.info(TURN_LATENCY.describe(self.agent))
+            if watchdog is not None:
+                logger.info(watchdog.describe())
+                watchdog.release(self.agent)
+
+        ctx.add_shutdown_callback(log_usage)
+        return self
+
+
+def attach_metrics(ctx: JobContext, session: AgentSession, log_each: bool = False,
+                   agent: Optional[str] = None) -> SessionMetrics:
+    """`agent` names the day for the per-agent latency percentiles (e.g. "day6")."""
+    job = getattr(ctx, "job", None)
+    return SessionMetrics(log_each=log_each, agent=agent, turn_prefix=getattr(job, "id", None)).attach(ctx, session)
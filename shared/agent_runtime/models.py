@@ -0,0 +1,252 @@
+"""
+Shared runtime – Per-process model registry
+
+prewarm used to load only the VAD; the turn detector was built inside every
+entrypoint (an HF cache lookup plus languages.json parse per session) and the
+noise-cancellation model was first touched on the first audio frame.
+
+- ModelRegistry loads each model at most once per process and hands the same
+  instance to every job in it (thread-executor workers run many jobs per
+  process); the turn detector needs a job's inference executor, so it is built
+  by the first job and reused after that
+- every model has a readiness check (files present, loads cleanly) that runs
+  in prewarm, so a missing `download-files` shows up before the first call
+- StartupTimer records, per job, model acquisition, session start, room
+  connect and first agent speech, and whether the job started cold (it had to
+  load a model) or warm
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger("agent_runtime")
+
+STARTUP_HISTORY = 100
+
+
+@dataclass
+class ModelStatus:
+    name: str
+    loaded: bool = False
+    ready: Optional[bool] = None  # None: not checked yet
+    load_s: Optional[float] = None
+    loaded_by: Optional[str] = None  # "prewarm" or the job id that paid for it
+    error: Optional[str] = None
+
+
+@dataclass
+class _Entry:
+    loader: Callable[[], Any]
+    check: Optional[Callable[[], None]]
+    needs_job: bool
+    status: ModelStatus
+    value: Any = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._entries: Dict[str, _Entry] = {}
+
+    def register(self, name: str, loader: Callable[[], Any], check: Optional[Callable[[], None]] = None,
+                 needs_job: bool = False):
+        """`check` raises if the model cannot be loaded; `needs_job` defers loading to the first job."""
+        self._entries[name] = _Entry(loader, check, needs_job, ModelStatus(name))
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._entries)
+
+    def status(self) -> Dict[str, ModelStatus]:
+        return {name: e.status for name, e in self._entries.items()}
+
+    def is_loaded(self, name: str) -> bool:
+        entry = self._entries.get(name)
+        return entry is not None and entry.status.loaded
+
+    def ready(self) -> bool:
+        """All readiness checks that have run passed."""
+        return all(e.status.ready is not False for e in self._entries.values())
+
+    def _load(self, entry: _Entry, owner: str) -> Any:
+        with entry.lock:
+            if entry.status.loaded:
+                return entry.value
+            started = time.perf_counter()
+            try:
+                entry.value = entry.loader()
+            except Exception as e:
+                entry.status.ready = False
+                entry.status.error = f"{type(e).__name__}: {e}"
+                raise
+            entry.status.load_s = time.perf_counter() - started
+            entry.status.loaded = True
+            entry.status.ready = True
+            entry.status.loaded_by = owner
+            entry.status.error = None
+            return entry.value
+
+    def get(self, name: str, owner: str = "job") -> Any:
+        entry = self._entries[name]
+        if entry.status.loaded:
+            return entry.value
+        return self._load(entry, owner)
+
+    def get_or_none(self, name: str, owner: str = "job") -> Any:
+        try:
+            return self.get(name, owner)
+        except Exception:
+            logger.warning(f"{name} unavailable: {self._entries[name].status.error}")
+            return None
+
+    def warm(self) -> Dict[str, ModelStatus]:
+        """Run every readiness check and load what can be loaded outside a job."""
+        for entry in self._entries.values():
+            try:
+                if entry.check is not None:
+                    entry.check()
+                if entry.needs_job:
+                    entry.status.ready = True
+                else:
+                    self._load(entry, "prewarm")
+            except Exception as e:
+                entry.status.ready = False
+                entry.status.error = f"{type(e).__name__}: {e}"
+        return self.status()
+
+    def describe(self) -> str:
+        parts = []
+        for s in self.status().values():
+            state = "loaded" if s.loaded else ("ready" if s.ready else ("NOT READY" if s.ready is False else "unchecked"))
+            extra = f" {s.load_s * 1000:.0f}ms" if s.load_s is not None else ""
+            parts.append(f"{s.name}={state}{extra}" + (f" ({s.error})" if s.error else ""))
+        return ", ".join(parts)
+
+
+# ---- default models ----
+def _vad_loader():
+    from livekit.plugins import silero
+
+    return silero.VAD.load()
+
+
+def _turn_detector_check():
+    """The multilingual model files must already be in the local HF cache (`download-files`)."""
+    from huggingface_hub import hf_hub_download
+    from livekit.plugins.turn_detector.models import (
+        HG_MODEL,
+        MODEL_REVISIONS,
+        ONNX_FILENAME,
+    )
+
+    revision = MODEL_REVISIONS["multilingual"]
+    hf_hub_download(HG_MODEL, "languages.json", revision=revision, local_files_only=True)
+    hf_hub_download(HG_MODEL, ONNX_FILENAME, subfolder="onnx", revision=revision, local_files_only=True)
+
+
+def _turn_detector_loader():
+    from livekit.plugins.turn_detector.multilingual import MultilingualModel
+
+    return MultilingualModel()
+
+
+def _noise_cancellation_loader():
+    from livekit.plugins import noise_cancellation
+
+    return noise_cancellation.BVC()
+
+
+def _noise_cancellation_check():
+    """The filter's model file must exist; reading it once also puts it in the page cache."""
+    options = _noise_cancellation_loader()
+    model = (getattr(options, "options", None) or {}).get("modelPath")
+    if model:
+        with open(model, "rb") as f:
+            while f.read(1 << 20):
+                pass
+
+
+def default_registry() -> ModelRegistry:
+    registry = ModelRegistry()
+    registry.register("vad", _vad_loader)
+    registry.register("turn_detector", _turn_detector_loader, check=_turn_detector_check, needs_job=True)
+    registry.register("noise_cancellation", _noise_cancellation_loader, check=_noise_cancellation_check)
+    return registry
+
+
+MODELS = default_registry()
+
+
+# ---- per-job startup timing ----
+@dataclass
+class StartupRecord:
+    job_id: str
+    cold: bool
+    marks: Dict[str, float] = field(default_factory=dict)  # stage -> seconds since the job started
+
+    def summary(self) -> str:
+        stages = " ".join(f"{k}={v * 1000:.0f}ms" for k, v in self.marks.items())
+        return f"job {self.job_id} {'cold' if self.cold else 'warm'} start: {stages}"
+
+
+class StartupTimer:
+    def __init__(self, job_id: str, started: Optional[float] = None):
+        self.record = StartupRecord(job_id, cold=False)
+        self._t0 = time.perf_counter() if started is None else started
+
+    def mark(self, stage: str) -> float:
+        if stage not in self.record.marks:
+            self.record.marks[stage] = time.perf_counter() - self._t0
+        return self.record.marks[stage]
+
+
+class StartupLog:
+    """Recent per-job startup records, split into cold and warm."""
+
+    def __init__(self, maxlen: int = STARTUP_HISTORY):
+        self._records: Deque[StartupRecord] = deque(maxlen=maxlen)
+        self._timers: Dict[str, StartupTimer] = {}
+        self._lock = threading.Lock()
+
+    def start(self, job_id: str) -> StartupTimer:
+        with self._lock:
+            timer = self._timers.get(job_id)
+            if timer is None:
+                timer = self._timers[job_id] = StartupTimer(job_id)
+            return timer
+
+    def timer(self, job_id: str) -> Optional[StartupTimer]:
+        return self._timers.get(job_id)
+
+    def finish(self, job_id: str) -> Optional[StartupRecord]:
+        with self._lock:
+            timer = self._timers.pop(job_id, None)
+            if timer is None:
+                return None
+            self._records.append(timer.record)
+        logger.info(timer.record.summary())
+        return timer.record
+
+    def records(self, cold: Optional[bool] = None) -> List[StartupRecord]:
+        return [r for r in self._records if cold is None or r.cold == cold]
+
+    def mean(self, stage: str, cold: bool) -> Optional[float]:
+        values = [r.marks[stage] for r in self.records(cold) if stage in r.marks]
+        return sum(values) / len(values) if values else None
+
+
+STARTUPS = StartupLog()
+
+
+def acquire_session_models(job_id: str, registry: ModelRegistry = MODELS) -> Dict[str, Any]:
+    """The models a session needs; the job is cold if any of them had to be loaded now."""
+    timer = STARTUPS.start(job_id)
+    cold = not all(registry.is_loaded(name) for name in registry.names)
+    models = {name: registry.get_or_none(name, owner=job_id) for name in registry.names}
+    timer.record.cold = cold
+    timer.mark("models")
+    return models
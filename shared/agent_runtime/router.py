@@ -0,0 +1,270 @@
+"""
+Shared runtime – Multi-tenant router
+
+One worker process hosts every day's agent instead of ten separate workers:
+- each day's agent module is imported once (under a unique module name) and
+  the VAD is loaded once for the whole process
+- jobs run on the thread executor, so every session shares those modules and
+  models instead of a fresh process each
+- a job is routed by job (dispatch) metadata, then room metadata, then room
+  name tokens ("fraud-1234", "day9_demo"), else to the default tenant
+- each tenant has a concurrency limit; requests over it are rejected in
+  request_fnc, before the job is accepted
+
+The day keeps its own entrypoint (userdata, handlers, Agent subclass); the
+router only chooses which one runs.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from livekit.agents import (
+    JobContext,
+    JobExecutorType,
+    JobProcess,
+    JobRequest,
+    WorkerOptions,
+)
+
+from .session import prewarm as _prewarm_models
+
+logger = logging.getLogger("agent_runtime")
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+# A reservation the job never confirmed (e.g. the room went away before
+# dispatch) stops counting against the limit after this long.
+RESERVATION_TTL_S = 60.0
+
+_ROOM_TOKEN_RE = re.compile(r"[^a-z0-9]+")
+
+
+@dataclass(frozen=True)
+class Tenant:
+    name: str
+    agent_class: str  # the day's Agent subclass, for logs and docs
+    aliases: Tuple[str, ...] = ()
+    max_sessions: int = 8
+    src_dir: str = ""
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return (self.name, *self.aliases)
+
+    @property
+    def agent_path(self) -> str:
+        return os.path.join(self.src_dir, "agent.py")
+
+
+def _day_src(day: int) -> str:
+    return os.path.join(REPO_ROOT, f"Day{day}", "backend", "src")
+
+
+TENANTS: Tuple[Tenant, ...] = (
+    Tenant("day1", "Assistant", ("assistant", "starter"), src_dir=_day_src(1)),
+    Tenant("day2", "Assistant", ("barista", "coffee"), src_dir=_day_src(2)),
+    Tenant("day3", "WellnessAgent", ("wellness",), src_dir=_day_src(3)),
+    Tenant("day4", "TutorAgent", ("tutor",), src_dir=_day_src(4)),
+    Tenant("day5", "LenskartSDRAgent", ("sdr", "lenskart"), src_dir=_day_src(5)),
+    Tenant("day6", "FraudAgent", ("fraud",), src_dir=_day_src(6)),
+    Tenant("day7", "FoodAgent", ("food", "grocery"), src_dir=_day_src(7)),
+    Tenant("day8", "GameMasterAgent", ("game", "gm"), src_dir=_day_src(8)),
+    Tenant("day9", "GameMasterAgent", ("shop", "shopkeeper"), src_dir=_day_src(9)),
+    Tenant("day10", "GameMasterAgent", ("improv",), src_dir=_day_src(10)),
+)
+
+
+def load_agent_module(tenant: Tenant) -> ModuleType:
+    """Import a day's agent.py as `<tenant>_agent`; its src dir goes on sys.path for sibling modules."""
+    module_name = f"{tenant.name}_agent"
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    if tenant.src_dir not in sys.path:
+        sys.path.append(tenant.src_dir)
+    spec = importlib.util.spec_from_file_location(module_name, tenant.agent_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {tenant.agent_path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[module_name]
+        raise
+    return module
+
+
+def _metadata_target(metadata: Optional[str]) -> Optional[str]:
+    """`{"agent": "day6"}` (also "tenant"/"persona" keys) or a bare name."""
+    if not metadata or not metadata.strip():
+        return None
+    text = metadata.strip()
+    if text.startswith("{"):
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        for key in ("agent", "tenant", "persona"):
+            value = data.get(key)
+            if isinstance(value, str) and value.strip():
+                return value.strip().lower()
+        return None
+    return text.lower()
+
+
+class TenantLimiter:
+    """Active sessions per tenant; request_fnc reserves, the job confirms and releases."""
+
+    def __init__(self, limits: Dict[str, int], ttl_s: float = RESERVATION_TTL_S):
+        self.limits = dict(limits)
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Tuple[str, Optional[float]]] = {}  # job id -> (tenant, reserved_at or None once running)
+        self.rejected: Dict[str, int] = dict.fromkeys(limits, 0)
+
+    def _expire(self, now: float):
+        stale = [jid for jid, (_, at) in self._jobs.items() if at is not None and now - at > self.ttl_s]
+        for jid in stale:
+            del self._jobs[jid]
+
+    def active(self, tenant: str) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return sum(1 for t, _ in self._jobs.values() if t == tenant)
+
+    def reserve(self, tenant: str, job_id: str) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            if job_id in self._jobs:
+                return True
+            active = sum(1 for t, _ in self._jobs.values() if t == tenant)
+            if active >= self.limits.get(tenant, 0):
+                self.rejected[tenant] = self.rejected.get(tenant, 0) + 1
+                return False
+            self._jobs[job_id] = (tenant, now)
+            return True
+
+    def confirm(self, tenant: str, job_id: str):
+        """Mark a job as running (it no longer expires); also covers jobs that skipped request_fnc."""
+        with self._lock:
+            self._jobs[job_id] = (tenant, None)
+
+    def release(self, job_id: str):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            self._expire(time.monotonic())
+            counts = dict.fromkeys(self.limits, 0)
+            for t, _ in self._jobs.values():
+                counts[t] = counts.get(t, 0) + 1
+            return counts
+
+
+@dataclass
+class Router:
+    tenants: Iterable[Tenant] = TENANTS
+    default: Optional[str] = None
+    _by_key: Dict[str, Tenant] = field(init=False, default_factory=dict)
+    _modules: Dict[str, ModuleType] = field(init=False, default_factory=dict)
+    _modules_lock: threading.Lock = field(init=False, default_factory=threading.Lock)
+
+    def __post_init__(self):
+        self.tenants = tuple(self.tenants)
+        for tenant in self.tenants:
+            for key in tenant.keys:
+                if key in self._by_key:
+                    raise ValueError(f"tenant key {key!r} is used twice")
+                self._by_key[key] = tenant
+        if self.default is not None and self.default not in self._by_key:
+            raise ValueError(f"unknown default tenant {self.default!r}")
+        self.limiter = TenantLimiter({t.name: t.max_sessions for t in self.tenants})
+
+    def tenant(self, key: str) -> Optional[Tenant]:
+        return self._by_key.get(key.lower())
+
+    def route(self, room_name: str = "", room_metadata: str = "", job_metadata: str = "") -> Optional[Tenant]:
+        for metadata in (job_metadata, room_metadata):
+            target = _metadata_target(metadata)
+            if target is not None:
+                return self._by_key.get(target)  # explicit but unknown: no fallback
+        for token in _ROOM_TOKEN_RE.split((room_name or "").lower()):
+            tenant = self._by_key.get(token)
+            if tenant is not None:
+                return tenant
+        return self._by_key.get(self.default) if self.default else None
+
+    def module(self, tenant: Tenant) -> ModuleType:
+        module = self._modules.get(tenant.name)
+        if module is None:
+            with self._modules_lock:
+                module = self._modules.get(tenant.name)
+                if module is None:
+                    module = self._modules[tenant.name] = load_agent_module(tenant)
+        return module
+
+    def load_all(self) -> List[str]:
+        """Import every tenant's agent module; returns the ones that failed."""
+        failed = []
+        for tenant in self.tenants:
+            try:
+                self.module(tenant)
+            except Exception:
+                logger.exception(f"could not load {tenant.name} from {tenant.agent_path}")
+                failed.append(tenant.name)
+        return failed
+
+    # ---- worker hooks ----
+    def prewarm(self, proc: JobProcess):
+        _prewarm_models(proc)
+        self.load_all()
+
+    async def request_fnc(self, req: JobRequest):
+        tenant = self.route(req.room.name, req.room.metadata, req.job.metadata)
+        if tenant is None:
+            logger.warning(f"no agent for room {req.room.name!r}; rejecting job {req.id}")
+            await req.reject()
+            return
+        if not self.limiter.reserve(tenant.name, req.id):
+            logger.warning(f"{tenant.name} is at its limit of {tenant.max_sessions} sessions; rejecting job {req.id}")
+            await req.reject()
+            return
+        await req.accept()
+
+    async def entrypoint(self, ctx: JobContext):
+        tenant = self.route(ctx.room.name, ctx.job.room.metadata, ctx.job.metadata)
+        if tenant is None:
+            logger.error(f"no agent for room {ctx.room.name!r}; shutting the job down")
+            ctx.shutdown(reason="no agent for room")
+            return
+        job_id = ctx.job.id
+        self.limiter.confirm(tenant.name, job_id)
+
+        async def _release():
+            self.limiter.release(job_id)
+
+        ctx.add_shutdown_callback(_release)
+        logger.info(f"job {job_id} in room {ctx.room.name!r} -> {tenant.name} ({tenant.agent_class})")
+        await self.module(tenant).entrypoint(ctx)
+
+    def worker_options(self, **overrides) -> WorkerOptions:
+        options = {
+            "entrypoint_fnc": self.entrypoint,
+            "prewarm_fnc": self.prewarm,
+            "request_fnc": self.request_fnc,
+            "job_executor_type": JobExecutorType.THREAD,
+        }
+        options.update(overrides)
+        return WorkerOptions(**options)
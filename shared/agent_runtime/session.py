@@ -0,0 +1,118 @@
+"""
+Shared runtime – Session factory
+
+Every day runs the same voice pipeline: Deepgram STT, Gemini LLM, Murf TTS,
+the multilingual turn detector, Silero VAD and BVC noise cancellation. Only
+the voice, style and userdata differ, so a day describes its pipeline with a
+VoiceConfig and the runtime builds and starts the session. The models come
+from the per-process registry (models.MODELS) that prewarm checks and loads;
+start_session records the job's cold/warm startup timings. prewarm also starts
+the process metrics endpoint when AGENT_METRICS_PORT is set.
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from livekit.agents import (
+    Agent,
+    AgentSession,
+    AgentStateChangedEvent,
+    JobContext,
+    JobProcess,
+    RoomInputOptions,
+    tokenize,
+)
+from livekit.plugins import deepgram, google, murf
+
+from .models import MODELS, STARTUPS, acquire_session_models
+from .telemetry import METRICS
+
+logger = logging.getLogger("agent_runtime")
+
+
+@dataclass(frozen=True)
+class VoiceConfig:
+    voice: str = "en-US-marcus"
+    style: str = "Conversational"
+    stt_model: str = "nova-3"
+    llm_model: str = "gemini-2.5-flash"
+    text_pacing: bool = True
+    # Sentence tokenizer for TTS; None keeps the Murf plugin's default tokenizer.
+    min_sentence_len: Optional[int] = None
+    preemptive_generation: bool = False
+
+    def session_kwargs(self) -> Dict[str, Any]:
+        """Plugin-independent AgentSession options for this config."""
+        kwargs: Dict[str, Any] = {}
+        if self.preemptive_generation:
+            kwargs["preemptive_generation"] = True
+        return kwargs
+
+    def tts_kwargs(self) -> Dict[str, Any]:
+        kwargs: Dict[str, Any] = {"voice": self.voice, "style": self.style, "text_pacing": self.text_pacing}
+        if self.min_sentence_len is not None:
+            kwargs["tokenizer"] = tokenize.basic.SentenceTokenizer(min_sentence_len=self.min_sentence_len)
+        return kwargs
+
+
+def shared_vad():
+    """The process-wide Silero VAD (see models.MODELS), loaded on first use."""
+    return MODELS.get("vad", owner="prewarm")
+
+
+def prewarm(proc: JobProcess):
+    """Check and load the per-process models once; sessions fall back to no VAD if it fails."""
+    MODELS.warm()
+    proc.userdata["vad"] = MODELS.get_or_none("vad", owner="prewarm")
+    if MODELS.ready():
+        logger.info(f"models ready: {MODELS.describe()}")
+    else:
+        logger.warning(f"models not ready: {MODELS.describe()}")
+    port = os.environ.get("AGENT_METRICS_PORT")
+    if port:
+        METRICS.serve(int(port), host=os.environ.get("AGENT_METRICS_HOST", "127.0.0.1"))
+
+
+def build_session(ctx: JobContext, config: VoiceConfig, userdata: Any = None) -> AgentSession:
+    models = acquire_session_models(ctx.job.id)
+    kwargs = config.session_kwargs()
+    if userdata is not None:
+        kwargs["userdata"] = userdata
+    if models["turn_detector"] is not None:
+        kwargs["turn_detection"] = models["turn_detector"]
+    return AgentSession(
+        stt=deepgram.STT(model=config.stt_model),
+        llm=google.LLM(model=config.llm_model),
+        tts=murf.TTS(**config.tts_kwargs()),
+        vad=models["vad"] or ctx.proc.userdata.get("vad"),
+        **kwargs,
+    )
+
+
+async def start_session(ctx: JobContext, session: AgentSession, agent: Agent):
+    """Start the session in the job's room with noise cancellation, then join the room."""
+    job_id = ctx.job.id
+    timer = STARTUPS.start(job_id)
+
+    @session.on("agent_state_changed")
+    def _on_agent_state_changed(ev: AgentStateChangedEvent):
+        if ev.new_state == "speaking" and "first_response" not in timer.record.marks:
+            timer.mark("first_response")
+            STARTUPS.finish(job_id)
+
+    async def _finish():
+        STARTUPS.finish(job_id)
+
+    ctx.add_shutdown_callback(_finish)
+
+    noise = MODELS.get_or_none("noise_cancellation", owner=job_id)
+    await session.start(
+        agent=agent,
+        room=ctx.room,
+        room_input_options=RoomInputOptions(noise_cancellation=noise) if noise is not None else RoomInputOptions(),
+    )
+    timer.mark("session_started")
+    await ctx.connect()
+    timer.mark("connected")
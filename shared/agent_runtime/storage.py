@@ -0,0 +1,199 @@
+"""
+Shared runtime – Storage helpers
+
+- connect(): SQLite connections with the pragmas every day uses (WAL,
+  synchronous=NORMAL, busy timeout), usable from worker threads; every
+  statement is counted and timed in the process metrics (telemetry.py)
+- SqliteStore: one connection guarded by a lock; subclasses write short
+  synchronous methods and sessions call them through `run` (asyncio.to_thread),
+  so a query never blocks the event loop
+- JSON files are replaced atomically (write a temp file, then os.replace), so a
+  crash mid-write never leaves a truncated file behind; an append to a file
+  that is not a JSON array moves it aside instead of overwriting it
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, suppress
+from typing import Any, Callable, Iterator, List, Optional, TypeVar
+
+from .telemetry import DB_QUERIES, DB_QUERY_SECONDS
+
+logger = logging.getLogger("agent_runtime")
+
+T = TypeVar("T")
+
+# How long a connection waits on a locked database before raising.
+BUSY_TIMEOUT_MS = 5000
+
+
+def configure_connection(conn: sqlite3.Connection, foreign_keys: bool = False) -> sqlite3.Connection:
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS};")
+    if foreign_keys:
+        conn.execute("PRAGMA foreign_keys = ON;")
+    return conn
+
+
+class _TimedCursor(sqlite3.Cursor):
+    def execute(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().execute(*args)
+        finally:
+            self.connection._observe(started)
+
+    def executemany(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().executemany(*args)
+        finally:
+            self.connection._observe(started)
+
+    def executescript(self, *args):
+        started = time.perf_counter()
+        try:
+            return super().executescript(*args)
+        finally:
+            self.connection._observe(started)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Counts and times statements (connection shortcuts and cursors) per database file."""
+
+    def __init__(self, database, *args, **kwargs):
+        super().__init__(database, *args, **kwargs)
+        db = os.path.basename(str(database)) or ":memory:"
+        self._queries = DB_QUERIES.labels(db)
+        self._query_seconds = DB_QUERY_SECONDS.labels(db)
+
+    def _observe(self, started: float):
+        self._queries.inc()
+        self._query_seconds.observe(time.perf_counter() - started)
+
+    def cursor(self, factory=_TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args):
+        return self.cursor().execute(*args)
+
+    def executemany(self, *args):
+        return self.cursor().executemany(*args)
+
+    def executescript(self, *args):
+        return self.cursor().executescript(*args)
+
+
+def connect(path: str, row_factory: Optional[Callable] = sqlite3.Row,
+            foreign_keys: bool = False) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False, factory=InstrumentedConnection)
+    if row_factory is not None:
+        conn.row_factory = row_factory
+    return configure_connection(conn, foreign_keys=foreign_keys)
+
+
+class SqliteStore:
+    """A locked SQLite connection; `schema` is applied once when the store opens."""
+
+    schema: str = ""
+
+    def __init__(self, path: str, row_factory: Optional[Callable] = sqlite3.Row,
+                 foreign_keys: bool = False):
+        self.path = path
+        self._conn = connect(path, row_factory=row_factory, foreign_keys=foreign_keys)
+        self._lock = threading.Lock()
+        if self.schema:
+            self._conn.executescript(self.schema)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """The connection inside one committed (or rolled back) transaction."""
+        with self._lock, self._conn:
+            yield self._conn
+
+    def query(self, sql: str, params: tuple = ()) -> List[Any]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def query_one(self, sql: str, params: tuple = ()) -> Optional[Any]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        """Run one write statement in its own transaction; returns the affected row count."""
+        with self.transaction() as conn:
+            return conn.execute(sql, params).rowcount
+
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        """Call a store method on a worker thread."""
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+def write_json_atomic(path: str, data: Any, indent: Optional[int] = 4):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def read_json(path: str, default: Any = None) -> Any:
+    """File contents, or `default` when the file is missing or unreadable."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def _read_records(path: str) -> List[Any]:
+    """The JSON array in `path` ([] if missing); a file holding anything else is renamed to <path>.corrupt-<ms>."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            records = json.load(f)
+    except FileNotFoundError:
+        return []
+    except ValueError:
+        records = None
+    if isinstance(records, list):
+        return records
+    aside = f"{path}.corrupt-{int(time.time() * 1000)}"
+    os.replace(path, aside)
+    logger.error(f"{path} is not a JSON array; moved it to {aside} and started a new one")
+    return []
+
+
+_append_locks: dict = {}
+_append_locks_guard = threading.Lock()
+
+
+def append_json_record(path: str, record: Any) -> int:
+    """Append to a JSON array file (created if missing); returns the new length.
+
+    Appends to the same path are serialized within the process so concurrent
+    sessions never drop each other's records.
+    """
+    key = os.path.abspath(path)
+    with _append_locks_guard:
+        lock = _append_locks.setdefault(key, threading.Lock())
+    with lock:
+        records = _read_records(path)
+        records.append(record)
+        write_json_atomic(path, records)
+        return len(records)
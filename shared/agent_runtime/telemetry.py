@@ -0,0 +1,352 @@
+"""
+Shared runtime – Process metrics in Prometheus text format
+
+A running worker had nothing to scrape; the only performance output was the
+usage summary logged at shutdown. This module keeps counters, gauges and
+histograms in process and serves them on a local HTTP port:
+- recording never takes a lock on the hot path: each thread adds into its own
+  cell (a list only that thread writes), and a scrape sums the cells. Only
+  the first record from a new thread or label set takes a lock. When a thread
+  exits its cell is folded into a base cell, so the router's per-job threads
+  don't leave a cell each behind
+- METRICS.serve(port) starts a daemon HTTP server on 127.0.0.1 answering
+  GET /metrics; prewarm starts it when AGENT_METRICS_PORT is set
+- the agent metrics (turns, tool calls, DB queries, TTS characters, STT audio,
+  event-loop lag and stalls, active sessions) are declared here;
+  SessionMetrics, the storage helpers and the loop watchdog record into them
+
+With the default process executor every job process has its own registry and
+only the first to bind the port serves; the router worker (thread executor)
+exports every session of the worker from one registry.
+"""
+
+import asyncio
+import bisect
+import http.server
+import logging
+import math
+import threading
+import weakref
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("agent_runtime")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+LAG_INTERVAL_S = 0.1
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _ThreadToken:
+    """Lives in a thread's threading.local, so it is dropped when the thread exits."""
+
+
+class _Sharded:
+    """Per-thread cells; only the owning thread writes to a cell."""
+
+    def __init__(self, new_cell: Callable[[], list], fold: Callable[[list, list], list]):
+        self._new_cell = new_cell
+        self._fold = fold  # (base, cell) -> a new base holding both
+        self._local = threading.local()
+        self._base = new_cell()  # what exited threads recorded
+        self._cells: List[list] = [self._base]
+        self._lock = threading.Lock()
+
+    def cell(self) -> list:
+        cell = getattr(self._local, "cell", None)
+        if cell is None:
+            cell = self._local.cell = self._new_cell()
+            self._local.token = _ThreadToken()
+            weakref.finalize(self._local.token, self._retire, cell)
+            with self._lock:
+                self._cells.append(cell)
+        return cell
+
+    def _retire(self, cell: list):
+        # The base is replaced, never updated in place: a scrape still summing
+        # the old cells sees the old base plus this cell, so nothing is counted twice.
+        with self._lock:
+            base = self._fold(self._base, cell)
+            self._cells = [c for c in self._cells if c is not cell and c is not self._base]
+            self._cells.append(base)
+            self._base = base
+
+    def cells(self) -> List[list]:
+        with self._lock:
+            return list(self._cells)
+
+
+class _CounterChild(_Sharded):
+    def __init__(self):
+        super().__init__(lambda: [0.0], lambda base, cell: [base[0] + cell[0]])
+
+    def inc(self, amount: float = 1.0):
+        self.cell()[0] += amount
+
+    def dec(self, amount: float = 1.0):
+        self.cell()[0] -= amount
+
+    @property
+    def value(self) -> float:
+        return sum(c[0] for c in self.cells())
+
+
+class _HistogramChild(_Sharded):
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        # [bucket counts (+Inf last), sum]
+        super().__init__(lambda: [[0] * (len(buckets) + 1), 0.0],
+                         lambda base, cell: [[a + b for a, b in zip(base[0], cell[0])], base[1] + cell[1]])
+
+    def observe(self, value: float):
+        cell = self.cell()
+        cell[0][bisect.bisect_left(self.buckets, value)] += 1
+        cell[1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        counts = [0] * (len(self.buckets) + 1)
+        total = 0.0
+        for bucket_counts, s in self.cells():
+            for i, c in enumerate(bucket_counts):
+                counts[i] += c
+            total += s
+        return counts, total
+
+    @property
+    def count(self) -> int:
+        return sum(self.snapshot()[0])
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: str, **kv: str):
+        key = tuple(str(v) for v in values) if values else tuple(str(kv[n]) for n in self.label_names)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.label_names):
+                raise ValueError(f"{self.name} takes labels {self.label_names}")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def render(self):
+        yield from super().render()
+        for key, child in self._items():
+            yield f"{self.name}{_label_str(self.label_names, key)} {_fmt(child.value)}"
+
+
+class Gauge(Counter):
+    """Up/down value (inc/dec from any thread)."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0):
+        self.labels().dec(amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def render(self):
+        yield from super().render()
+        for key, child in self._items():
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, c in zip((*self.buckets, math.inf), counts):
+                cumulative += c
+                yield f"{self.name}_bucket{_label_str(self.label_names, key, ('le', _fmt(bound)))} {cumulative}"
+            yield f"{self.name}_sum{_label_str(self.label_names, key)} {_fmt(total)}"
+            yield f"{self.name}_count{_label_str(self.label_names, key)} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._lock = threading.Lock()
+        self._server: Optional[http.server.ThreadingHTTPServer] = None
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, fn: Callable[[], Iterable[str]]):
+        """`fn` yields exposition lines (with their own HELP/TYPE) at scrape time."""
+        self._collectors.append(fn)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        for fn in self._collectors:
+            try:
+                lines.extend(fn())
+            except Exception:
+                logger.exception("metrics collector failed")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> Optional[int]:
+        """Serve GET /metrics from a daemon thread; returns the bound port, None if it is taken."""
+        if self._server is not None:
+            return self._server.server_address[1]
+        registry = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        try:
+            self._server = http.server.ThreadingHTTPServer((host, port), Handler)
+        except OSError as e:
+            logger.info(f"metrics port {port} not served by this process: {e}")
+            return None
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        bound = self._server.server_address[1]
+        logger.info(f"metrics on http://{host}:{bound}/metrics")
+        return bound
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+METRICS = MetricsRegistry()
+
+TURNS = METRICS.counter("agent_turns_total", "Completed turns", ("agent", "kind"))
+TURN_LATENCY_SECONDS = METRICS.histogram(
+    "agent_turn_latency_seconds", "Per-stage turn latency (total = end of user speech to first audio)",
+    ("agent", "stage"),
+)
+TOOL_CALLS = METRICS.counter("agent_tool_calls_total", "Function tool calls", ("agent", "tool", "error"))
+TOOL_SECONDS = METRICS.histogram("agent_tool_duration_seconds", "Function tool execution time", ("agent", "tool"))
+DB_QUERIES = METRICS.counter("agent_db_queries_total", "SQLite statements executed", ("db",))
+DB_QUERY_SECONDS = METRICS.histogram(
+    "agent_db_query_seconds", "SQLite statement time", ("db",),
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0),
+)
+TTS_CHARACTERS = METRICS.counter("agent_tts_characters_total", "Characters sent to TTS", ("agent",))
+STT_AUDIO_SECONDS = METRICS.counter("agent_stt_audio_seconds_total", "Audio seconds sent to STT", ("agent",))
+LLM_TOKENS = METRICS.counter("agent_llm_tokens_total", "LLM tokens", ("agent", "kind"))
+LOOP_LAG_SECONDS = METRICS.histogram(
+    "agent_event_loop_lag_seconds", "How late a periodic event-loop timer fired", ("agent",), buckets=LAG_BUCKETS,
+)
+LOOP_STALLS = METRICS.counter(
+    "agent_event_loop_stalls_total", "Event-loop stalls over the watchdog threshold", ("agent", "tool"),
+)
+LOOP_STALL_SECONDS = METRICS.histogram(
+    "agent_event_loop_stall_seconds", "How long each event-loop stall blocked the loop", ("agent", "tool"),
+    buckets=LAG_BUCKETS,
+)
+ACTIVE_SESSIONS = METRICS.gauge("agent_active_sessions", "Sessions running in this process", ("agent",))
+
+
+async def monitor_loop_lag(agent: str, interval: float = LAG_INTERVAL_S):
+    """Records how late a sleep(interval) wakes up; runs until cancelled."""
+    hist = LOOP_LAG_SECONDS.labels(agent)
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        hist.observe(max(0.0, loop.time() - expected))
+
+
+def _rolling_turn_latency() -> Iterable[str]:
+    from .latency import TURN_LATENCY
+
+    name = "agent_turn_latency_rolling_seconds"
+    yield f"# HELP {name} Rolling per-stage turn latency percentiles over recent turns"
+    yield f"# TYPE {name} gauge"
+    for agent in TURN_LATENCY.agents():
+        for stage, v in TURN_LATENCY.percentiles(agent).items():
+            for q in ("p50", "p95", "p99"):
+                if v[q] is not None:
+                    labels = _label_str(("agent", "stage", "quantile"), (agent, stage, f"0.{q[1:]}"))
+                    yield f"{name}{labels} {_fmt(v[q])}"
+
+
+METRICS.add_collector(_rolling_turn_latency)
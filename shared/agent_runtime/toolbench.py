@@ -0,0 +1,284 @@
+"""
+Shared runtime – Function tool benchmarks
+
+Each day's benchmarks/bench_tools.py calls its agent's function tools directly
+(no session, LLM or audio) against synthetic data of a given size:
+- BenchCase(name, setup, sizes): setup(size, tmp) builds the data in the temp
+  directory `tmp`, patches the agent module to use it and returns the operation
+  to time. Async operations (tool calls) all run on one event loop
+- measure() picks a repeat count that fills --min-time, reports ops/sec and the
+  median time per call, then re-runs under tracemalloc for the peak memory one
+  call allocates and the bytes still held per call afterwards (a leak or an
+  ever-growing list shows up there). print() output goes to /dev/null and log
+  records at INFO and below are dropped while cases run
+- --save writes the results and the machine they ran on as a JSON baseline;
+  --compare fails the run when ops/sec falls more than --tolerance below it
+- the same cases run under pytest-benchmark: the bench files define
+  pytest_generate_tests and test_tool(benchmark, bench_case). There every call
+  enters the event loop on its own (tens of microseconds), so for the fast
+  in-memory tools the standalone numbers are the ones to read
+
+Baselines are only comparable on the same machine; they are not checked in.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+ROUNDS = 5
+MIN_TIME_S = 0.5
+TOLERANCE = 0.25
+ALLOC_CALLS = 200
+
+
+class ToolContext:
+    """Stands in for RunContext: the tools only read `ctx.userdata`."""
+
+    def __init__(self, userdata: Any):
+        self.userdata = userdata
+
+
+@dataclass
+class BenchCase:
+    name: str
+    setup: Callable[[int, str], Callable[[], Any]]
+    sizes: Sequence[int] = DEFAULT_SIZES
+
+
+@dataclass
+class Result:
+    ops_per_sec: float
+    median_us: float
+    min_us: float
+    peak_kib: float
+    retained_b_per_call: float
+    calls: int
+
+    def as_dict(self) -> Dict[str, float]:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in vars(self).items()}
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def bench_loop() -> asyncio.AbstractEventLoop:
+    """The loop every async operation runs on (tools may leave tasks or futures bound to it)."""
+    global _loop
+    if _loop is None or _loop.is_closed():
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop
+
+
+def _batch(op: Callable[[], Any]) -> Callable[[int], float]:
+    """Returns run(n) -> seconds for n back-to-back calls, timed inside the loop for async ops."""
+    if inspect.iscoroutinefunction(op):
+        async def many(n: int) -> float:
+            started = time.perf_counter()
+            for _ in range(n):
+                await op()
+            return time.perf_counter() - started
+
+        return lambda n: bench_loop().run_until_complete(many(n))
+
+    def run(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            op()
+        return time.perf_counter() - started
+
+    return run
+
+
+def call_once(op: Callable[[], Any]) -> Any:
+    if inspect.iscoroutinefunction(op):
+        return bench_loop().run_until_complete(op())
+    return op()
+
+
+@contextlib.contextmanager
+def _quiet():
+    # some tools print or log on every call; keep the report readable
+    logging.disable(logging.INFO)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+def allocations(op: Callable[[], Any], calls: int = ALLOC_CALLS) -> Tuple[float, float]:
+    """(peak KiB allocated by one call, bytes still held per call after `calls` calls)."""
+    run = _batch(op)
+    tracemalloc.start()
+    try:
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        run(1)
+        peak_kib = (tracemalloc.get_traced_memory()[1] - base) / 1024
+        run(calls - 1)
+        retained = (tracemalloc.get_traced_memory()[0] - base) / calls
+    finally:
+        tracemalloc.stop()
+    return peak_kib, retained
+
+
+def measure(op: Callable[[], Any], min_time: float = MIN_TIME_S, rounds: int = ROUNDS) -> Result:
+    run = _batch(op)
+    run(1)  # warm caches and lazy imports
+    n = 1
+    while True:
+        elapsed = run(n)
+        if elapsed >= min_time / rounds or n >= 1_000_000:
+            break
+        n = max(n * 2, int(n * (min_time / rounds) / max(elapsed, 1e-9)))
+    times = [run(n) / n for _ in range(rounds)]
+    median = statistics.median(times)
+    peak_kib, retained = allocations(op, min(ALLOC_CALLS, max(2, n)))
+    return Result(
+        ops_per_sec=1.0 / median,
+        median_us=median * 1e6,
+        min_us=min(times) * 1e6,
+        peak_kib=peak_kib,
+        retained_b_per_call=retained,
+        calls=n * rounds,
+    )
+
+
+def machine_info() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]]):
+    data = {"machine": machine_info(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float = TOLERANCE) -> List[str]:
+    """Regressions: results whose ops/sec fell more than `tolerance` below the baseline."""
+    regressions = []
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        floor = base["ops_per_sec"] * (1 - tolerance)
+        if cur["ops_per_sec"] < floor:
+            regressions.append(
+                f"{key}: {cur['ops_per_sec']:.1f} ops/s vs baseline {base['ops_per_sec']:.1f} "
+                f"({cur['ops_per_sec'] / base['ops_per_sec'] - 1:+.0%})"
+            )
+    return regressions
+
+
+def _key(agent: str, case: BenchCase, size: int) -> str:
+    return f"{agent}.{case.name}[{size}]"
+
+
+def run_cases(agent: str, cases: Sequence[BenchCase], sizes: Optional[Sequence[int]] = None,
+              only: Optional[str] = None, min_time: float = MIN_TIME_S,
+              report: Callable[[str, Result], None] = lambda key, r: None) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+    for case in cases:
+        if only and only not in case.name:
+            continue
+        for size in sizes or case.sizes:
+            tmp = tempfile.mkdtemp(prefix=f"toolbench-{agent}-")
+            try:
+                with _quiet():
+                    op = case.setup(size, tmp)
+                    result = measure(op, min_time)
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+            key = _key(agent, case, size)
+            results[key] = result.as_dict()
+            report(key, result)
+    return results
+
+
+def _print_row(key: str, r: Result):
+    print(f"{key:<44} {r.ops_per_sec:>12,.1f} {r.median_us:>12,.1f} {r.peak_kib:>10,.1f} "
+          f"{r.retained_b_per_call:>12,.1f}", flush=True)
+
+
+def run_suite(agent: str, cases: Sequence[BenchCase], argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point for a day's bench_tools.py; returns the exit status."""
+    parser = argparse.ArgumentParser(description=f"{agent} function tool benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", help="dataset sizes (default: per case)")
+    parser.add_argument("--only", help="run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_S, help="seconds of timing per case")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed ops/sec drop (fraction)")
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<44} {'ops/sec':>12} {'median us':>12} {'peak KiB':>10} {'held B/call':>12}")
+    results = run_cases(agent, cases, args.sizes, args.only, args.min_time, _print_row)
+
+    if args.save:
+        save_baseline(args.save, results)
+        print(f"saved {len(results)} results to {args.save}")
+    if args.compare:
+        regressions = compare(results, load_baseline(args.compare)["results"], args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+# ---- pytest-benchmark ----
+
+def parametrize(metafunc, cases: Sequence[BenchCase]):
+    """Call from pytest_generate_tests: one test per case and size (TOOLBENCH_SIZES overrides)."""
+    if "bench_case" not in metafunc.fixturenames:
+        return
+    env_sizes = os.environ.get("TOOLBENCH_SIZES")
+    override = [int(s) for s in env_sizes.split(",")] if env_sizes else None
+    params = [(case, size) for case in cases for size in (override or case.sizes)]
+    metafunc.parametrize("bench_case", params, ids=[f"{c.name}[{s}]" for c, s in params])
+
+
+def run_benchmark(benchmark, bench_case: Tuple[BenchCase, int]):
+    """Body of test_tool: times one case with the pytest-benchmark fixture."""
+    case, size = bench_case
+    tmp = tempfile.mkdtemp(prefix="toolbench-")
+    try:
+        with _quiet():
+            op = case.setup(size, tmp)
+            peak_kib, retained = allocations(op, calls=20)
+            benchmark.extra_info.update(peak_kib=round(peak_kib, 3), retained_b_per_call=round(retained, 3))
+            benchmark(call_once, op)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main(agent: str, cases: Sequence[BenchCase]):
+    sys.exit(run_suite(agent, cases))
@@ -0,0 +1,242 @@
+"""
+Shared runtime – Event-loop stall watchdog
+
+Several tools do blocking work on the event loop: sqlite3 in Day6/Day7,
+whole-file JSON rewrites in Day3/Day5/Day9, requests.post in Day2. While one
+runs, every session on that loop stops hearing and speaking. The watchdog
+finds these stalls:
+- a heartbeat on the loop sleeps HEARTBEAT_S at a time and measures how late
+  it wakes up (the loop's scheduling delay)
+- a monitor thread watches the heartbeat. When it is more than the threshold
+  overdue, the thread captures the loop thread's stack and the task that is
+  running, while the stall is still in progress
+- a stall inside a function tool is attributed to that tool: the innermost
+  frame of the captured stack whose code is a registered tool's code
+  (register_tools, called by SessionMetrics for each session's agent).
+  Other stalls are attributed to "none"; the running task's name is logged
+  either way
+- each stall is counted in agent_event_loop_stalls_total and
+  agent_event_loop_stall_seconds (telemetry.py), by agent and tool, and
+  logged with its stack (the full stack once per code location)
+
+SessionMetrics starts one watchdog per event loop and stops it when the last
+session on the loop ends. AGENT_LOOP_STALL_MS sets the threshold (default
+100); 0 turns the watchdog off. A loop that is slow because it is overloaded,
+rather than blocked, is also reported; its stack shows whatever callback was
+running at the time.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from types import CodeType
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from .telemetry import LOOP_STALL_SECONDS, LOOP_STALLS
+
+logger = logging.getLogger("agent_runtime")
+
+STALL_THRESHOLD_S = 0.1
+HEARTBEAT_S = 0.05
+STACK_DEPTH = 25
+RECENT_STALLS = 100
+NO_TOOL = "none"
+
+# code object of each registered tool's function -> tool name
+_TOOL_CODES: Dict[CodeType, str] = {}
+
+
+def stall_threshold() -> float:
+    """Threshold from AGENT_LOOP_STALL_MS; 0 (or less) turns the watchdog off."""
+    raw = os.environ.get("AGENT_LOOP_STALL_MS", "").strip()
+    if not raw:
+        return STALL_THRESHOLD_S
+    try:
+        return float(raw) / 1000
+    except ValueError:
+        logger.warning(f"ignoring AGENT_LOOP_STALL_MS={raw!r}")
+        return STALL_THRESHOLD_S
+
+
+@dataclass
+class Stall:
+    seconds: float
+    tool: str
+    task: Optional[str]
+    stack: List[str] = field(default_factory=list, repr=False)  # formatted frames, innermost last
+    at: float = field(default_factory=time.time)
+
+    @property
+    def location(self) -> str:
+        """The innermost frame, e.g. 'File ".../agent.py", line 166, in lookup_customer'."""
+        return self.stack[-1].strip().splitlines()[0] if self.stack else "?"
+
+
+def _tool_code(tool: Any) -> Optional[CodeType]:
+    """The code of the function behind a tool: a decorated function or bound method, or a FunctionTool wrapping one."""
+    fn = tool
+    while True:
+        inner = getattr(fn, "_func", None) or getattr(fn, "__func__", None) or getattr(fn, "__wrapped__", None)
+        if inner is None:
+            break
+        fn = inner
+    return getattr(fn, "__code__", None)
+
+
+def register_tools(tools: Iterable[Any]):
+    """Attribute stalls in these tools' frames to them; tools are agent.tools entries (any livekit-agents version)."""
+    for tool in tools:
+        code = _tool_code(tool)
+        if code is None:
+            continue
+        info = (getattr(tool, "info", None) or getattr(tool, "__livekit_tool_info", None)
+                or getattr(tool, "__livekit_raw_tool_info", None))
+        _TOOL_CODES[code] = getattr(info, "name", None) or code.co_name
+
+
+def _tool_in(frame) -> str:
+    """The registered tool running innermost on the stack ending at `frame`."""
+    while frame is not None:
+        tool = _TOOL_CODES.get(frame.f_code)
+        if tool is not None:
+            return tool
+        frame = frame.f_back
+    return NO_TOOL
+
+
+class LoopWatchdog:
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold: float = STALL_THRESHOLD_S,
+                 interval: float = HEARTBEAT_S):
+        self.loop = loop
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls: Deque[Stall] = deque(maxlen=RECENT_STALLS)
+        self.counts: Counter = Counter()  # tool -> stalls
+        self.worst = 0.0
+        self._agents: Counter = Counter()  # agent -> sessions holding the watchdog
+        self._holders = 0
+        self._expected: Optional[float] = None  # monotonic time the heartbeat is due
+        self._capture: Tuple[Optional[float], Optional[Tuple[str, Optional[str], List[str]]]] = (None, None)
+        self._loop_thread: Optional[int] = None
+        self._logged: Set[Tuple[str, str]] = set()
+        self._stop = threading.Event()
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def agent(self) -> str:
+        """The agent label for the metrics; "shared" when sessions of several agents run on this loop."""
+        agents = [a for a, n in self._agents.items() if n > 0]
+        return agents[0] if len(agents) == 1 else "shared"
+
+    def acquire(self, agent: Optional[str] = None):
+        """One more session (of `agent`) on this loop; None observes without naming an agent."""
+        self._holders += 1
+        if agent is not None:
+            self._agents[agent] += 1
+        if self._heartbeat is None:
+            self._stop.clear()
+            self._heartbeat = self.loop.create_task(self._beat())
+            self._thread = threading.Thread(target=self._monitor, name="loop-watchdog", daemon=True)
+            self._thread.start()
+
+    def release(self, agent: Optional[str] = None):
+        self._holders -= 1
+        if agent is not None:
+            self._agents[agent] -= 1
+        if self._holders <= 0:
+            self.stop()
+
+    def stop(self):
+        self._holders = 0
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        self._expected = None
+        if _WATCHDOGS.get(self.loop) is self:
+            del _WATCHDOGS[self.loop]
+
+    async def _beat(self):
+        self._loop_thread = threading.get_ident()
+        while True:
+            self._expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self._expected
+            if lag >= self.threshold:
+                self._record(lag)
+
+    def _monitor(self):
+        while not self._stop.wait(self.threshold / 2):
+            if self.loop.is_closed():
+                return
+            expected = self._expected
+            if expected is None or self._capture[0] == expected:
+                continue
+            if time.monotonic() - expected >= self.threshold:
+                self._capture = (expected, self._snapshot())
+
+    def _snapshot(self) -> Tuple[str, Optional[str], List[str]]:
+        """The tool on the loop thread's stack, the running task's name and the stack; called from the monitor thread."""
+        try:
+            task = asyncio.current_task(self.loop)
+        except RuntimeError:
+            task = None
+        frame = sys._current_frames().get(self._loop_thread)
+        stack = traceback.format_list(traceback.extract_stack(frame)[-STACK_DEPTH:]) if frame is not None else []
+        return _tool_in(frame), (task.get_name() if task is not None else None), stack
+
+    def _record(self, lag: float):
+        expected, snapshot = self._capture
+        tool, task, stack = snapshot if snapshot is not None and expected == self._expected else (NO_TOOL, None, [])
+        stall = Stall(seconds=lag, tool=tool, task=task, stack=stack)
+        self.stalls.append(stall)
+        self.counts[tool] += 1
+        self.worst = max(self.worst, lag)
+        agent = self.agent
+        LOOP_STALLS.labels(agent, tool).inc()
+        LOOP_STALL_SECONDS.labels(agent, tool).observe(lag)
+
+        key = (tool, stall.location)
+        if stack and key not in self._logged:
+            self._logged.add(key)
+            logger.warning(f"event loop blocked {lag * 1000:.0f} ms in tool {tool} (task {task}):\n{''.join(stack)}")
+        else:
+            logger.warning(f"event loop blocked {lag * 1000:.0f} ms in tool {tool} (task {task}) at {stall.location}")
+
+    def describe(self) -> str:
+        if not self.counts:
+            return "loop stalls: none"
+        by_tool = ", ".join(f"{tool} {n}" for tool, n in self.counts.most_common())
+        return (f"loop stalls over {self.threshold * 1000:.0f} ms: {sum(self.counts.values())} ({by_tool}), "
+                f"worst {self.worst * 1000:.0f} ms")
+
+
+_WATCHDOGS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopWatchdog]" = weakref.WeakKeyDictionary()
+
+
+def watch_loop(agent: Optional[str] = None, threshold: Optional[float] = None) -> Optional[LoopWatchdog]:
+    """The running loop's watchdog, started on first use and held once more; call release(agent) when done.
+
+    None when the watchdog is turned off or there is no running loop.
+    """
+    threshold = stall_threshold() if threshold is None else threshold
+    if threshold <= 0:
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+    watchdog = _WATCHDOGS.get(loop)
+    if watchdog is None:
+        watchdog = _WATCHDOGS[loop] = LoopWatchdog(loop, threshold=threshold)
+    watchdog.acquire(agent)
+    return watchdog
+
@@ -0,0 +1,257 @@
+"""
+Shared runtime – Concurrent sessions against one worker process
+
+Loads the days' agent modules the way the router worker does (one process,
+each module imported once) and drives N simulated sessions against them with
+agent_runtime.loadgen: a local room stand-in (real-time mic and speaker) and
+the offline STT / LLM / TTS fakes with fixed latencies. Every session plays
+its day's turn script in a loop, and the turns call the day's real function
+tools against its real storage. Each N runs in a fresh child process and
+reports:
+    - throughput: completed turns and tool calls per second
+    - turn latency p50/p95/p99 (end of caller speech to first reply audio),
+      and the part above the fakes' fixed latencies (worker overhead)
+    - event-loop lag p50/p99/max, sampled every 50 ms, and the loop watchdog's
+      stalls by function tool (agent_runtime/watchdog.py)
+    - CPU use and RSS growth per session
+
+The day sources are copied to a temporary directory first, so the orders,
+logs and databases the sessions write do not land in the repo.
+
+Usage (from any day's backend/, for its environment):
+    uv run ../../shared/benchmarks/bench_load.py --sessions 10,50,100 --duration 60
+    uv run ../../shared/benchmarks/bench_load.py --days day6,day7 --sessions 20 --json load.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import replace
+
+SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, SHARED_DIR)
+
+from agent_runtime.fakes import FakeToolCall  # noqa: E402
+from agent_runtime.loadgen import PluginLatency, ScriptedTurn  # noqa: E402
+
+
+def call(tool: str, **arguments) -> FakeToolCall:
+    return FakeToolCall(tool, arguments)
+
+
+# What a caller says to each day, and the tool calls the LLM answers with. Every
+# script ends where it can start again, so sessions loop it for the whole run.
+TURNS = {
+    "day1": [
+        ScriptedTurn("hi there how are you doing today", "I'm doing well, thanks for asking. What can I do for you?"),
+        ScriptedTurn("tell me something interesting about octopuses",
+                     "Octopuses have three hearts, and two of them stop while they swim."),
+    ],
+    "day2": [
+        ScriptedTurn("I would like a large latte please", "A large latte. Which milk would you like?",
+                     [call("update_order_field", field="drinkType", value="latte"),
+                      call("update_order_field", field="size", value="large")]),
+        ScriptedTurn("oat milk with extra caramel", "Oat milk with caramel. What name should I put on it?",
+                     [call("update_order_field", field="milk", value="oat"),
+                      call("update_order_field", field="extras", value="caramel")]),
+        ScriptedTurn("my name is Sam and that is all", "Thanks Sam, your order is in.",
+                     [call("update_order_field", field="name", value="Sam"), call("send_order_to_server")]),
+    ],
+    "day3": [
+        ScriptedTurn("I am feeling calm today", "Calm is a good place to start. How is your energy?",
+                     [call("set_mood", mood="calm")]),
+        ScriptedTurn("my energy is pretty high", "Great. What would you like to get done today?",
+                     [call("set_energy", energy="high")]),
+        ScriptedTurn("I want to go for a long walk", "A long walk, noted. Anything else?",
+                     [call("add_goal", goal="go for a long walk")]),
+        ScriptedTurn("no that is everything", "Thanks for checking in. I'll remember this for next time.",
+                     [call("finalize_checkin")]),
+    ],
+    "day4": [
+        ScriptedTurn("let us study java basics", "Java basics it is. Do you want to learn, be quizzed, or teach it back?",
+                     [call("select_topic", topic_id="java_basics")]),
+        ScriptedTurn("a variable is a named box that holds a value of one type",
+                     "Nice explanation. I'd give that an eight: mention that the type is fixed at declaration.",
+                     [call("evaluate_teaching", user_explanation="a variable is a named box that holds a value of one type")]),
+    ],
+    "day5": [
+        ScriptedTurn("hi I am Priya from Acme Optics", "Nice to meet you Priya. What's the best email to reach you?",
+                     [call("update_lead_profile", name="Priya", company="Acme Optics")]),
+        ScriptedTurn("it is priya at acme dot com and we are a team of forty",
+                     "Got it. When are you looking to get started?",
+                     [call("update_lead_profile", email="priya@acme.com", team_size="40")]),
+        ScriptedTurn("sometime next quarter", "Thanks Priya, I've saved your details.",
+                     [call("update_lead_profile", timeline="next quarter"), call("submit_lead_and_end")]),
+    ],
+    "day6": [
+        ScriptedTurn("hi this is John", "Thanks John. Can you confirm your security identifier?",
+                     [call("lookup_customer", name="John")]),
+        ScriptedTurn("it is one two three four five and I did not make that purchase",
+                     "Thank you. I've blocked the card and marked the transaction as fraud.",
+                     [call("resolve_fraud_case", status="confirmed_fraud", notes="Customer denied the purchase.")]),
+    ],
+    "day7": [
+        ScriptedTurn("do you have any milk", "We have fresh milk, one litre. Want some?", [call("find_item", query="milk")]),
+        ScriptedTurn("add two bottles of milk", "Added two fresh milk to your cart.",
+                     [call("add_to_cart", item_id="milk-1l", quantity=2)]),
+        ScriptedTurn("place the order for Sam at one Main Street", "Your order is placed and on its way.",
+                     [call("place_order", customer_name="Sam", address="1 Main Street")]),
+        ScriptedTurn("what did I order before", "Here are your recent orders.",
+                     [call("order_history", customer_name="Sam")]),
+    ],
+    "day8": [
+        ScriptedTurn("start the adventure my name is Kai", "Welcome Kai. You wake beside a damaged escape pod.",
+                     [call("start_adventure", player_name="Kai")]),
+        ScriptedTurn("inspect the damaged escape pod", "You pry open the hatch and find a flickering beacon.",
+                     [call("player_action", action="inspect the damaged escape pod")]),
+        ScriptedTurn("what is in my journal", "Your journal has one entry.", [call("show_journal")]),
+    ],
+    "day9": [
+        ScriptedTurn("my name is Ana", "Nice to meet you Ana.", [call("set_customer_name", name="Ana")]),
+        ScriptedTurn("show me some mugs", "Here are the mugs I found.", [call("show_catalog", category="mug")]),
+        ScriptedTurn("add the second one to my cart", "Added to your cart.",
+                     [call("add_to_cart", product_ref="the second one")]),
+        ScriptedTurn("place the order", "Your order is placed.", [call("place_order")]),
+        ScriptedTurn("show my order history", "Here are your recent orders.", [call("order_history")]),
+    ],
+    "day10": [
+        ScriptedTurn("start the show I am Ada", "Welcome Ada! Here's your first scene.",
+                     [call("start_show", name="Ada", max_rounds=3)]),
+        ScriptedTurn("I am the ship's cat and I demand to see the captain right now",
+                     "Bold choice! The crew is still laughing.",
+                     [call("record_performance", performance="I am the ship's cat and I demand to see the captain right now")]),
+        ScriptedTurn("next scene please", "Here's your next scene.", [call("next_scenario")]),
+    ],
+}
+
+
+def _userdata(module):
+    """A fresh Userdata as the day's entrypoint builds it (None for days without one)."""
+    if not hasattr(module, "Userdata"):
+        return None
+    if hasattr(module, "WellnessState"):
+        return module.Userdata(wellness=module.WellnessState())
+    if hasattr(module, "TutorState"):
+        return module.Userdata(tutor_state=module.TutorState())
+    if hasattr(module, "LeadProfile"):
+        return module.Userdata(lead_profile=module.LeadProfile())
+    return module.Userdata()
+
+
+def run_child(root: str, names: list, sessions: int, args) -> dict:
+    import asyncio
+    import contextlib
+    import io
+    import logging
+
+    from agent_runtime.loadgen import Script, run_load
+    from agent_runtime.router import TENANTS, load_agent_module
+
+    logging.basicConfig(level=logging.ERROR)
+    os.chdir(root)
+    scripts = []
+    with contextlib.redirect_stdout(io.StringIO()):  # several days print banners at import
+        for t in TENANTS:
+            if t.name not in names:
+                continue
+            t = replace(t, src_dir=os.path.join(root, os.path.relpath(t.src_dir, os.path.dirname(SHARED_DIR))))
+            module = load_agent_module(t)
+            scripts.append(Script(
+                t.name, getattr(module, t.agent_class), TURNS[t.name],
+                userdata=lambda module=module: _userdata(module),
+            ))
+
+    latency = PluginLatency(stt=args.stt_latency, llm_ttft=args.llm_ttft, tts_ttfb=args.tts_ttfb,
+                            endpointing=args.endpointing)
+    with contextlib.redirect_stdout(io.StringIO()):  # tools print as they run
+        report = asyncio.run(run_load(scripts, sessions, args.duration, latency=latency, think_s=args.think,
+                                      ramp_s=args.ramp, frame_ms=args.frame_ms))
+    return report.as_dict()
+
+
+def _spawn(root: str, names: list, sessions: int, argv: list) -> dict:
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *argv,
+         "--child", ",".join(names), "--root", root, "--sessions", str(sessions)],
+        capture_output=True, text=True,
+    )
+    if out.returncode != 0:
+        sys.stderr.write(out.stderr[-4000:])
+        raise SystemExit(f"load run with {sessions} sessions failed")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _ms(value) -> str:
+    return "   -  " if value is None else f"{value * 1000:6.0f}"
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--child", help=argparse.SUPPRESS)
+    p.add_argument("--root", help=argparse.SUPPRESS)
+    p.add_argument("--days", default="", help="comma-separated tenants to spread sessions over (default: all ten)")
+    p.add_argument("--sessions", default="10,50,100", help="comma-separated session counts, one run each")
+    p.add_argument("--duration", type=float, default=30.0, help="seconds of load per run, after the ramp")
+    p.add_argument("--ramp", type=float, default=5.0, help="seconds over which the sessions start")
+    p.add_argument("--think", type=float, default=1.0, help="mean caller pause before each turn, seconds")
+    p.add_argument("--frame-ms", type=int, default=20, help="microphone frame size")
+    p.add_argument("--stt-latency", type=float, default=PluginLatency.stt)
+    p.add_argument("--llm-ttft", type=float, default=PluginLatency.llm_ttft)
+    p.add_argument("--tts-ttfb", type=float, default=PluginLatency.tts_ttfb)
+    p.add_argument("--endpointing", type=float, default=PluginLatency.endpointing,
+                   help="the sessions' min_endpointing_delay")
+    p.add_argument("--json", help="write every run's report to this file")
+    args = p.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.root, args.child.split(","), int(args.sessions), args)))
+        return
+
+    names = [n for n in args.days.split(",") if n] or list(TURNS)
+    unknown = [n for n in names if n not in TURNS]
+    if unknown:
+        p.error(f"no turn script for {', '.join(unknown)}")
+    forwarded = ["--duration", str(args.duration), "--ramp", str(args.ramp), "--think", str(args.think),
+                 "--frame-ms", str(args.frame_ms), "--stt-latency", str(args.stt_latency),
+                 "--llm-ttft", str(args.llm_ttft), "--tts-ttfb", str(args.tts_ttfb),
+                 "--endpointing", str(args.endpointing)]
+
+    from agent_runtime.router import TENANTS
+
+    repo_root = os.path.dirname(SHARED_DIR)
+    results = []
+    print(f"days: {','.join(names)}  duration={args.duration:g}s  think={args.think:g}s  "
+          f"fakes: stt={args.stt_latency:g}s llm_ttft={args.llm_ttft:g}s tts_ttfb={args.tts_ttfb:g}s  "
+          f"endpointing={args.endpointing:g}s")
+    print("sessions  turns/s  tools/s  timeouts  turn p50   p95   p99 ms  over floor p95  "
+          "lag p50  p99   max ms  stalls  cpu   rss MB (+/session)")
+    for n in [int(s) for s in args.sessions.split(",") if s]:
+        # a fresh copy per run: every run starts from the same data
+        with tempfile.TemporaryDirectory() as root:
+            for t in TENANTS:
+                if t.name in names:
+                    shutil.copytree(t.src_dir, os.path.join(root, os.path.relpath(t.src_dir, repo_root)),
+                                    ignore=shutil.ignore_patterns("__pycache__", "*.sqlite-wal", "*.sqlite-shm"))
+            r = _spawn(root, names, n, forwarded)
+        results.append(r)
+        lat, over, lag = r["latency_s"], r["overhead_s"], r["loop_lag_s"]
+        rss = (f"{r['rss_peak_mb']:7.1f} (+{r['rss_per_session_mb']:.2f})" if r["rss_peak_mb"] is not None else "-")
+        print(f"{n:8d}  {r['turns_per_s']:7.2f}  {r['tool_calls'] / r['duration_s']:7.2f}  {r['timeouts']:8d}  "
+              f"{_ms(lat['p50'])} {_ms(lat['p95'])} {_ms(lat['p99'])}     {_ms(over['p95'])}      "
+              f"{_ms(lag['p50'])} {_ms(lag['p99'])} {_ms(lag['max'])}  {sum(r['stalls'].values()):6d}  "
+              f"{r['cpu_util']:4.0%}  {rss}"
+              + (f"  FAILED {r['failed_sessions']}" if r["failed_sessions"] else ""))
+        if r["stalls"]:
+            print("          stalls by tool: " + ", ".join(f"{tool} {n}" for tool, n in r["stalls"].items()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"days": names, "args": vars(args), "runs": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Shared runtime – Session model setup, cold vs warm
+
+Times what a job spends getting its models before the session can start:
+    - cold: a process whose registry was never warmed (every job before this
+      change paid the VAD load in prewarm and the turn-detector setup itself)
+    - warm: the registry was warmed in prewarm; jobs only pick up instances
+
+The turn detector can only be built inside a job (it needs the job's inference
+executor) and needs `download-files`, so it is left out unless --turn-detector
+is given and the model is in the local cache.
+
+Usage (from any day's backend/, for its environment):
+    uv run ../../shared/benchmarks/bench_prewarm.py --jobs 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from agent_runtime import models
+
+
+def _registry(turn_detector: bool) -> models.ModelRegistry:
+    registry = models.ModelRegistry()
+    registry.register("vad", models._vad_loader)
+    registry.register("noise_cancellation", models._noise_cancellation_loader, check=models._noise_cancellation_check)
+    if turn_detector:
+        registry.register("turn_detector_files", models._turn_detector_check)
+    return registry
+
+
+def _job(registry: models.ModelRegistry, n: int) -> float:
+    started = time.perf_counter()
+    models.acquire_session_models(f"job-{n}", registry)
+    models.STARTUPS.finish(f"job-{n}")
+    return time.perf_counter() - started
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--jobs", type=int, default=20)
+    p.add_argument("--turn-detector", action="store_true")
+    args = p.parse_args()
+
+    cold = [_job(_registry(args.turn_detector), n) for n in range(args.jobs)]
+
+    registry = _registry(args.turn_detector)
+    started = time.perf_counter()
+    registry.warm()
+    prewarm_s = time.perf_counter() - started
+    warm = [_job(registry, n) for n in range(args.jobs)]
+
+    print(f"prewarm (once per process): {prewarm_s * 1000:.1f} ms  [{registry.describe()}]")
+    print(f"cold job model setup: median {statistics.median(cold) * 1000:.2f} ms")
+    print(f"warm job model setup: median {statistics.median(warm) * 1000:.4f} ms")
+
+
+if __name__ == "__main__":
+    main()
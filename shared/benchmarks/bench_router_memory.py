@@ -0,0 +1,115 @@
+"""
+Shared runtime – Ten workers vs one router worker, memory
+
+Each measurement runs in a fresh child process that does what a worker does
+before its first job: import the plugins, load the VAD (prewarm) and import
+the day's agent module (catalogs, scenario banks, DB seeding). Compares:
+    - separate: ten children, one per day (today's ten `cli.run_app` workers)
+    - router: one child that loads all ten days and a single VAD
+
+RSS double-counts shared library pages across processes, so PSS (Linux) is
+reported as well; it is the fairer sum. Not included: the turn-detector model,
+which each worker loads once in its own inference process, so the separate
+setup pays it ten times and the router once.
+
+The day sources are copied to a temporary directory first, so data files the
+agents create at import time do not land in the repo.
+
+Usage (from any day's backend/, for its environment):
+    uv run ../../shared/benchmarks/bench_router_memory.py
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import replace
+
+SHARED_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, SHARED_DIR)
+
+
+def _memory() -> dict:
+    import psutil
+
+    proc = psutil.Process()
+    info = proc.memory_full_info() if hasattr(proc, "memory_full_info") else proc.memory_info()
+    return {
+        "rss_mb": info.rss / 1e6,
+        "pss_mb": getattr(info, "pss", info.rss) / 1e6,
+        "uss_mb": getattr(info, "uss", info.rss) / 1e6,
+    }
+
+
+def run_child(root: str, names: list):
+    import contextlib
+    import io
+    import time
+
+    from agent_runtime.router import TENANTS, Router
+    from agent_runtime.session import shared_vad
+
+    os.chdir(root)
+    tenants = [replace(t, src_dir=os.path.join(root, os.path.relpath(t.src_dir, os.path.dirname(SHARED_DIR))))
+               for t in TENANTS if t.name in names]
+    router = Router(tenants)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # several days print banners at import
+        shared_vad()
+        failed = router.load_all()
+    result = {"tenants": names, "failed": failed, "load_s": time.perf_counter() - started, **_memory()}
+    print(json.dumps(result))
+
+
+def _spawn(root: str, names: list) -> dict:
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", ",".join(names), "--root", root],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--child", help=argparse.SUPPRESS)
+    p.add_argument("--root", help=argparse.SUPPRESS)
+    p.add_argument("--days", default="", help="comma-separated tenants to compare (default: all ten)")
+    args = p.parse_args()
+
+    if args.child:
+        run_child(args.root, args.child.split(","))
+        return
+
+    from agent_runtime.router import TENANTS
+
+    names = [n for n in args.days.split(",") if n] or [t.name for t in TENANTS]
+    repo_root = os.path.dirname(SHARED_DIR)
+    with tempfile.TemporaryDirectory() as root:
+        for t in TENANTS:
+            if t.name in names:
+                rel = os.path.relpath(t.src_dir, repo_root)
+                shutil.copytree(t.src_dir, os.path.join(root, rel),
+                                ignore=shutil.ignore_patterns("__pycache__", "*.sqlite-wal", "*.sqlite-shm"))
+
+        separate = []
+        for name in names:
+            r = _spawn(root, [name])
+            separate.append(r)
+            print(f"  {name:6s} rss={r['rss_mb']:7.1f} MB  pss={r['pss_mb']:7.1f} MB  load={r['load_s']:.2f}s"
+                  + (f"  FAILED {r['failed']}" if r["failed"] else ""))
+        router = _spawn(root, names)
+
+    total = {k: sum(r[k] for r in separate) for k in ("rss_mb", "pss_mb", "uss_mb")}
+    print(f"separate ({len(names)} workers): rss={total['rss_mb']:.1f} MB  pss={total['pss_mb']:.1f} MB  "
+          f"uss={total['uss_mb']:.1f} MB")
+    print(f"router   (1 worker):   rss={router['rss_mb']:.1f} MB  pss={router['pss_mb']:.1f} MB  "
+          f"uss={router['uss_mb']:.1f} MB" + (f"  FAILED {router['failed']}" if router["failed"] else ""))
+    print(f"saved: {total['pss_mb'] - router['pss_mb']:.1f} MB PSS "
+          f"({total['pss_mb'] / max(router['pss_mb'], 1e-9):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
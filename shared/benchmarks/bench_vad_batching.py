@@ -0,0 +1,108 @@
+"""
+Shared runtime – VAD sessions per core, batched vs unbatched
+
+Simulates N concurrent sessions in one worker process, each feeding a 32 ms
+Silero window in real time (one thread per session, like the executor calls
+VADStream makes), for:
+    - single: one OnnxModel call per window per session (the silero plugin)
+    - batched: windows from all sessions go through the InferenceBroker
+
+Reports CPU cores used (process CPU time / wall time), the implied sessions per
+core, per-window latency and windows that missed their 32 ms slot.
+
+Usage (from any day's backend/, for its environment):
+    uv run ../../shared/benchmarks/bench_vad_batching.py --sessions 10,25,50 --seconds 5
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from livekit.plugins.silero import onnx_model
+
+from agent_runtime.batching import (
+    VAD_MAX_BATCH,
+    VAD_MAX_WAIT_S,
+    BrokeredOnnxModel,
+    InferenceBroker,
+    silero_batch_runner,
+)
+
+WINDOW_S = 0.032
+SAMPLE_RATE = 16000
+
+
+def run(models, seconds: float):
+    rng = np.random.default_rng(0)
+    windows = rng.normal(0, 0.05, (64, 512)).astype(np.float32)
+    latencies = [[] for _ in models]
+    missed = [0] * len(models)
+    start = time.monotonic() + 0.05
+
+    def session(i):
+        model = models[i]
+        tick = start + (i / len(models)) * WINDOW_S  # sessions are not phase-aligned
+        n = 0
+        while tick < start + seconds:
+            delay = tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            t = time.monotonic()
+            model(windows[n % len(windows)])
+            done = time.monotonic()
+            latencies[i].append(done - t)
+            if done > tick + WINDOW_S:
+                missed[i] += 1
+            n += 1
+            tick += WINDOW_S
+
+    threads = [threading.Thread(target=session, args=(i,)) for i in range(len(models))]
+    cpu0, wall0 = time.process_time(), time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    cpu, wall = time.process_time() - cpu0, time.monotonic() - wall0
+    flat = sorted(x for lat in latencies for x in lat)
+    return {
+        "cores": cpu / wall,
+        "windows": len(flat),
+        "p50_ms": statistics.median(flat) * 1000,
+        "p95_ms": flat[int(len(flat) * 0.95)] * 1000,
+        "missed": sum(missed),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument("--sessions", default="10,25,50")
+    p.add_argument("--seconds", type=float, default=5.0)
+    p.add_argument("--max-wait-ms", type=float, default=VAD_MAX_WAIT_S * 1000)
+    args = p.parse_args()
+
+    session = onnx_model.new_inference_session(True)
+    print(f"{'mode':8s} {'sessions':>8s} {'cores':>6s} {'sess/core':>9s} {'p50':>7s} {'p95':>7s} {'missed':>7s}  batch")
+    for n in (int(x) for x in args.sessions.split(",")):
+        single = [onnx_model.OnnxModel(onnx_session=session, sample_rate=SAMPLE_RATE) for _ in range(n)]
+        r = run(single, args.seconds)
+        print(f"{'single':8s} {n:8d} {r['cores']:6.2f} {n / max(r['cores'], 1e-9):9.1f} "
+              f"{r['p50_ms']:6.2f}ms {r['p95_ms']:6.2f}ms {r['missed']:7d}")
+
+        broker = InferenceBroker(silero_batch_runner(session, SAMPLE_RATE), max_batch=VAD_MAX_BATCH,
+                                 max_wait_s=args.max_wait_ms / 1000, name="vad")
+        batched = [BrokeredOnnxModel(broker, SAMPLE_RATE) for _ in range(n)]
+        r = run(batched, args.seconds)
+        broker.close()
+        print(f"{'batched':8s} {n:8d} {r['cores']:6.2f} {n / max(r['cores'], 1e-9):9.1f} "
+              f"{r['p50_ms']:6.2f}ms {r['p95_ms']:6.2f}ms {r['missed']:7d}  mean {broker.mean_batch:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Shared runtime – Function tool benchmarks for every day
+
+Runs each DayN/backend/benchmarks/bench_tools.py in its own process (every day
+has a module called `agent`) and merges their results into one baseline, or
+checks all days against one.
+
+Usage (from any day's backend/, for its environment):
+    uv run ../../shared/benchmarks/run_tools.py --sizes 1000 10000 --save tool_baseline.json
+    uv run ../../shared/benchmarks/run_tools.py --compare tool_baseline.json
+    uv run ../../shared/benchmarks/run_tools.py --days 6 7 --only find
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+sys.path.insert(0, os.path.join(ROOT, "shared"))
+
+from agent_runtime.toolbench import MIN_TIME_S, TOLERANCE, save_baseline  # noqa: E402
+
+
+def bench_file(day: int) -> str:
+    return os.path.join(ROOT, f"Day{day}", "backend", "benchmarks", "bench_tools.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, nargs="+", default=list(range(1, 11)))
+    parser.add_argument("--sizes", type=int, nargs="+")
+    parser.add_argument("--only")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_S)
+    parser.add_argument("--save")
+    parser.add_argument("--compare")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    forwarded = ["--min-time", str(args.min_time), "--tolerance", str(args.tolerance)]
+    if args.sizes:
+        forwarded += ["--sizes", *map(str, args.sizes)]
+    if args.only:
+        forwarded += ["--only", args.only]
+    if args.compare:
+        forwarded += ["--compare", os.path.abspath(args.compare)]
+
+    merged = {}
+    failed = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for day in args.days:
+            path = bench_file(day)
+            if not os.path.exists(path):
+                print(f"== Day{day}: no function tools to benchmark")
+                continue
+            print(f"== Day{day}", flush=True)
+            out = os.path.join(tmp, f"day{day}.json")
+            proc = subprocess.run([sys.executable, path, "--save", out, *forwarded], cwd=os.path.dirname(os.path.dirname(path)))
+            if proc.returncode != 0:
+                failed.append(day)
+            if os.path.exists(out):
+                with open(out, encoding="utf-8") as f:
+                    merged.update(json.load(f)["results"])
+
+    if args.save:
+        save_baseline(args.save, merged)
+        print(f"saved {len(merged)} results to {args.save}")
+    if failed:
+        print(f"regressions or errors in: {', '.join(f'Day{d}' for d in failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
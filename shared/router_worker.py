@@ -0,0 +1,48 @@
+"""
+Multi-tenant worker: every day's agent in one process.
+
+Usage (from any day's backend/, which has the full dependency set):
+    uv run ../../shared/router_worker.py dev
+    uv run ../../shared/router_worker.py start
+
+Environment:
+    ROUTER_DEFAULT_AGENT   tenant for rooms that match nothing (e.g. "day1"); unset rejects them
+    ROUTER_LIMITS          per-tenant session limits, e.g. "day6=4,day9=16"
+    ROUTER_BATCH_VAD       "0" gives every session its own VAD model calls instead of
+                           micro-batching them across sessions (default on)
+"""
+
+import os
+import sys
+from dataclasses import replace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+from livekit.agents import cli
+
+from agent_runtime.batching import load_batched_vad
+from agent_runtime.models import MODELS
+from agent_runtime.router import TENANTS, Router
+
+load_dotenv(".env.local")
+
+
+def _limits(spec: str):
+    limits = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, value = part.partition("=")
+        limits[name.strip().lower()] = int(value)
+    return limits
+
+
+def build_router() -> Router:
+    limits = _limits(os.environ.get("ROUTER_LIMITS", ""))
+    tenants = [replace(t, max_sessions=limits.get(t.name, t.max_sessions)) for t in TENANTS]
+    return Router(tenants, default=os.environ.get("ROUTER_DEFAULT_AGENT") or None)
+
+
+if __name__ == "__main__":
+    if os.environ.get("ROUTER_BATCH_VAD", "1") != "0":
+        MODELS.register("vad", load_batched_vad)
+    cli.run_app(build_router().worker_options())
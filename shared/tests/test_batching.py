@@ -0,0 +1,81 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from agent_runtime.batching import (
+    BrokeredOnnxModel,
+    InferenceBroker,
+    load_batched_vad,
+    silero_batch_runner,
+)
+
+
+def test_broker_batches_concurrent_requests():
+    seen_sizes = []
+
+    def run(items):
+        seen_sizes.append(len(items))
+        return [x * 2 for x in items]
+
+    broker = InferenceBroker(run, max_batch=8, max_wait_s=0.05)
+    futures = [broker.submit(i) for i in range(8)]
+    assert [f.result(timeout=1) for f in futures] == [i * 2 for i in range(8)]
+    broker.close()
+    assert seen_sizes == [8]  # a full batch goes out before the budget expires
+    assert broker.mean_batch == 8
+
+
+def test_broker_latency_budget_bounds_a_lone_request():
+    broker = InferenceBroker(lambda items: items, max_batch=64, max_wait_s=0.01)
+    started = time.monotonic()
+    assert broker("solo") == "solo"
+    assert time.monotonic() - started < 0.5
+    broker.close()
+    assert broker.batches == 1
+
+
+def test_broker_propagates_batch_errors():
+    broker = InferenceBroker(lambda items: 1 / 0, max_wait_s=0.001)
+    with pytest.raises(ZeroDivisionError):
+        broker(1)
+    broker.close()
+    with pytest.raises(RuntimeError):
+        broker.submit(1)
+
+
+def test_batched_silero_matches_single_stream_model():
+    from livekit.plugins.silero import onnx_model
+
+    session = onnx_model.new_inference_session(True)
+    broker = InferenceBroker(silero_batch_runner(session, 16000), max_batch=4, max_wait_s=0.02)
+    rng = np.random.default_rng(7)
+    audio = [rng.normal(0, 0.1, (5, 512)).astype(np.float32) for _ in range(4)]
+
+    expected = []
+    for stream in audio:
+        single = onnx_model.OnnxModel(onnx_session=session, sample_rate=16000)
+        expected.append([single(w) for w in stream])
+
+    got = [[] for _ in audio]
+
+    def run_stream(i):
+        model = BrokeredOnnxModel(broker, 16000)
+        for w in audio[i]:
+            got[i].append(model(w))
+
+    threads = [threading.Thread(target=run_stream, args=(i,)) for i in range(len(audio))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    broker.close()
+    np.testing.assert_allclose(np.array(got), np.array(expected), rtol=1e-4, atol=1e-6)
+    assert broker.largest_batch > 1
+
+
+def test_batched_vad_streams_use_the_broker():
+    vad = load_batched_vad(max_wait_s=0.001)
+    assert isinstance(vad.broker, InferenceBroker)
+    vad.broker.close()
@@ -0,0 +1,71 @@
+import time
+
+from livekit.agents import Agent, AgentSession, RunContext, function_tool, stt
+
+from agent_runtime.fakes import (
+    FakeLLM,
+    FakeResponse,
+    FakeSTT,
+    FakeToolCall,
+    FakeTTS,
+    utterance_frames,
+)
+
+
+class LookupAgent(Agent):
+    def __init__(self):
+        super().__init__(instructions="test")
+
+    @function_tool
+    async def lookup(self, ctx: RunContext, name: str) -> str:
+        """Look someone up."""
+        return f"found {name}"
+
+
+async def test_llm_script_with_tool_round():
+    llm = FakeLLM([FakeResponse(tool_calls=[FakeToolCall("lookup", {"name": "ann"})], then="Result: {output}")])
+    async with llm, AgentSession(llm=llm) as session:
+        await session.start(LookupAgent())
+        result = await session.run(user_input="who is ann")
+        result.expect.next_event().is_function_call(name="lookup", arguments={"name": "ann"})
+        result.expect.next_event().is_function_call_output(output="found ann")
+        msg = result.expect.next_event().is_message(role="assistant").event().item
+        assert msg.text_content == "Result: found ann"
+        result.expect.no_more_events()
+    assert llm.requests == ["who is ann", "who is ann"]
+
+
+async def test_llm_rules_default_and_ttft():
+    llm = FakeLLM(rules=[FakeResponse(text="Ten dollars.", when="price")], default="Sorry?", ttft=0.05)
+    async with llm, AgentSession(llm=llm) as session:
+        await session.start(LookupAgent())
+        started = time.perf_counter()
+        result = await session.run(user_input="What's the PRICE?")
+        assert time.perf_counter() - started >= 0.05
+        assert result.expect.next_event().is_message(role="assistant").event().item.text_content == "Ten dollars."
+        result = await session.run(user_input="hmm")
+        assert result.expect.next_event().is_message(role="assistant").event().item.text_content == "Sorry?"
+
+
+async def test_stt_segments_speech_by_energy():
+    fake = FakeSTT(["one", "two"], end_silence_s=0.2)
+    stream = fake.stream()
+    for frame in utterance_frames(0.3, 0.3) + utterance_frames(0.2, 0.3):
+        stream.push_frame(frame)
+    stream.end_input()
+    events = [ev async for ev in stream]
+    finals = [ev.alternatives[0].text for ev in events if ev.type == stt.SpeechEventType.FINAL_TRANSCRIPT]
+    assert finals == ["one", "two"]
+    kinds = [ev.type for ev in events if ev.type != stt.SpeechEventType.RECOGNITION_USAGE]
+    assert kinds[:3] == [stt.SpeechEventType.START_OF_SPEECH, stt.SpeechEventType.FINAL_TRANSCRIPT,
+                         stt.SpeechEventType.END_OF_SPEECH]
+
+
+async def test_tts_audio_length_follows_text():
+    fake = FakeTTS(chars_per_second=10)
+    duration = 0.0
+    async with fake.synthesize("x" * 25) as stream:
+        async for audio in stream:
+            duration += audio.frame.duration
+    assert abs(duration - 2.5) < 0.01
+    assert fake.spoken == ["x" * 25]
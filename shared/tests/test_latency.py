@@ -0,0 +1,111 @@
+from livekit.agents import FunctionToolsExecutedEvent, llm, metrics
+
+from agent_runtime.latency import LatencyStats, RollingHistogram, TurnTracer
+
+
+def _eou(ts, speech_id, eou=0.3, stt=0.2, hook=0.01):
+    return metrics.EOUMetrics(
+        timestamp=ts, end_of_utterance_delay=eou, transcription_delay=stt,
+        on_user_turn_completed_delay=hook, speech_id=speech_id,
+    )
+
+
+def _llm(ts, speech_id, ttft=0.25, duration=0.5):
+    return metrics.LLMMetrics(
+        label="llm", request_id="r", timestamp=ts, duration=duration, ttft=ttft, cancelled=False,
+        completion_tokens=1, prompt_tokens=1, prompt_cached_tokens=0, total_tokens=2,
+        tokens_per_second=1.0, speech_id=speech_id,
+    )
+
+
+def _tts(ts, speech_id, ttfb=0.15, duration=1.0):
+    return metrics.TTSMetrics(
+        label="tts", request_id="r", timestamp=ts, ttfb=ttfb, duration=duration, audio_duration=2.0,
+        cancelled=False, characters_count=10, streamed=True, speech_id=speech_id,
+    )
+
+
+def _tools(start, end, name="lookup_customer"):
+    call = llm.FunctionCall(call_id="c1", name=name, arguments="{}", created_at=start)
+    if end is None:  # no output (StopResponse); built unvalidated, as newer releases no longer allow None here
+        return FunctionToolsExecutedEvent.model_construct(function_calls=[call], function_call_outputs=[None])
+    out = llm.FunctionCallOutput(call_id="c1", name=name, output="ok", is_error=False, created_at=end)
+    return FunctionToolsExecutedEvent(function_calls=[call], function_call_outputs=[out])
+
+
+def test_histogram_percentiles_and_rolling_window():
+    h = RollingHistogram(window=100)
+    for ms in range(1, 101):
+        h.record(ms / 1000)
+    assert abs(h.percentile(0.5) - 0.050) < 0.050 * 0.06
+    assert abs(h.percentile(0.99) - 0.099) < 0.099 * 0.06
+    for _ in range(100):
+        h.record(2.0)  # the old samples roll out
+    assert len(h) == 100 and abs(h.percentile(0.5) - 2.0) < 0.1
+    assert sum(h.counts) == 100
+
+
+def test_user_turn_with_tool_round_is_one_waterfall():
+    stats = LatencyStats()
+    tracer = TurnTracer("day6", stats=stats, log_turns=False)
+    # user speech ends at t=100.0
+    tracer.on_metrics(_eou(100.31, "s1"))
+    tracer.on_metrics(_llm(100.81, "s1", ttft=0.2, duration=0.5))  # started 100.31
+    tracer.on_tools_executed(_tools(100.81, 100.91))
+    tracer.on_metrics(_llm(101.21, "s2", ttft=0.2, duration=0.3))  # tool reply, new speech id
+    tracer.on_metrics(_tts(102.0, "s2", ttfb=0.15, duration=0.9))  # started 101.10
+    tracer.close()
+
+    [turn] = tracer.recent
+    assert turn.user_turn and turn.turn_id == "day6-1"
+    lat = turn.stage_latencies()
+    assert round(lat["eou"], 3) == 0.3 and round(lat["stt"], 3) == 0.2
+    assert round(lat["llm_ttft"], 3) == 0.4
+    assert round(lat["tool"], 3) == 0.1
+    assert round(lat["total"], 3) == 1.25
+    assert turn.dominant() == "llm_ttft"
+    assert "tool lookup_customer +810ms 100ms" in turn.format()
+    assert stats.percentiles("day6")["total"]["count"] == 1
+
+
+
+def test_tool_without_output_has_no_span():
+    tracer = TurnTracer("day6", log_turns=False)
+    tracer.on_metrics(_eou(100.31, "s1"))
+    tracer.on_metrics(_llm(100.81, "s1", ttft=0.2, duration=0.5))
+    tracer.on_tools_executed(_tools(100.81, None))  # the tool raised StopResponse
+    tracer.close()
+
+    [turn] = tracer.recent
+    assert "tool" not in turn.stage_latencies() and not turn.awaiting_tool_reply
+
+def test_agent_turns_and_late_metrics():
+    stats = LatencyStats()
+    tracer = TurnTracer("day9", stats=stats, log_turns=False)
+    tracer.on_metrics(_llm(10.5, "greet"))  # greeting: no EOU
+    tracer.on_metrics(_tts(11.0, "greet"))
+    tracer.on_metrics(_eou(20.0, "s1"))
+    tracer.on_metrics(_tts(20.5, "greet"))  # late metric of a closed turn is dropped
+    tracer.on_metrics(_llm(21.0, "s1"))
+    tracer.close()
+    agent, user = tracer.recent
+    assert not agent.user_turn and user.user_turn
+    assert [s.stage for s in user.spans] == ["stt", "eou", "on_user_turn", "llm_ttft"]
+    assert stats.percentiles("day9")["llm_ttft"]["count"] == 2
+
+
+def test_preemptive_reply_joins_its_user_turn():
+    tracer = TurnTracer("day1", stats=LatencyStats(), log_turns=False)
+    tracer.on_metrics(_llm(50.4, "s1"))  # preemptive generation finished before the EOU
+    tracer.on_metrics(_eou(50.5, "s1"))
+    tracer.close()
+    [turn] = tracer.recent
+    assert turn.user_turn and len(turn.spans) == 4
+
+
+def test_stats_dominant_stage():
+    stats = LatencyStats()
+    for _ in range(10):
+        stats.record("day7", {"eou": 0.2, "llm_ttft": 0.6, "tts_ttfb": 0.3, "stt": 0.9})
+    assert stats.dominant("day7") == "llm_ttft"
+    assert "day7 turn latency" in stats.describe("day7")
@@ -0,0 +1,71 @@
+import asyncio
+
+from livekit.agents import Agent, RunContext, function_tool
+
+from agent_runtime.fakes import FakeToolCall, utterance_frames
+from agent_runtime.loadgen import (
+    LocalSpeaker,
+    PluginLatency,
+    Script,
+    ScriptedTurn,
+    percentile,
+    run_load,
+)
+from agent_runtime.telemetry import ACTIVE_SESSIONS
+
+
+class LookupAgent(Agent):
+    def __init__(self):
+        super().__init__(instructions="test")
+
+    @function_tool
+    async def lookup(self, ctx: RunContext, name: str) -> str:
+        """Look someone up."""
+        return f"found {name}"
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 95) == 3.0
+    assert percentile([], 50) is None
+
+
+async def test_speaker_reports_playout_and_interruptions():
+    speaker = LocalSpeaker()
+    finished = []
+    speaker.on("playback_finished", lambda ev: finished.append(ev.interrupted))
+    frame = utterance_frames(0.0, 0.05)[0]  # 10 ms
+
+    for _ in range(3):
+        await speaker.capture_frame(frame)
+    speaker.flush()
+    assert len(speaker.started) == 1
+    ev = await asyncio.wait_for(speaker.wait_for_playout(), 1.0)
+    assert not ev.interrupted and abs(ev.playback_position - 0.03) < 1e-6
+
+    await speaker.capture_frame(frame)
+    speaker.clear_buffer()
+    await speaker.capture_frame(frame)  # the rest of the cleared segment is dropped
+    speaker.flush()
+    assert finished == [False, True]
+    assert await speaker.wait_segment(1) == speaker.started[1]
+
+
+async def test_run_load_drives_scripted_turns():
+    script = Script("loadtest", LookupAgent, [
+        ScriptedTurn("who is ann", "Ann is here.", [FakeToolCall("lookup", {"name": "ann"})]),
+        ScriptedTurn("thanks", "Bye."),
+    ])
+    latency = PluginLatency(stt=0.05, end_silence=0.1, llm_ttft=0.05, tts_ttfb=0.05, endpointing=0.0)
+    report = await run_load([script], sessions=2, duration_s=4.0, latency=latency, think_s=0.1, ramp_s=0.2)
+
+    assert report.failed_sessions == 0 and report.timeouts == 0
+    assert report.turns >= 4 and report.tool_calls >= 2
+    assert len(report.latencies) >= report.turns
+    assert min(report.latencies) >= latency.floor(script.turns[1]) * 0.9
+    assert report.loop_lag
+    assert ACTIVE_SESSIONS.labels("loadtest").value == 0
+    summary = report.as_dict()
+    assert summary["latency_s"]["p50"] is not None and "loadtest" in summary["latency_p95_by_script"]
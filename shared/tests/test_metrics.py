@@ -0,0 +1,58 @@
+from livekit.agents import AgentSession, MetricsCollectedEvent, metrics
+
+from agent_runtime import SessionMetrics, attach_metrics
+
+
+def _llm(duration=0.5, tokens=10):
+    return metrics.LLMMetrics(
+        label="llm", request_id="r", timestamp=0.0, duration=duration, ttft=0.1,
+        cancelled=False, completion_tokens=tokens, prompt_tokens=tokens,
+        prompt_cached_tokens=0, total_tokens=2 * tokens, tokens_per_second=20.0,
+    )
+
+
+def _tts(chars=42):
+    return metrics.TTSMetrics(
+        label="tts", request_id="r", timestamp=0.0, ttfb=0.2, duration=1.0,
+        audio_duration=2.0, cancelled=False, characters_count=chars, streamed=True,
+    )
+
+
+class FakeJobContext:
+    def __init__(self):
+        self.shutdown_callbacks = []
+
+    def add_shutdown_callback(self, fn):
+        self.shutdown_callbacks.append(fn)
+
+
+def test_collect_counts_and_fans_out_to_listeners():
+    sm = SessionMetrics()
+    seen = []
+    sm.add_listener(lambda m: seen.append(type(m).__name__))
+    sm.collect(_llm())
+    sm.collect(_tts())
+    sm.collect(_llm())
+    assert sm.counts == {"LLMMetrics": 2, "TTSMetrics": 1}
+    assert seen == ["LLMMetrics", "TTSMetrics", "LLMMetrics"]
+    assert sm.summary().tts_characters_count == 42
+
+
+def test_failing_listener_does_not_stop_the_others():
+    sm = SessionMetrics()
+    seen = []
+    sm.add_listener(lambda m: 1 / 0)
+    sm.add_listener(lambda m: seen.append(m))
+    sm.collect(_llm())
+    assert len(seen) == 1
+
+
+async def test_attach_hooks_session_events_and_shutdown_summary():
+    ctx = FakeJobContext()
+    session = AgentSession()
+    sm = attach_metrics(ctx, session)
+    session.emit("metrics_collected", MetricsCollectedEvent(metrics=_llm(tokens=5)))
+    assert sm.counts["LLMMetrics"] == 1
+    assert sm.summary().llm_completion_tokens == 5
+    assert len(ctx.shutdown_callbacks) == 1
+    await ctx.shutdown_callbacks[0]()
@@ -0,0 +1,69 @@
+import pytest
+
+from agent_runtime.models import ModelRegistry, StartupLog, acquire_session_models
+
+
+def _registry(calls, fail_check=False):
+    def check():
+        if fail_check:
+            raise FileNotFoundError("model.onnx")
+
+    registry = ModelRegistry()
+    registry.register("vad", lambda: calls.append("vad") or "VAD")
+    registry.register("turn", lambda: calls.append("turn") or "TURN", check=check, needs_job=True)
+    return registry
+
+
+def test_warm_loads_process_models_and_defers_job_models():
+    calls = []
+    registry = _registry(calls)
+    status = registry.warm()
+    assert calls == ["vad"]
+    assert status["vad"].loaded and status["vad"].loaded_by == "prewarm"
+    assert status["turn"].ready and not status["turn"].loaded
+    assert registry.ready()
+
+    assert registry.get("turn", owner="job-1") == "TURN"
+    assert registry.get("turn", owner="job-2") == "TURN"
+    assert calls == ["vad", "turn"]
+    assert registry.status()["turn"].loaded_by == "job-1"
+
+
+def test_failed_readiness_check_is_reported():
+    registry = _registry([], fail_check=True)
+    registry.warm()
+    assert not registry.ready()
+    assert "model.onnx" in registry.status()["turn"].error
+    assert "NOT READY" in registry.describe()
+
+
+def test_loader_errors_surface_as_none_for_sessions():
+    registry = ModelRegistry()
+    registry.register("broken", lambda: 1 / 0)
+    assert registry.get_or_none("broken") is None
+    with pytest.raises(ZeroDivisionError):
+        registry.get("broken")
+    assert registry.status()["broken"].ready is False
+
+
+def test_first_job_is_cold_then_warm(monkeypatch):
+    import agent_runtime.models as models
+
+    startups = StartupLog()
+    monkeypatch.setattr(models, "STARTUPS", startups)
+    calls = []
+    registry = _registry(calls)
+    registry.warm()
+
+    first = acquire_session_models("job-1", registry)
+    assert first == {"vad": "VAD", "turn": "TURN"}
+    startups.timer("job-1").mark("first_response")
+    startups.finish("job-1")
+
+    acquire_session_models("job-2", registry)
+    startups.finish("job-2")
+
+    assert [r.cold for r in startups.records()] == [True, False]
+    assert startups.mean("models", cold=True) is not None
+    assert startups.mean("first_response", cold=False) is None
+    assert startups.finish("job-2") is None
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from agent_runtime.router import (
+    TENANTS,
+    Router,
+    Tenant,
+    TenantLimiter,
+    load_agent_module,
+)
+
+AGENT_SOURCE = """
+import helper
+
+CALLS = []
+
+
+async def entrypoint(ctx):
+    CALLS.append((ctx.room.name, helper.NAME))
+"""
+
+
+@pytest.fixture
+def fake_tenant(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "agent.py").write_text(AGENT_SOURCE)
+    (src / "helper.py").write_text("NAME = 'helper'\n")
+    return Tenant("fake", "FakeAgent", ("demo",), max_sessions=1, src_dir=str(src))
+
+
+class FakeRequest:
+    def __init__(self, job_id, room_name, room_metadata="", job_metadata=""):
+        self.id = job_id
+        self.room = SimpleNamespace(name=room_name, metadata=room_metadata)
+        self.job = SimpleNamespace(id=job_id, metadata=job_metadata, room=self.room)
+        self.outcome = None
+
+    async def accept(self):
+        self.outcome = "accepted"
+
+    async def reject(self):
+        self.outcome = "rejected"
+
+
+class FakeJobContext:
+    def __init__(self, req: FakeRequest):
+        self.room = req.room
+        self.job = req.job
+        self.shutdown_callbacks = []
+
+    def add_shutdown_callback(self, fn):
+        self.shutdown_callbacks.append(fn)
+
+    def shutdown(self, reason=""):
+        self.shutdown_reason = reason
+
+
+def test_route_precedence():
+    router = Router(default="day1")
+    assert router.route("fraud-1234").name == "day6"
+    assert router.route("room_day9_demo").name == "day9"
+    assert router.route("fraud-1", room_metadata=json.dumps({"agent": "improv"})).name == "day10"
+    assert router.route("fraud-1", room_metadata="improv", job_metadata='{"tenant": "day7"}').name == "day7"
+    assert router.route("lobby").name == "day1"
+    # explicit metadata naming an unknown agent never falls back
+    assert router.route("fraud-1", job_metadata='{"agent": "nope"}') is None
+    assert Router().route("lobby") is None
+
+
+def test_tenant_keys_must_be_unique():
+    with pytest.raises(ValueError):
+        Router([Tenant("a", "A", ("x",)), Tenant("b", "B", ("x",))])
+    with pytest.raises(ValueError):
+        Router(TENANTS, default="missing")
+
+
+def test_limiter_reserve_confirm_release_and_expiry():
+    limiter = TenantLimiter({"day6": 2}, ttl_s=-1.0)
+    assert limiter.reserve("day6", "j1")
+    limiter.confirm("day6", "j1")
+    assert limiter.reserve("day6", "j2")
+    # j2 was never confirmed and its reservation has expired: it no longer counts
+    assert limiter.active("day6") == 1
+    limiter.confirm("day6", "j3")
+    assert not limiter.reserve("day6", "j4")
+    assert limiter.rejected["day6"] == 1
+    limiter.release("j1")
+    assert limiter.reserve("day6", "j4")
+    limiter.confirm("day6", "j4")
+    assert limiter.snapshot() == {"day6": 2}
+
+
+def test_load_agent_module_once_with_siblings(fake_tenant):
+    first = load_agent_module(fake_tenant)
+    assert first.__name__ == "fake_agent"
+    assert load_agent_module(fake_tenant) is first
+
+
+def test_request_and_entrypoint_dispatch_with_limits(fake_tenant):
+    router = Router([fake_tenant])
+
+    async def scenario():
+        first = FakeRequest("j1", "demo-room")
+        await router.request_fnc(first)
+        second = FakeRequest("j2", "demo-other")
+        await router.request_fnc(second)
+        unknown = FakeRequest("j3", "lobby")
+        await router.request_fnc(unknown)
+        assert (first.outcome, second.outcome, unknown.outcome) == ("accepted", "rejected", "rejected")
+
+        ctx = FakeJobContext(first)
+        await router.entrypoint(ctx)
+        module = router.module(fake_tenant)
+        assert module.CALLS == [("demo-room", "helper")]
+        assert router.limiter.active("fake") == 1
+
+        for fn in ctx.shutdown_callbacks:
+            await fn()
+        assert router.limiter.active("fake") == 0
+        again = FakeRequest("j4", "demo-again")
+        await router.request_fnc(again)
+        assert again.outcome == "accepted"
+
+    asyncio.run(scenario())
+
+
+def test_entrypoint_without_tenant_shuts_down(fake_tenant):
+    router = Router([fake_tenant])
+    ctx = FakeJobContext(FakeRequest("j1", "lobby"))
+    asyncio.run(router.entrypoint(ctx))
+    assert ctx.shutdown_reason
@@ -0,0 +1,15 @@
+from agent_runtime import VoiceConfig
+
+
+def test_defaults_match_the_shared_pipeline():
+    config = VoiceConfig()
+    assert config.tts_kwargs() == {"voice": "en-US-marcus", "style": "Conversational", "text_pacing": True}
+    assert config.session_kwargs() == {}
+
+
+def test_sentence_tokenizer_and_preemptive_generation_are_opt_in():
+    config = VoiceConfig(voice="en-US-matthew", min_sentence_len=2, preemptive_generation=True)
+    tts = config.tts_kwargs()
+    assert tts["voice"] == "en-US-matthew"
+    assert "tokenizer" in tts
+    assert config.session_kwargs() == {"preemptive_generation": True}
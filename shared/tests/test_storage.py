@@ -0,0 +1,76 @@
+import json
+import threading
+
+from agent_runtime import (
+    SqliteStore,
+    append_json_record,
+    connect,
+    read_json,
+    write_json_atomic,
+)
+
+
+class NotesStore(SqliteStore):
+    schema = "CREATE TABLE IF NOT EXISTS notes (id INTEGER PRIMARY KEY, body TEXT NOT NULL);"
+
+    def add(self, body: str) -> int:
+        with self.transaction() as conn:
+            return conn.execute("INSERT INTO notes (body) VALUES (?)", (body,)).lastrowid
+
+    def bodies(self):
+        return [row["body"] for row in self.query("SELECT body FROM notes ORDER BY id")]
+
+
+def test_connect_applies_pragmas(tmp_path):
+    conn = connect(str(tmp_path / "db.sqlite"), foreign_keys=True)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    conn.close()
+
+
+def test_store_schema_queries_and_run(tmp_path):
+    import asyncio
+
+    store = NotesStore(str(tmp_path / "notes.sqlite"))
+    store.add("one")
+    asyncio.run(store.run(store.add, "two"))
+    assert store.bodies() == ["one", "two"]
+    assert store.execute("DELETE FROM notes WHERE body = ?", ("one",)) == 1
+    assert store.query_one("SELECT COUNT(*) AS n FROM notes")["n"] == 1
+    store.close()
+
+
+def test_write_json_atomic_replaces_file_and_leaves_no_temp(tmp_path):
+    path = tmp_path / "data.json"
+    path.write_text("[1, 2")  # a torn earlier write
+    write_json_atomic(str(path), {"ok": True})
+    assert json.loads(path.read_text()) == {"ok": True}
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
+
+
+def test_read_json_default_on_missing_or_corrupt(tmp_path):
+    assert read_json(str(tmp_path / "missing.json"), default=[]) == []
+    bad = tmp_path / "bad.json"
+    bad.write_text("{nope")
+    assert read_json(str(bad), default={}) == {}
+
+
+def test_append_json_record_is_safe_across_threads(tmp_path):
+    path = str(tmp_path / "log.json")
+    threads = [threading.Thread(target=append_json_record, args=(path, {"n": i})) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    records = read_json(path)
+    assert sorted(r["n"] for r in records) == list(range(20))
+
+
+def test_append_json_record_moves_a_corrupt_file_aside(tmp_path):
+    path = tmp_path / "leads.json"
+    path.write_text('[{"name": "ann"}')  # not valid JSON
+    assert append_json_record(str(path), {"name": "bo"}) == 1
+    assert json.loads(path.read_text()) == [{"name": "bo"}]
+    [aside] = tmp_path.glob("leads.json.corrupt-*")
+    assert aside.read_text() == '[{"name": "ann"}'
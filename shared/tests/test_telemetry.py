@@ -0,0 +1,99 @@
+import threading
+import urllib.request
+
+from livekit.agents import FunctionToolsExecutedEvent, llm
+from test_metrics import _tts
+
+from agent_runtime import METRICS, SessionMetrics, connect
+from agent_runtime.telemetry import (
+    DB_QUERIES,
+    TOOL_CALLS,
+    TOOL_SECONDS,
+    TTS_CHARACTERS,
+    MetricsRegistry,
+)
+
+
+def test_counter_sums_per_thread_cells():
+    reg = MetricsRegistry()
+    c = reg.counter("t_total", "test", ("k",))
+
+    def work():
+        child = c.labels("a")
+        for _ in range(10_000):
+            child.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c.labels(k="a").value == 80_000
+    assert 't_total{k="a"} 80000' in reg.render()
+
+
+def test_exited_threads_fold_into_one_cell():
+    reg = MetricsRegistry()
+    c = reg.counter("t_folded_total", "test")
+    h = reg.histogram("t_folded_seconds", "test", buckets=(1.0,))
+
+    def job():
+        c.inc()
+        h.observe(0.5)
+
+    for _ in range(50):  # one thread per job, like the router's thread executor
+        t = threading.Thread(target=job)
+        t.start()
+        t.join()
+    assert c.labels().value == 50 and h.labels().count == 50
+    assert len(c.labels().cells()) == 1 and len(h.labels().cells()) == 1
+
+
+def test_histogram_exposition_is_cumulative():
+    reg = MetricsRegistry()
+    h = reg.histogram("t_seconds", "test", buckets=(0.1, 1.0))
+    for v in (0.05, 0.5, 0.5, 5.0):
+        h.observe(v)
+    text = reg.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{le="0.1"} 1' in text
+    assert 't_seconds_bucket{le="1"} 3' in text
+    assert 't_seconds_bucket{le="+Inf"} 4' in text
+    assert "t_seconds_count 4" in text and "t_seconds_sum 6.05" in text
+
+
+def test_serve_metrics_over_http():
+    reg = MetricsRegistry()
+    reg.gauge("t_active", "test").inc(3)
+    port = reg.serve(0)
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+            assert resp.headers["Content-Type"].startswith("text/plain")
+            assert "t_active 3" in resp.read().decode()
+    finally:
+        reg.shutdown()
+
+
+def test_connect_counts_statements(tmp_path):
+    conn = connect(str(tmp_path / "t.sqlite"))
+    queries = DB_QUERIES.labels("t.sqlite")
+    before = queries.value
+    conn.execute("CREATE TABLE x (a)")
+    conn.cursor().executemany("INSERT INTO x VALUES (?)", [(1,), (2,)])
+    assert conn.execute("SELECT COUNT(*) FROM x").fetchone()[0] == 2
+    assert queries.value - before == 3
+
+
+def test_session_metrics_record_tools_and_usage():
+    sm = SessionMetrics(agent="t-agent")
+    call = llm.FunctionCall(call_id="c", name="find_item", arguments="{}", created_at=1.0)
+    out = llm.FunctionCallOutput(call_id="c", name="find_item", output="x", is_error=False, created_at=1.2)
+    sm.record_tools(FunctionToolsExecutedEvent(function_calls=[call], function_call_outputs=[out]))
+    assert TOOL_CALLS.labels("t-agent", "find_item", "false").value == 1
+    stop = llm.FunctionCall(call_id="d", name="hang_up", arguments="{}", created_at=2.0)
+    sm.record_tools(FunctionToolsExecutedEvent.model_construct(function_calls=[stop], function_call_outputs=[None]))  # StopResponse
+    assert TOOL_CALLS.labels("t-agent", "hang_up", "false").value == 1
+    assert TOOL_SECONDS.labels("t-agent", "hang_up").count == 0
+    sm.collect(_tts(chars=7))
+    assert TTS_CHARACTERS.labels("t-agent").value == 7
+    assert 'agent_tool_calls_total{agent="t-agent",tool="find_item",error="false"} 1' in METRICS.render()
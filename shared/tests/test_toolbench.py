@@ -0,0 +1,48 @@
+import asyncio
+
+from agent_runtime.toolbench import (
+    BenchCase,
+    ToolContext,
+    compare,
+    load_baseline,
+    measure,
+    run_cases,
+    save_baseline,
+)
+
+
+def test_measure_reports_rate_and_retained_memory():
+    held = []
+    result = measure(lambda: held.append(bytearray(1000)), min_time=0.05)
+    assert result.ops_per_sec > 0 and result.calls > 0
+    assert result.retained_b_per_call > 900
+
+
+def test_run_cases_async_tool_and_baseline_roundtrip(tmp_path):
+    async def tool(ctx, n):
+        await asyncio.sleep(0)
+        return sum(ctx.userdata[:n])
+
+    def setup(size, tmp):
+        ctx = ToolContext(list(range(size)))
+
+        async def op():
+            await tool(ctx, size)
+
+        return op
+
+    results = run_cases("t", [BenchCase("sum", setup, sizes=(10, 1000))], min_time=0.02)
+    assert set(results) == {"t.sum[10]", "t.sum[1000]"}
+    assert results["t.sum[10]"]["ops_per_sec"] > results["t.sum[1000]"]["ops_per_sec"]
+
+    path = str(tmp_path / "baseline.json")
+    save_baseline(path, results)
+    baseline = load_baseline(path)
+    assert baseline["machine"]["python"] and baseline["results"] == results
+
+
+def test_compare_flags_drops_beyond_tolerance():
+    baseline = {"a[1]": {"ops_per_sec": 1000.0}, "b[1]": {"ops_per_sec": 1000.0}}
+    current = {"a[1]": {"ops_per_sec": 800.0}, "b[1]": {"ops_per_sec": 700.0}, "new[1]": {"ops_per_sec": 1.0}}
+    regressions = compare(current, baseline, tolerance=0.25)
+    assert len(regressions) == 1 and regressions[0].startswith("b[1]")
@@ -0,0 +1,68 @@
+import asyncio
+import time
+
+from livekit.agents import Agent, AgentSession, RunContext, function_tool
+
+from agent_runtime.fakes import FakeLLM, FakeResponse, FakeToolCall
+from agent_runtime.loadgen import LocalJobContext
+from agent_runtime.metrics import SessionMetrics
+from agent_runtime.telemetry import LOOP_STALLS
+from agent_runtime.watchdog import NO_TOOL, watch_loop
+
+
+def blocking_lookup(name: str) -> str:
+    time.sleep(0.25)  # stands in for a synchronous sqlite3 query
+    return f"found {name}"
+
+
+class BlockingAgent(Agent):
+    def __init__(self):
+        super().__init__(instructions="test")
+
+    @function_tool
+    async def lookup(self, ctx: RunContext, name: str) -> str:
+        """Look someone up."""
+        return blocking_lookup(name)
+
+
+async def test_stall_in_tool_is_attributed_with_stack():
+    watchdog = watch_loop("wd-tool", threshold=0.1)
+    ctx = LocalJobContext("wd-job")
+    try:
+        llm = FakeLLM([FakeResponse(tool_calls=[FakeToolCall("lookup", {"name": "ann"})], then="{output}")])
+        async with llm, AgentSession(llm=llm) as session:
+            SessionMetrics(agent="wd-tool").attach(ctx, session)  # registers the agent's tools with the watchdog
+            await session.start(BlockingAgent())
+            await session.run(user_input="who is ann")
+        await asyncio.sleep(0.1)
+    finally:
+        await ctx.shutdown()
+        watchdog.release("wd-tool")
+
+    stall = next(s for s in watchdog.stalls if s.tool == "lookup")
+    assert stall.seconds >= 0.2
+    assert "blocking_lookup" in stall.location
+    assert any("in lookup" in frame for frame in stall.stack)
+    assert LOOP_STALLS.labels("wd-tool", "lookup").value >= 1
+    assert "lookup 1" in watchdog.describe()
+
+
+async def test_stall_outside_tools_and_shared_loop():
+    first = watch_loop("wd-a", threshold=0.05)
+    second = watch_loop("wd-b", threshold=0.05)
+    assert first is second
+    await asyncio.sleep(0.1)
+    time.sleep(0.15)
+    await asyncio.sleep(0.1)
+    first.release("wd-a")
+    assert first.counts[NO_TOOL] == 1 and first.stalls[-1].stack
+    assert first.agent == "wd-b"
+    assert LOOP_STALLS.labels("shared", NO_TOOL).value >= 1
+    second.release("wd-b")
+    assert watch_loop("wd-c", threshold=0.05) is not first  # stopped with its last holder, then started afresh
+    watch_loop(threshold=0.05).stop()
+
+
+async def test_disabled(monkeypatch):
+    monkeypatch.setenv("AGENT_LOOP_STALL_MS", "0")
+    assert watch_loop("wd-off") is None